@@ -0,0 +1,38 @@
+"""Report file period column and keyset pagination indexes.
+
+Revision ID: 3c9e1f4a7b21
+Revises: 15b3a7b2f2d4
+Create Date: 2026-10-18
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "3c9e1f4a7b21"
+down_revision = "15b3a7b2f2d4"
+branch_labels = None
+depends_on = None
+
+KEYSET_INDEXES = {
+    "ix_report_files_created_at_id": ["created_at", "id"],
+    "ix_report_files_owner_id_created_at_id": ["owner_id", "created_at", "id"],
+    "ix_report_files_type_created_at_id": ["type", "created_at", "id"],
+    "ix_report_files_archived_created_at_id": ["archived", "created_at", "id"],
+    "ix_report_files_period_created_at_id": ["period", "created_at", "id"],
+}
+
+
+def upgrade() -> None:
+    op.add_column("report_files", sa.Column("period", sa.String(7), nullable=True))
+    # Backfill from generated paths like reports/pdf/2025-08/<uuid>.pdf
+    op.execute("UPDATE report_files SET period = substring(path from '(\\d{4}-\\d{2})') WHERE period IS NULL")
+    for name, columns in KEYSET_INDEXES.items():
+        op.create_index(name, "report_files", columns, unique=False)
+
+
+def downgrade() -> None:
+    for name in reversed(list(KEYSET_INDEXES)):
+        op.drop_index(name, table_name="report_files")
+    op.drop_column("report_files", "period")
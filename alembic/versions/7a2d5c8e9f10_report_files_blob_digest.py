@@ -0,0 +1,29 @@
+"""Reference report bytes by SHA-256 digest in the blob store.
+
+Revision ID: 7a2d5c8e9f10
+Revises: 3c9e1f4a7b21
+Create Date: 2026-10-18
+
+Existing inline ``content`` stays readable; move it into the blob store with
+``python -m scripts.migrate_report_blobs``.
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "7a2d5c8e9f10"
+down_revision = "3c9e1f4a7b21"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("report_files", sa.Column("content_sha256", sa.String(64), nullable=True))
+    op.create_index("ix_report_files_content_sha256", "report_files", ["content_sha256"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_report_files_content_sha256", table_name="report_files")
+    op.drop_column("report_files", "content_sha256")
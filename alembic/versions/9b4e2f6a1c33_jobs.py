@@ -0,0 +1,50 @@
+"""Durable background jobs table.
+
+Revision ID: 9b4e2f6a1c33
+Revises: 7a2d5c8e9f10
+Create Date: 2026-10-18
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "9b4e2f6a1c33"
+down_revision = "7a2d5c8e9f10"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "jobs",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("kind", sa.String(64), nullable=False),
+        sa.Column("status", sa.String(16), nullable=False, server_default="queued"),
+        sa.Column("params", sa.JSON(), nullable=False),
+        sa.Column("dedupe_key", sa.String(255), nullable=True, unique=True),
+        sa.Column("requested_by", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("progress_total", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("progress_done", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("progress_failed", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("result", sa.JSON(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("max_attempts", sa.Integer(), nullable=False, server_default="3"),
+        sa.Column("locked_by", sa.String(128), nullable=True),
+        sa.Column("locked_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("run_after", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_jobs_status_run_after_created_at", "jobs", ["status", "run_after", "created_at"])
+    op.create_index("ix_jobs_kind_created_at", "jobs", ["kind", "created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jobs_kind_created_at", table_name="jobs")
+    op.drop_index("ix_jobs_status_run_after_created_at", table_name="jobs")
+    op.drop_table("jobs")
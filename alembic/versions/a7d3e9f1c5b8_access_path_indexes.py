@@ -0,0 +1,57 @@
+"""Composite / covering indexes for the hot (employee_id, year, month) and report path lookups.
+
+Revision ID: a7d3e9f1c5b8
+Revises: f2c6a8e0b4d7
+Create Date: 2026-10-18
+
+* salary_components / vacations: ``(year, month, employee_id)`` INCLUDE the summed columns,
+  so month aggregation is an index-only scan. The single-column ``employee_id`` indexes are
+  dropped: the ``uq_salary_component`` / ``uq_vacation`` constraints lead with employee_id.
+* report_files: ``path`` unique (every generate/archive looks it up) and
+  ``(owner_id, type, created_at)``. Repeated archiving left several rows per path: the newest
+  keeps the path, older ones are kept (with any inline content) as archived rows under
+  ``<path>/superseded/<id>``.
+* employees: ``manager_id`` (subordinate lists, company aggregation).
+"""
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "a7d3e9f1c5b8"
+down_revision = "f2c6a8e0b4d7"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_salary_components_year_month_employee_id", "salary_components", ["year", "month", "employee_id"],
+        postgresql_include=["type", "amount"],
+    )
+    op.drop_index("ix_salary_components_employee_id", table_name="salary_components")
+    op.create_index(
+        "ix_vacations_year_month_employee_id", "vacations", ["year", "month", "employee_id"],
+        postgresql_include=["days_taken"],
+    )
+    op.drop_index("ix_vacations_employee_id", table_name="vacations")
+
+    op.execute(
+        "UPDATE report_files older SET path = older.path || '/superseded/' || older.id, archived = true "
+        "FROM report_files newer "
+        "WHERE older.path = newer.path AND (older.created_at, older.id) < (newer.created_at, newer.id)"
+    )
+    op.create_index("ix_report_files_path", "report_files", ["path"], unique=True)
+    op.create_index("ix_report_files_owner_id_type_created_at", "report_files", ["owner_id", "type", "created_at"])
+
+    op.create_index("ix_employees_manager_id", "employees", ["manager_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_employees_manager_id", table_name="employees")
+    op.drop_index("ix_report_files_owner_id_type_created_at", table_name="report_files")
+    op.drop_index("ix_report_files_path", table_name="report_files")
+    op.create_index("ix_vacations_employee_id", "vacations", ["employee_id"], unique=False)
+    op.drop_index("ix_vacations_year_month_employee_id", table_name="vacations")
+    op.create_index("ix_salary_components_employee_id", "salary_components", ["employee_id"], unique=False)
+    op.drop_index("ix_salary_components_year_month_employee_id", table_name="salary_components")
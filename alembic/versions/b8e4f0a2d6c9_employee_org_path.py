@@ -0,0 +1,37 @@
+"""Materialized management path on employees.
+
+Revision ID: b8e4f0a2d6c9
+Revises: a7d3e9f1c5b8
+Create Date: 2026-10-18
+
+``org_path`` holds "/<top id>/.../<own id>/" and is backfilled here with a recursive walk
+from the top-level employees; the repositories keep it current afterwards. The
+``text_pattern_ops`` index serves the ``LIKE '<prefix>%'`` subtree rewrite when a manager moves.
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b8e4f0a2d6c9"
+down_revision = "a7d3e9f1c5b8"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("employees", sa.Column("org_path", sa.Text(), nullable=True))
+    op.execute(
+        "WITH RECURSIVE tree AS ("
+        " SELECT id, '/' || id::text || '/' AS path FROM employees WHERE manager_id IS NULL"
+        " UNION ALL"
+        " SELECT e.id, tree.path || e.id::text || '/' FROM employees e JOIN tree ON e.manager_id = tree.id"
+        ") UPDATE employees SET org_path = tree.path FROM tree WHERE employees.id = tree.id"
+    )
+    op.create_index("ix_employees_org_path", "employees", ["org_path"], postgresql_ops={"org_path": "text_pattern_ops"})
+
+
+def downgrade() -> None:
+    op.drop_index("ix_employees_org_path", table_name="employees")
+    op.drop_column("employees", "org_path")
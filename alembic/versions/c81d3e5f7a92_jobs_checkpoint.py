@@ -0,0 +1,24 @@
+"""Resume checkpoints for background jobs (month close).
+
+Revision ID: c81d3e5f7a92
+Revises: 9b4e2f6a1c33
+Create Date: 2026-10-18
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c81d3e5f7a92"
+down_revision = "9b4e2f6a1c33"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("jobs", sa.Column("checkpoint", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("jobs", "checkpoint")
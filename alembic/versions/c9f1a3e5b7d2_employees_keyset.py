@@ -0,0 +1,26 @@
+"""Keyset pagination index for the employees listing.
+
+Revision ID: c9f1a3e5b7d2
+Revises: b8e4f0a2d6c9
+Create Date: 2026-10-18
+
+``GET /api/employees`` pages newest first on ``(created_at, id)`` like the report listing;
+the manager filter keeps using ``ix_employees_manager_id``.
+"""
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c9f1a3e5b7d2"
+down_revision = "b8e4f0a2d6c9"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_employees_created_at_id", "employees", ["created_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_employees_created_at_id", table_name="employees")
@@ -0,0 +1,27 @@
+"""Token version on employees for access token revocation.
+
+Revision ID: d1e7a3c5f9b4
+Revises: c9f1a3e5b7d2
+Create Date: 2026-10-18
+
+Access tokens carry the employee's ``token_version`` as the ``ver`` claim; incrementing it
+(deactivation, password change, explicit revoke) invalidates every token issued before.
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "d1e7a3c5f9b4"
+down_revision = "c9f1a3e5b7d2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("employees", sa.Column("token_version", sa.Integer(), server_default="0", nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column("employees", "token_version")
@@ -0,0 +1,60 @@
+"""Materialized employee_month_summary table.
+
+Revision ID: d4a7b9c1e2f3
+Revises: c81d3e5f7a92
+Create Date: 2026-10-18
+
+Existing months are materialized here and stamped in ``months.summary_refreshed_at``;
+afterwards salary component / vacation writes keep the rows current.
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "d4a7b9c1e2f3"
+down_revision = "c81d3e5f7a92"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "employee_month_summary",
+        sa.Column("year", sa.Integer(), nullable=False),
+        sa.Column("month", sa.Integer(), nullable=False),
+        sa.Column("employee_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("employees.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("bonus_total", sa.Numeric(12, 2), nullable=False, server_default="0"),
+        sa.Column("adjustment_total", sa.Numeric(12, 2), nullable=False, server_default="0"),
+        sa.Column("vacation_days", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("year", "month", "employee_id"),
+    )
+    op.create_index("ix_employee_month_summary_employee_id", "employee_month_summary", ["employee_id"])
+    op.add_column("months", sa.Column("summary_refreshed_at", sa.DateTime(timezone=True), nullable=True))
+    op.execute(
+        """
+        INSERT INTO employee_month_summary (year, month, employee_id, bonus_total, adjustment_total, vacation_days, updated_at)
+        SELECT year, month, employee_id, sum(bonus_total), sum(adjustment_total), sum(vacation_days), now()
+        FROM (
+            SELECT year, month, employee_id,
+                   sum(CASE WHEN type = 'bonus' THEN amount ELSE 0 END) AS bonus_total,
+                   sum(CASE WHEN type = 'adjustment' THEN amount ELSE 0 END) AS adjustment_total,
+                   0 AS vacation_days
+            FROM salary_components GROUP BY year, month, employee_id
+            UNION ALL
+            SELECT year, month, employee_id, 0, 0, sum(days_taken)
+            FROM vacations GROUP BY year, month, employee_id
+        ) AS totals
+        GROUP BY year, month, employee_id
+        """
+    )
+    op.execute("UPDATE months SET summary_refreshed_at = now()")
+
+
+def downgrade() -> None:
+    op.drop_column("months", "summary_refreshed_at")
+    op.drop_index("ix_employee_month_summary_employee_id", table_name="employee_month_summary")
+    op.drop_table("employee_month_summary")
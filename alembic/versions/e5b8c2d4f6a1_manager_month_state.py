@@ -0,0 +1,40 @@
+"""manager_month_state change tracker for manager reports.
+
+Revision ID: e5b8c2d4f6a1
+Revises: d4a7b9c1e2f3
+Create Date: 2026-10-18
+
+Rows appear on the first tracked write or generation; managers without a row are
+treated as dirty, so existing reports are regenerated once after upgrading.
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "e5b8c2d4f6a1"
+down_revision = "d4a7b9c1e2f3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "manager_month_state",
+        sa.Column("manager_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("employees.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("year", sa.Integer(), nullable=False),
+        sa.Column("month", sa.Integer(), nullable=False),
+        sa.Column("data_version", sa.Integer(), nullable=False, server_default="1"),
+        sa.Column("csv_version", sa.Integer(), nullable=True),
+        sa.Column("pdfs_version", sa.Integer(), nullable=True),
+        sa.Column("changed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("manager_id", "year", "month"),
+    )
+    op.create_index("ix_manager_month_state_year_month", "manager_month_state", ["year", "month"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_manager_month_state_year_month", table_name="manager_month_state")
+    op.drop_table("manager_month_state")
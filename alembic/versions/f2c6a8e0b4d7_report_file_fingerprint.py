@@ -0,0 +1,27 @@
+"""Slip render-input fingerprint on report_files.
+
+Revision ID: f2c6a8e0b4d7
+Revises: e5b8c2d4f6a1
+Create Date: 2026-10-18
+
+Existing slips have no fingerprint and are rendered once more on the next run that
+finds their manager's data changed.
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "f2c6a8e0b4d7"
+down_revision = "e5b8c2d4f6a1"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("report_files", sa.Column("fingerprint", sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("report_files", "fingerprint")
@@ -1,23 +1,59 @@
-from fastapi import APIRouter, Depends
-from auth.deps import require_manager
+from datetime import date
+from typing import TYPE_CHECKING
+from uuid import UUID
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from auth.deps import require_manager, require_manager_async
 from sqlalchemy.orm import Session
 from db import session
-from api.schemas import EmployeeResponse, EmployeeCreate, EmployeeUpdate
+from api.schemas import EmployeeImportResult, EmployeeListItem, EmployeeResponse, EmployeeSubtreeResponse, EmployeeCreate, EmployeeUpdate
+from core.settings import settings
+from utils.bulk_records import bulk_format, spool_request_body
+from utils.pagination import NEXT_CURSOR_HEADER, next_cursor
 from services.employees_service import (
     get_employees as svc_list_employees,
+    get_employees_async as svc_list_employees_async,
     get_employee_by_id as svc_get_employee_by_id,
+    get_employee_by_id_async as svc_get_employee_by_id_async,
+    get_employee_subtree as svc_get_employee_subtree,
     create_employee as svc_create_employee,
     update_employee as svc_update_employee,
     delete_employee as svc_delete_employee,
+    revoke_employee_tokens as svc_revoke_employee_tokens,
     get_employees_by_manager as svc_get_employees_by_manager,
 )
+from services.employee_import_service import import_employees as svc_import_employees
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
 
 employees_router = APIRouter(prefix="/employees", dependencies=[Depends(require_manager)])
+# Async (asyncpg) versions of the read endpoints; create_app mounts this router ahead of
+# employees_router when DB_ASYNC_READS is set, so they answer the same paths
+employees_async_router = APIRouter(prefix="/employees", dependencies=[Depends(require_manager_async)], include_in_schema=False)
 
 
-@employees_router.get("", response_model=list[EmployeeResponse])
-def list_employees(db: Session = Depends(session.get_db)):
-    return svc_list_employees(db)
+@employees_router.get("", response_model=list[EmployeeListItem], response_model_exclude_unset=True)
+def list_employees(
+    response: Response,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: str | None = None,
+    managerId: UUID | None = None,
+    isActive: bool | None = None,
+    hiredFrom: date | None = None,
+    hiredTo: date | None = None,
+    fields: str | None = Query(None, description="Comma-separated fields to return, e.g. firstName,lastName,email"),
+    db: Session = Depends(session.get_db),
+):
+    """List employees newest first. Pass the X-Next-Cursor response header back as `cursor` for the next page."""
+    items = svc_list_employees(
+        db, limit=limit, cursor=cursor, manager_id=managerId, is_active=isActive,
+        hired_from=hiredFrom, hired_to=hiredTo, fields=fields,
+    )
+    cursor_out = next_cursor(items, limit)
+    if cursor_out:
+        response.headers[NEXT_CURSOR_HEADER] = cursor_out
+    return items
 
 @employees_router.get("/manager/{manager_id}", response_model=list[EmployeeResponse])
 def list_employees_by_manager(manager_id: str, db: Session = Depends(session.get_db)):
@@ -29,11 +65,28 @@ def get_employee_by_id(employee_id: str, db: Session = Depends(session.get_db)):
     return svc_get_employee_by_id(db, employee_id)
 
 
+@employees_router.get("/{employee_id}/subtree", response_model=list[EmployeeSubtreeResponse])
+def get_employee_subtree(employee_id: str, maxDepth: int | None = Query(None, ge=1), db: Session = Depends(session.get_db)):
+    """Whole reporting tree below an employee in one recursive query (``maxDepth=1`` = direct reports)."""
+    return svc_get_employee_subtree(db, employee_id, maxDepth)
+
+
 @employees_router.post("", response_model=EmployeeResponse)
 def create_employee(employee: EmployeeCreate, db: Session = Depends(session.get_db)):
     return svc_create_employee(db, employee)
 
 
+@employees_router.post("/bulk", response_model=EmployeeImportResult)
+async def import_employees(request: Request, db: Session = Depends(session.get_db)):
+    """Upsert employees (on email / CNP) from a CSV or NDJSON body; see README "Bulk imports"."""
+    fmt = bulk_format(request.headers.get("content-type"))
+    body = await spool_request_body(request, settings.BULK_IMPORT_MAX_BYTES)
+    try:
+        return await run_in_threadpool(svc_import_employees, db, body, fmt)
+    finally:
+        body.close()
+
+
 @employees_router.put("/{employee_id}", response_model=EmployeeResponse)
 def update_employee(employee_id: str, employee: EmployeeUpdate, db: Session = Depends(session.get_db)):
     return svc_update_employee(db, employee_id, employee)
@@ -42,3 +95,36 @@ def update_employee(employee_id: str, employee: EmployeeUpdate, db: Session = De
 @employees_router.delete("/{employee_id}")
 def delete_employee(employee_id: str, db: Session = Depends(session.get_db)):
     return svc_delete_employee(db, employee_id)
+
+
+@employees_router.post("/{employee_id}/revoke_tokens")
+def revoke_employee_tokens(employee_id: str, db: Session = Depends(session.get_db)):
+    """Invalidate every access and refresh token of the employee (forces a new login)."""
+    return svc_revoke_employee_tokens(db, employee_id)
+
+
+@employees_async_router.get("", response_model=list[EmployeeListItem], response_model_exclude_unset=True)
+async def list_employees_async(
+    response: Response,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: str | None = None,
+    managerId: UUID | None = None,
+    isActive: bool | None = None,
+    hiredFrom: date | None = None,
+    hiredTo: date | None = None,
+    fields: str | None = None,
+    db: "AsyncSession" = Depends(session.get_async_db),
+):
+    items = await svc_list_employees_async(
+        db, limit=limit, cursor=cursor, manager_id=managerId, is_active=isActive,
+        hired_from=hiredFrom, hired_to=hiredTo, fields=fields,
+    )
+    cursor_out = next_cursor(items, limit)
+    if cursor_out:
+        response.headers[NEXT_CURSOR_HEADER] = cursor_out
+    return items
+
+
+@employees_async_router.get("/{employee_id}", response_model=EmployeeResponse)
+async def get_employee_by_id_async(employee_id: str, db: "AsyncSession" = Depends(session.get_async_db)):
+    return await svc_get_employee_by_id_async(db, employee_id)
@@ -1,8 +1,14 @@
 from fastapi import APIRouter, Depends
 from auth.deps import require_manager
+from utils.ttl_cache import cache_stats
 
 health_router = APIRouter(prefix="/health", dependencies=[Depends(require_manager)])
 
 @health_router.get("")
 async def health_check():
-    return {"status": "ok"}
\ No newline at end of file
+    return {"status": "ok"}
+
+@health_router.get("/caches")
+async def cache_metrics():
+    """Hit/miss counters of this process's reference data caches."""
+    return cache_stats()
@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends, Query
+from auth.deps import require_manager
+from sqlalchemy.orm import Session
+from db import session
+from api.schemas import JobResponse
+from services.jobs_service import (
+    get_job as svc_get_job,
+    list_jobs as svc_list_jobs,
+)
+
+jobs_router = APIRouter(prefix="/jobs", tags=["jobs"], dependencies=[Depends(require_manager)])
+
+
+@jobs_router.get("", response_model=list[JobResponse])
+def list_jobs(
+    status: str | None = Query(None, description="queued | running | succeeded | failed"),
+    kind: str | None = None,
+    limit: int = Query(100, ge=1, le=500),
+    db: Session = Depends(session.get_db),
+):
+    return svc_list_jobs(db, status=status, kind=kind, limit=limit)
+
+
+@jobs_router.get("/{job_id}", response_model=JobResponse)
+def get_job(job_id: str, db: Session = Depends(session.get_db)):
+    """Poll a background job: status, per-item progress counts and, once finished, its result or error."""
+    return svc_get_job(db, job_id)
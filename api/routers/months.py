@@ -1,17 +1,25 @@
+from typing import TYPE_CHECKING
 from fastapi import APIRouter, Depends
-from auth.deps import require_manager
+from auth.deps import require_manager, require_manager_async
 from sqlalchemy.orm import Session
 from db import session
 from api.schemas import MonthInfoResponse, MonthInfoCreate, MonthInfoUpdate
 from services.months_service import (
     get_months as svc_list_months,
+    get_months_async as svc_list_months_async,
     get_month_by_id as svc_get_month_by_id,
+    get_month_by_id_async as svc_get_month_by_id_async,
     create_month as svc_create_month,
     update_month as svc_update_month,
     delete_month as svc_delete_month,
 )
 
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
 months_router = APIRouter(prefix="/months", dependencies=[Depends(require_manager)])
+# Async read endpoints, mounted ahead of months_router when DB_ASYNC_READS is set
+months_async_router = APIRouter(prefix="/months", dependencies=[Depends(require_manager_async)], include_in_schema=False)
 
 
 @months_router.get("", response_model=list[MonthInfoResponse])
@@ -37,3 +45,13 @@ def update_month(month_id: str, month: MonthInfoUpdate, db: Session = Depends(se
 @months_router.delete("/{month_id}")
 def delete_month(month_id: str, db: Session = Depends(session.get_db)):
     return svc_delete_month(db, month_id)
+
+
+@months_async_router.get("", response_model=list[MonthInfoResponse])
+async def list_months_async(db: "AsyncSession" = Depends(session.get_async_db)):
+    return await svc_list_months_async(db)
+
+
+@months_async_router.get("/{month_id}", response_model=MonthInfoResponse)
+async def get_month_by_id_async(month_id: str, db: "AsyncSession" = Depends(session.get_async_db)):
+    return await svc_get_month_by_id_async(db, month_id)
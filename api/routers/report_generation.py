@@ -1,47 +1,65 @@
-from fastapi import APIRouter, Depends, Header
+from fastapi import APIRouter, Depends, Header, Query, Response
 from sqlalchemy.orm import Session
 from uuid import UUID
 from db import session
-from services.report_generation_service import (
-    generate_manager_csv_idempotent,
-    send_manager_csv,
-    send_manager_csv_live,
-    generate_employee_pdfs_idempotent,
-    send_employee_pdfs,
-    send_employee_pdfs_live,
+from api.schemas import JobAccepted
+from services.jobs_service import (
+    enqueue_job as svc_enqueue_job,
+    job_accepted as svc_job_accepted,
 )
 from auth.deps import require_manager
 
 report_generation_router = APIRouter(prefix="/reports_generation", tags=["reports-generation"])
 
-@report_generation_router.post("/createAggregatedEmployeeData")
-def create_aggregated_employee_data(managerId: UUID, year: int, month: int, includeBonuses: bool = True, idempotency_key: str | None = Header(default=None, alias="Idempotency-Key"), db: Session = Depends(session.get_db), _: None = Depends(require_manager)):
-    return generate_manager_csv_idempotent(db, managerId, year, month, include_bonuses=includeBonuses, idempotency_key=idempotency_key)
+# Every endpoint queues a background job (run by worker.py) and answers 202 with its id;
+# poll GET /api/jobs/{jobId} for progress and the result. Manager endpoints take
+# scope=subtree to cover everyone below the manager instead of direct reports only.
 
-@report_generation_router.post("/sendAggregatedEmployeeData")
-def send_aggregated_employee_data(managerId: UUID, year: int, month: int, idempotency_key: str | None = Header(default=None, alias="Idempotency-Key"), db: Session = Depends(session.get_db), _: None = Depends(require_manager)):
-    return send_manager_csv(db, managerId, year, month, idempotency_key=idempotency_key)
 
-@report_generation_router.post("/sendAggregatedEmployeeDataLive")
-def send_aggregated_employee_data_live(managerId: UUID, year: int, month: int, idempotency_key: str | None = Header(default=None, alias="Idempotency-Key"), db: Session = Depends(session.get_db), _: None = Depends(require_manager)):
+def _accepted(response: Response, db: Session, kind: str, params: dict, idempotency_key: str | None, manager) -> dict:
+    job = svc_enqueue_job(db, kind, params, idempotency_key=idempotency_key, requested_by=manager.id)
+    body = svc_job_accepted(job)
+    response.headers["Location"] = body["statusUrl"]
+    return body
+
+
+def _scoped(params: dict, scope: str) -> dict:
+    # 'direct' stays implicit so existing jobs and idempotency keys keep their params
+    return {**params, "scope": scope} if scope != "direct" else params
+
+@report_generation_router.post("/createAggregatedEmployeeData", status_code=202, response_model=JobAccepted)
+def create_aggregated_employee_data(response: Response, managerId: UUID, year: int, month: int, includeBonuses: bool = True, scope: str = Query("direct", pattern="^(direct|subtree)$"), idempotency_key: str | None = Header(default=None, alias="Idempotency-Key"), db: Session = Depends(session.get_db), manager = Depends(require_manager)):
+    return _accepted(response, db, 'generate_manager_csv', _scoped({"managerId": managerId, "year": year, "month": month, "includeBonuses": includeBonuses}, scope), idempotency_key, manager)
+
+@report_generation_router.post("/sendAggregatedEmployeeData", status_code=202, response_model=JobAccepted)
+def send_aggregated_employee_data(response: Response, managerId: UUID, year: int, month: int, scope: str = Query("direct", pattern="^(direct|subtree)$"), idempotency_key: str | None = Header(default=None, alias="Idempotency-Key"), db: Session = Depends(session.get_db), manager = Depends(require_manager)):
+    return _accepted(response, db, 'send_manager_csv', _scoped({"managerId": managerId, "year": year, "month": month}, scope), idempotency_key, manager)
+
+@report_generation_router.post("/sendAggregatedEmployeeDataLive", status_code=202, response_model=JobAccepted)
+def send_aggregated_employee_data_live(response: Response, managerId: UUID, year: int, month: int, scope: str = Query("direct", pattern="^(direct|subtree)$"), idempotency_key: str | None = Header(default=None, alias="Idempotency-Key"), db: Session = Depends(session.get_db), manager = Depends(require_manager)):
     """Production variant of aggregated CSV email using real SMTP settings.
 
-    Returns same structure as dev endpoint plus status 'sent_live'.
+    SMTP configuration is validated before the job is queued; the job result carries status 'sent_live'.
     """
-    return send_manager_csv_live(db, managerId, year, month, idempotency_key=idempotency_key)
+    return _accepted(response, db, 'send_manager_csv_live', _scoped({"managerId": managerId, "year": year, "month": month}, scope), idempotency_key, manager)
 
-@report_generation_router.post("/createPdfForEmployees")
-def create_pdf_for_employees(managerId: UUID, year: int, month: int, overwriteExisting: bool = False, idempotency_key: str | None = Header(default=None, alias="Idempotency-Key"), db: Session = Depends(session.get_db), _: None = Depends(require_manager)):
-    return generate_employee_pdfs_idempotent(db, managerId, year, month, overwrite=overwriteExisting, idempotency_key=idempotency_key)
+@report_generation_router.post("/createPdfForEmployees", status_code=202, response_model=JobAccepted)
+def create_pdf_for_employees(response: Response, managerId: UUID, year: int, month: int, overwriteExisting: bool = False, scope: str = Query("direct", pattern="^(direct|subtree)$"), idempotency_key: str | None = Header(default=None, alias="Idempotency-Key"), db: Session = Depends(session.get_db), manager = Depends(require_manager)):
+    return _accepted(response, db, 'generate_employee_pdfs', _scoped({"managerId": managerId, "year": year, "month": month, "overwrite": overwriteExisting}, scope), idempotency_key, manager)
 
-@report_generation_router.post("/sendPdfToEmployees")
-def send_pdf_to_employees(managerId: UUID, year: int, month: int, regenerateMissing: bool = False, idempotency_key: str | None = Header(default=None, alias="Idempotency-Key"), db: Session = Depends(session.get_db), _: None = Depends(require_manager)):
-    return send_employee_pdfs(db, managerId, year, month, regenerate_missing=regenerateMissing, idempotency_key=idempotency_key)
+@report_generation_router.post("/sendPdfToEmployees", status_code=202, response_model=JobAccepted)
+def send_pdf_to_employees(response: Response, managerId: UUID, year: int, month: int, regenerateMissing: bool = False, scope: str = Query("direct", pattern="^(direct|subtree)$"), idempotency_key: str | None = Header(default=None, alias="Idempotency-Key"), db: Session = Depends(session.get_db), manager = Depends(require_manager)):
+    return _accepted(response, db, 'send_employee_pdfs', _scoped({"managerId": managerId, "year": year, "month": month, "regenerateMissing": regenerateMissing}, scope), idempotency_key, manager)
 
-@report_generation_router.post("/sendPdfToEmployeesLive")
-def send_pdf_to_employees_live(managerId: UUID, year: int, month: int, regenerateMissing: bool = False, idempotency_key: str | None = Header(default=None, alias="Idempotency-Key"), db: Session = Depends(session.get_db), _: None = Depends(require_manager)):
+@report_generation_router.post("/sendPdfToEmployeesLive", status_code=202, response_model=JobAccepted)
+def send_pdf_to_employees_live(response: Response, managerId: UUID, year: int, month: int, regenerateMissing: bool = False, scope: str = Query("direct", pattern="^(direct|subtree)$"), idempotency_key: str | None = Header(default=None, alias="Idempotency-Key"), db: Session = Depends(session.get_db), manager = Depends(require_manager)):
     """Send PDFs through real SMTP (non-local). Requires production SMTP settings configured.
 
-    Returns same structure as the dev endpoint plus status flag 'sent_live'.
+    SMTP configuration is validated before the job is queued; the job result carries status 'sent_live'.
     """
-    return send_employee_pdfs_live(db, managerId, year, month, regenerate_missing=regenerateMissing, idempotency_key=idempotency_key)
+    return _accepted(response, db, 'send_employee_pdfs_live', _scoped({"managerId": managerId, "year": year, "month": month, "regenerateMissing": regenerateMissing}, scope), idempotency_key, manager)
+
+@report_generation_router.post("/closeMonth", status_code=202, response_model=JobAccepted)
+def close_month(response: Response, year: int, month: int, overwriteExisting: bool = False, idempotency_key: str | None = Header(default=None, alias="Idempotency-Key"), db: Session = Depends(session.get_db), manager = Depends(require_manager)):
+    """Generate every manager's CSV and every employee's slip for the month in one resumable job."""
+    return _accepted(response, db, 'close_month', {"year": year, "month": month, "overwrite": overwriteExisting}, idempotency_key, manager)
@@ -1,19 +1,30 @@
-import os
-from fastapi import APIRouter, Depends, HTTPException
-from auth.deps import require_manager
+from typing import TYPE_CHECKING
+from uuid import UUID
+from fastapi import APIRouter, Depends, Query, Request, Response
+from auth.deps import require_manager, require_manager_async
 from fastapi.responses import StreamingResponse, FileResponse
 from sqlalchemy.orm import Session
 from db import session
 from api.schemas import ReportFileResponse, ReportFileCreate, ReportFileUpdate
+from utils.http_range import etag_matches, parse_range
+from utils.pagination import NEXT_CURSOR_HEADER, next_cursor
 from services.reports_service import (
     get_report_files as svc_list_report_files,
+    get_report_files_async as svc_list_report_files_async,
     get_report_file_by_id as svc_get_report_file_by_id,
+    get_report_file_by_id_async as svc_get_report_file_by_id_async,
     create_report_file as svc_create_report_file,
     update_report_file as svc_update_report_file,
     delete_report_file as svc_delete_report_file,
+    open_report_download as svc_open_report_download,
 )
 
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
 reports_router = APIRouter(prefix="/reports", dependencies=[Depends(require_manager)])
+# Async metadata endpoints, mounted ahead of reports_router when DB_ASYNC_READS is set
+reports_async_router = APIRouter(prefix="/reports", dependencies=[Depends(require_manager_async)], include_in_schema=False)
 
 
 def _normalize_report_id(raw: str) -> str:
@@ -26,8 +37,22 @@ def _normalize_report_id(raw: str) -> str:
 
 
 @reports_router.get("", response_model=list[ReportFileResponse])
-def list_report_files(db: Session = Depends(session.get_db)):
-    return svc_list_report_files(db)
+def list_report_files(
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: str | None = None,
+    ownerId: UUID | None = None,
+    file_type: str | None = Query(None, alias="type"),
+    archived: bool | None = None,
+    period: str | None = Query(None, pattern=r"^\d{4}-\d{2}$", description="Reporting period YYYY-MM"),
+    db: Session = Depends(session.get_db),
+):
+    """List report metadata newest first. Pass the X-Next-Cursor response header back as `cursor` for the next page."""
+    items = svc_list_report_files(db, limit=limit, cursor=cursor, owner_id=ownerId, file_type=file_type, archived=archived, period=period)
+    cursor_out = next_cursor(items, limit)
+    if cursor_out:
+        response.headers[NEXT_CURSOR_HEADER] = cursor_out
+    return items
 
 
 @reports_router.get("/{report_id}", response_model=ReportFileResponse)
@@ -36,22 +61,25 @@ def get_report_file_by_id(report_id: str, db: Session = Depends(session.get_db))
     return svc_get_report_file_by_id(db, clean_id)
 
 @reports_router.get("/{report_id}/download")
-def download_report_file(report_id: str, db: Session = Depends(session.get_db)):
+def download_report_file(report_id: str, request: Request, db: Session = Depends(session.get_db)):
+    """Stream report bytes in chunks. Supports single `Range` requests and `If-None-Match` (304)."""
     clean_id = _normalize_report_id(report_id)
-    report = svc_get_report_file_by_id(db, clean_id)
-    # Prefer inline DB content
-    if getattr(report, 'content', None):
-        media = report.content_type or 'application/octet-stream'
-        filename = os.path.basename(report.path)
-        return StreamingResponse(iter([report.content]), media_type=media, headers={
-            'Content-Disposition': f'attachment; filename={filename}'
-        })
-    # Fallback to path on disk if content missing
-    if not os.path.exists(report.path):
-        raise HTTPException(status_code=404, detail='File not found')
-    media_map = {'csv':'text/csv','pdf':'application/pdf','zip':'application/zip'}
-    media = media_map.get(report.type, 'application/octet-stream')
-    return FileResponse(report.path, media_type=media, filename=os.path.basename(report.path))
+    dl = svc_open_report_download(db, clean_id)
+    headers = {'ETag': dl.etag, 'Accept-Ranges': 'bytes'}
+    if etag_matches(request.headers.get('if-none-match'), dl.etag):
+        return Response(status_code=304, headers=headers)
+    headers['Content-Disposition'] = f'attachment; filename={dl.filename}'
+    byte_range = parse_range(request.headers.get('range'), dl.size)
+    if byte_range is None:
+        if dl.local_path:
+            # Let the server use zero-copy file sending where available
+            return FileResponse(dl.local_path, media_type=dl.media_type, filename=dl.filename, headers={'ETag': dl.etag, 'Accept-Ranges': 'bytes'})
+        headers['Content-Length'] = str(dl.size)
+        return StreamingResponse(dl.read_range(0, dl.size - 1), media_type=dl.media_type, headers=headers)
+    start, end = byte_range
+    headers['Content-Range'] = f'bytes {start}-{end}/{dl.size}'
+    headers['Content-Length'] = str(end - start + 1)
+    return StreamingResponse(dl.read_range(start, end), status_code=206, media_type=dl.media_type, headers=headers)
 
 
 @reports_router.post("", response_model=ReportFileResponse)
@@ -67,3 +95,26 @@ def update_report_file(report_id: str, report: ReportFileUpdate, db: Session = D
 @reports_router.delete("/{report_id}")
 def delete_report_file(report_id: str, db: Session = Depends(session.get_db)):
     return svc_delete_report_file(db, report_id)
+
+
+@reports_async_router.get("", response_model=list[ReportFileResponse])
+async def list_report_files_async(
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: str | None = None,
+    ownerId: UUID | None = None,
+    file_type: str | None = Query(None, alias="type"),
+    archived: bool | None = None,
+    period: str | None = Query(None, pattern=r"^\d{4}-\d{2}$"),
+    db: "AsyncSession" = Depends(session.get_async_db),
+):
+    items = await svc_list_report_files_async(db, limit=limit, cursor=cursor, owner_id=ownerId, file_type=file_type, archived=archived, period=period)
+    cursor_out = next_cursor(items, limit)
+    if cursor_out:
+        response.headers[NEXT_CURSOR_HEADER] = cursor_out
+    return items
+
+
+@reports_async_router.get("/{report_id}", response_model=ReportFileResponse)
+async def get_report_file_by_id_async(report_id: str, db: "AsyncSession" = Depends(session.get_async_db)):
+    return await svc_get_report_file_by_id_async(db, _normalize_report_id(report_id))
@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
+from fastapi.concurrency import run_in_threadpool
 from auth.deps import require_manager
 from sqlalchemy.orm import Session
 from db import session
-from api.schemas import SalaryComponentResponse, SalaryComponentCreate, SalaryComponentUpdate
+from api.schemas import BulkImportResult, SalaryComponentResponse, SalaryComponentCreate, SalaryComponentUpdate
+from core.settings import settings
+from utils.bulk_records import bulk_format, spool_request_body
 from services.salary_components_service import (
     get_salary_components as svc_list_salary_components,
     get_salary_component_by_id as svc_get_salary_component_by_id,
@@ -10,6 +13,7 @@ from services.salary_components_service import (
     update_salary_component as svc_update_salary_component,
     delete_salary_component as svc_delete_salary_component,
 )
+from services.bulk_import_service import import_salary_components as svc_bulk_import_salary_components
 
 salary_components_router = APIRouter(prefix="/salary_components", dependencies=[Depends(require_manager)])
 
@@ -29,6 +33,20 @@ def create_salary_component(component: SalaryComponentCreate, db: Session = Depe
     return svc_create_salary_component(db, component)
 
 
+@salary_components_router.post("/bulk", response_model=BulkImportResult)
+async def bulk_import_salary_components(request: Request, db: Session = Depends(session.get_db)):
+    """Upsert salary components from a CSV (``text/csv``) or NDJSON (``application/x-ndjson``) body.
+
+    Valid lines are merged in one transaction; invalid ones are reported per line.
+    """
+    fmt = bulk_format(request.headers.get("content-type"))
+    body = await spool_request_body(request, settings.BULK_IMPORT_MAX_BYTES)
+    try:
+        return await run_in_threadpool(svc_bulk_import_salary_components, db, body, fmt)
+    finally:
+        body.close()
+
+
 @salary_components_router.put("/{component_id}", response_model=SalaryComponentResponse)
 def update_salary_component(component_id: str, component: SalaryComponentUpdate, db: Session = Depends(session.get_db)):
     return svc_update_salary_component(db, component_id, component)
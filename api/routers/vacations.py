@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
+from fastapi.concurrency import run_in_threadpool
 from auth.deps import require_manager
 from sqlalchemy.orm import Session
 from db import session
-from api.schemas import VacationResponse, VacationCreate, VacationUpdate
+from api.schemas import BulkImportResult, VacationResponse, VacationCreate, VacationUpdate
+from core.settings import settings
+from utils.bulk_records import bulk_format, spool_request_body
 from services.vacations_service import (
     get_vacations as svc_list_vacations,
     get_vacation_by_id as svc_get_vacation_by_id,
@@ -10,6 +13,7 @@ from services.vacations_service import (
     update_vacation as svc_update_vacation,
     delete_vacation as svc_delete_vacation,
 )
+from services.bulk_import_service import import_vacations as svc_bulk_import_vacations
 
 vacations_router = APIRouter(prefix="/vacations", dependencies=[Depends(require_manager)])
 
@@ -29,6 +33,20 @@ def create_vacation(vacation: VacationCreate, db: Session = Depends(session.get_
     return svc_create_vacation(db, vacation)
 
 
+@vacations_router.post("/bulk", response_model=BulkImportResult)
+async def bulk_import_vacations(request: Request, db: Session = Depends(session.get_db)):
+    """Upsert vacations from a CSV (``text/csv``) or NDJSON (``application/x-ndjson``) body.
+
+    Valid lines are merged in one transaction; invalid ones are reported per line.
+    """
+    fmt = bulk_format(request.headers.get("content-type"))
+    body = await spool_request_body(request, settings.BULK_IMPORT_MAX_BYTES)
+    try:
+        return await run_in_threadpool(svc_bulk_import_vacations, db, body, fmt)
+    finally:
+        body.close()
+
+
 @vacations_router.put("/{vacation_id}", response_model=VacationResponse)
 def update_vacation(vacation_id: str, vacation: VacationUpdate, db: Session = Depends(session.get_db)):
     return svc_update_vacation(db, vacation_id, vacation)
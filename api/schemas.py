@@ -17,6 +17,22 @@ class EmployeeResponse(CamelModel):
 	base_salary: float
 	manager_id: Optional[UUID]
 
+class EmployeeListItem(CamelModel):
+	id: UUID
+	email: Optional[str] = None
+	is_active: Optional[bool] = None
+	is_manager: Optional[bool] = None
+	created_at: Optional[datetime] = None
+	first_name: Optional[str] = None
+	last_name: Optional[str] = None
+	cnp: Optional[str] = None
+	hire_date: Optional[date] = None
+	base_salary: Optional[float] = None
+	manager_id: Optional[UUID] = None
+
+class EmployeeSubtreeResponse(EmployeeResponse):
+	depth: int
+
 class EmployeeCreate(CamelModel):
 	email: str
 	password_hash: Optional[str] = None
@@ -42,6 +58,11 @@ class EmployeeUpdate(CamelModel):
 	manager_id: Optional[UUID] = None
 
 
+class EmployeeImportRecord(EmployeeCreate):
+	password: Optional[str] = None
+	manager_email: Optional[str] = None
+
+
 class MonthInfoResponse(CamelModel):
 	id: UUID
 	year: int
@@ -103,6 +124,27 @@ class VacationUpdate(CamelModel):
 	days_taken: Optional[int] = None
 
 
+class BulkImportReject(CamelModel):
+	line: int
+	error: str
+
+class BulkImportResult(CamelModel):
+	received: int
+	inserted: int
+	updated: int
+	unchanged: int
+	rejected: int
+	rejects: list[BulkImportReject]
+
+class EmployeeImportResult(CamelModel):
+	received: int
+	inserted: int
+	updated: int
+	rejected: int
+	rejects: list[BulkImportReject]
+	metrics: dict
+
+
 class IdempotencyKeyResponse(CamelModel):
 	id: UUID
 	key: str
@@ -132,6 +174,7 @@ class ReportFileResponse(CamelModel):
 	archived: bool
 	content_type: Optional[str]
 	size_bytes: Optional[int]
+	period: Optional[str] = None
 
 class ReportFileCreate(CamelModel):
 	path: str
@@ -146,3 +189,27 @@ class ReportFileUpdate(CamelModel):
 	archived: Optional[bool] = None
 
 
+
+
+class JobResponse(CamelModel):
+	id: UUID
+	kind: str
+	status: str
+	params: dict
+	progress_total: int
+	progress_done: int
+	progress_failed: int
+	result: Optional[dict] = None
+	error: Optional[str] = None
+	attempts: int
+	max_attempts: int
+	locked_by: Optional[str] = None
+	created_at: Optional[datetime] = None
+	started_at: Optional[datetime] = None
+	finished_at: Optional[datetime] = None
+
+class JobAccepted(CamelModel):
+	job_id: UUID
+	kind: str
+	status: str
+	status_url: str
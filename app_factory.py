@@ -4,24 +4,36 @@ Using a factory avoids side effects (like starting logging or importing heavy mo
 when tests import the application. Tests can call `create_app()` to get an
 isolated instance and override dependencies.
 """
+from contextlib import asynccontextmanager
+
 import fastapi
 from fastapi.middleware.cors import CORSMiddleware
 
 from core.logging import configure_logging, RequestLoggingMiddleware
-from api.routers.employees import employees_router
+from core.settings import settings
+from db.session import dispose_async_engine
+from utils.pagination import NEXT_CURSOR_HEADER
+from api.routers.employees import employees_async_router, employees_router
 from api.routers.health import health_router
 from api.routers.idempotency_keys import idempotency_router
-from api.routers.months import months_router
-from api.routers.reports import reports_router
+from api.routers.months import months_async_router, months_router
+from api.routers.reports import reports_async_router, reports_router
 from api.routers.report_generation import report_generation_router
 from api.routers.salary_components import salary_components_router
 from api.routers.vacations import vacations_router
 from api.routers.auth import auth_router
+from api.routers.jobs import jobs_router
+
+
+@asynccontextmanager
+async def _lifespan(app: fastapi.FastAPI):
+    yield
+    await dispose_async_engine()
 
 
 def create_app() -> fastapi.FastAPI:
     configure_logging()
-    app = fastapi.FastAPI()
+    app = fastapi.FastAPI(lifespan=_lifespan)
     app.add_middleware(RequestLoggingMiddleware)
     app.add_middleware(
         CORSMiddleware,
@@ -29,9 +41,14 @@ def create_app() -> fastapi.FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
-        expose_headers=[],
+        expose_headers=[NEXT_CURSOR_HEADER],
     )
     # Routers
+    if settings.DB_ASYNC_READS:
+        # Registered first: their GET handlers take precedence over the sync ones on the same paths
+        app.include_router(employees_async_router, prefix="/api")
+        app.include_router(months_async_router, prefix="/api")
+        app.include_router(reports_async_router, prefix="/api")
     app.include_router(health_router, prefix="/api")
     app.include_router(idempotency_router, prefix="/api")
     app.include_router(salary_components_router, prefix="/api")
@@ -41,4 +58,5 @@ def create_app() -> fastapi.FastAPI:
     app.include_router(employees_router, prefix="/api")
     app.include_router(report_generation_router, prefix="/api")
     app.include_router(auth_router, prefix="/api")
+    app.include_router(jobs_router, prefix="/api")
     return app
@@ -1,28 +1,52 @@
+from typing import TYPE_CHECKING
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 import jwt
-from db import session, models
+from db import session
+from db.repositories.auth_repo import Principal, repo_get_principal, repo_get_principal_async
 from core.settings import settings
 
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 CREDENTIALS_EXCEPTION = HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Could not validate credentials", headers={"WWW-Authenticate": "Bearer"})
 
-def get_current_employee(token: str = Depends(oauth2_scheme), db: Session = Depends(session.get_db)) -> models.Employee:
+def _token_subject(token: str) -> tuple[str, int]:
+    """``(sub, ver)`` of a valid access token; tokens issued before token versions existed count as version 0."""
     try:
         payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
         sub = payload.get("sub")
-        if sub is None:
+        version = payload.get("ver", 0)
+        if sub is None or not isinstance(version, int):
             raise CREDENTIALS_EXCEPTION
     except jwt.PyJWTError:
         raise CREDENTIALS_EXCEPTION
-    user = db.get(models.Employee, sub)
-    if not user or not user.is_active:
+    return sub, version
+
+def get_current_employee(token: str = Depends(oauth2_scheme), db: Session = Depends(session.get_db)) -> Principal:
+    """Principal of the bearer token; cached per (subject, ``ver`` claim), so hot paths skip the DB."""
+    user = repo_get_principal(db, *_token_subject(token))
+    if user is None:
         raise CREDENTIALS_EXCEPTION
     return user
 
-def require_manager(current: models.Employee = Depends(get_current_employee)) -> models.Employee:
+def require_manager(current: Principal = Depends(get_current_employee)) -> Principal:
     if not current.is_manager:
         raise HTTPException(status_code=403, detail="Manager access required")
     return current
+
+async def get_current_employee_async(token: str = Depends(oauth2_scheme), db: "AsyncSession" = Depends(session.get_async_db)) -> Principal:
+    """``get_current_employee`` for the async routers: no threadpool hop for the lookup or the session.
+
+    The cache is checked first; the AsyncSession only connects on a miss.
+    """
+    user = await repo_get_principal_async(db, *_token_subject(token))
+    if user is None:
+        raise CREDENTIALS_EXCEPTION
+    return user
+
+async def require_manager_async(current: Principal = Depends(get_current_employee_async)) -> Principal:
+    return require_manager(current)
@@ -15,6 +15,11 @@ class Settings(BaseSettings):
 	PGPORT: int
 	LOG_LEVEL: str | None = None
 
+	# Async (asyncpg) stack for read-heavy GET endpoints; needs sqlalchemy[asyncio] and asyncpg
+	DB_ASYNC_READS: bool = False
+	ASYNC_DB_POOL_SIZE: int = 10
+	ASYNC_DB_MAX_OVERFLOW: int = 10
+
 	# SMTP / Email settings (MailHog defaults)
 	SMTP_HOST: str = "localhost"
 	SMTP_PORT: int = 1025
@@ -22,12 +27,42 @@ class Settings(BaseSettings):
 	SMTP_TLS: bool = False
 	SMTP_USERNAME: str | None = None
 	SMTP_PASSWORD: str | None = None
+	SMTP_TIMEOUT: float = 10.0
+	SMTP_POOL_SIZE: int = 4  # Authenticated connections kept open per SMTP server
+	SMTP_MAX_MESSAGES_PER_CONNECTION: int = 100  # Recycle before servers enforce their own per-session limit
+	EMAIL_SEND_CONCURRENCY: int = 4  # Concurrent sends per batch (capped by SMTP_POOL_SIZE)
+	SMTP_RATE_LIMIT_PER_SECOND: float | None = None  # Max messages/second per SMTP host; None disables
 
 	# JWT / Auth settings
 	JWT_SECRET_KEY: str = "dev-change-me"  # Replace in production
 	JWT_ALGORITHM: str = "HS256"
 	ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
 	REFRESH_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 days
+	PRINCIPAL_CACHE_TTL_SECONDS: float = 30.0  # Per-process cache of authenticated employees; 0 disables
+
+	# Background jobs (worker.py)
+	JOB_POLL_INTERVAL_SECONDS: float = 1.0
+	JOB_STALE_AFTER_SECONDS: float = 300.0  # Running jobs without a heartbeat this long are requeued
+	JOB_MAX_ATTEMPTS: int = 3
+	JOB_RETRY_DELAY_SECONDS: float = 30.0
+	MONTH_CLOSE_BATCH_SLIPS: int = 256  # Slips rendered (and checkpointed) per month-close batch
+
+	# Bulk CSV / NDJSON imports (salary components, vacations)
+	BULK_IMPORT_MAX_BYTES: int = 50 * 1024 * 1024
+
+	# In-process reference data caches (month info, employee identity); per process, bounded by TTL
+	REFERENCE_CACHE_TTL_SECONDS: float = 300.0  # 0 disables
+	REFERENCE_CACHE_MAX_ENTRIES: int = 1024  # Per cache, LRU-evicted beyond this
+
+	# PDF rendering
+	PDF_RENDER_WORKERS: int | None = None  # Shared process pool size (PDF rendering, import password hashing); None -> os.cpu_count()
+
+	# Report blob storage (content-addressed by SHA-256)
+	BLOB_STORE_BACKEND: str = "local"  # local | s3 | memory
+	BLOB_STORE_ROOT: str = "reports/blobs"
+	S3_BUCKET: str | None = None
+	S3_ENDPOINT_URL: str | None = None
+	S3_PREFIX: str = "blobs/"
 
 	@property
 	def DATABASE_URL(self) -> str:
@@ -37,6 +72,14 @@ class Settings(BaseSettings):
 			f"@{self.PGHOST}:{self.PGPORT}/{self.POSTGRES_DB}"
 		)
 
+	@property
+	def ASYNC_DATABASE_URL(self) -> str:
+		"""Same database through asyncpg, for the async engine."""
+		return (
+			f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}"
+			f"@{self.PGHOST}:{self.PGPORT}/{self.POSTGRES_DB}"
+		)
+
 	class Config:
 		env_file = Path(__file__).resolve().parent.parent / ".env" 
 		extra = "ignore"
@@ -3,7 +3,7 @@ import enum, uuid
 from datetime import datetime, date, timezone
 from sqlalchemy import (
     String, Date, Enum, ForeignKey, Numeric, UniqueConstraint,
-    Boolean, DateTime, Integer, LargeBinary
+    Boolean, DateTime, Integer, LargeBinary, Index, JSON, Text
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship, Mapped, mapped_column
@@ -22,6 +22,8 @@ class Employee(Base):
     password_hash: Mapped[str | None] = mapped_column(String(255), nullable=True)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     is_manager: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    # Stamped on access tokens as "ver"; bumping it revokes every token issued before
+    token_version: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
 
     # Domain fields
@@ -31,17 +33,24 @@ class Employee(Base):
     hire_date: Mapped[date] = mapped_column(Date, nullable=False)
     base_salary: Mapped[float] = mapped_column(Numeric(12,2), nullable=False)
 
-    manager_id: Mapped[uuid.UUID | None] = mapped_column(ForeignKey("employees.id"), nullable=True)
+    manager_id: Mapped[uuid.UUID | None] = mapped_column(ForeignKey("employees.id"), nullable=True, index=True)
+    # Materialized management chain "/<top id>/.../<own id>/", kept current by the employee
+    # repositories; ordering by it lists a subtree depth-first, each team under its manager
+    org_path: Mapped[str | None] = mapped_column(Text, nullable=True)
 
     # relations
     manager: Mapped["Employee | None"] = relationship(remote_side=[id], backref="subordinates")
     vacations: Mapped[list["Vacation"]] = relationship(back_populates="employee", cascade="all, delete-orphan")
     components: Mapped[list["SalaryComponent"]] = relationship(back_populates="employee", cascade="all, delete-orphan")
+    __table_args__ = (
+        Index("ix_employees_org_path", "org_path", postgresql_ops={"org_path": "text_pattern_ops"}),
+        Index("ix_employees_created_at_id", "created_at", "id"),
+    )
 
 class SalaryComponent(Base):
     __tablename__ = "salary_components"
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    employee_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("employees.id"), nullable=False, index=True)
+    employee_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("employees.id"), nullable=False)
     year: Mapped[int] = mapped_column(nullable=False)
     month: Mapped[int] = mapped_column(nullable=False)
     type: Mapped[SalaryComponentType] = mapped_column(Enum(SalaryComponentType), nullable=False)
@@ -49,18 +58,28 @@ class SalaryComponent(Base):
     note: Mapped[str | None] = mapped_column(String(255), nullable=True)
 
     employee: Mapped["Employee"] = relationship(back_populates="components")
-    __table_args__ = (UniqueConstraint("employee_id", "year", "month", "type", name="uq_salary_component"),)
+    # uq_salary_component leads with employee_id and serves per-employee lookups; month-wide
+    # aggregation reads the covering (year, month, employee_id) index without touching the heap
+    __table_args__ = (
+        UniqueConstraint("employee_id", "year", "month", "type", name="uq_salary_component"),
+        Index("ix_salary_components_year_month_employee_id", "year", "month", "employee_id",
+              postgresql_include=["type", "amount"]),
+    )
 
 class Vacation(Base):
     __tablename__ = "vacations"
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    employee_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("employees.id"), index=True)
+    employee_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("employees.id"))
     year: Mapped[int] = mapped_column(nullable=False)
     month: Mapped[int] = mapped_column(nullable=False)
     days_taken: Mapped[int] = mapped_column(Integer, default=0)
 
     employee: Mapped["Employee"] = relationship(back_populates="vacations")
-    __table_args__ = (UniqueConstraint("employee_id", "year", "month", name="uq_vacation"),)
+    __table_args__ = (
+        UniqueConstraint("employee_id", "year", "month", name="uq_vacation"),
+        Index("ix_vacations_year_month_employee_id", "year", "month", "employee_id",
+              postgresql_include=["days_taken"]),
+    )
 
 class IdempotencyKey(Base):
     __tablename__ = "idempotency_keys"
@@ -80,10 +99,29 @@ class ReportFile(Base):
     owner_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True)) # manager_id or employee_id depending on use
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
     archived: Mapped[bool] = mapped_column(Boolean, default=False)
-    # Inline binary storage (simplest approach); optional depending on generation time
-    content: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    # Legacy inline binary storage (rows created before the blob store).
+    # Deferred so metadata queries never pull the blob; load explicitly for downloads.
+    content: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True, deferred=True)
+    # SHA-256 of the bytes held in the blob store (utils/blob_store.py)
+    content_sha256: Mapped[str | None] = mapped_column(String(64), nullable=True, index=True)
     content_type: Mapped[str | None] = mapped_column(String(64), nullable=True)
     size_bytes: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    # Reporting period "YYYY-MM" derived from the generated path (filterable without LIKE scans)
+    period: Mapped[str | None] = mapped_column(String(7), nullable=True)
+    # Salary slips: utils.pdf.slip_fingerprint of the render input; a match means the slip is current
+    fingerprint: Mapped[str | None] = mapped_column(String(64), nullable=True)
+
+    # Keyset pagination on (created_at, id), optionally narrowed by a leading filter column.
+    # path is the logical key every generate/archive upsert looks up, hence unique.
+    __table_args__ = (
+        Index("ix_report_files_path", "path", unique=True),
+        Index("ix_report_files_owner_id_type_created_at", "owner_id", "type", "created_at"),
+        Index("ix_report_files_created_at_id", "created_at", "id"),
+        Index("ix_report_files_owner_id_created_at_id", "owner_id", "created_at", "id"),
+        Index("ix_report_files_type_created_at_id", "type", "created_at", "id"),
+        Index("ix_report_files_archived_created_at_id", "archived", "created_at", "id"),
+        Index("ix_report_files_period_created_at_id", "period", "created_at", "id"),
+    )
 
 class RefreshToken(Base):
     __tablename__ = "refresh_tokens"
@@ -103,4 +141,79 @@ class MonthInfo(Base):
     year: Mapped[int] = mapped_column(nullable=False)
     month: Mapped[int] = mapped_column(nullable=False)
     working_days: Mapped[int] = mapped_column(nullable=False)
+    # Set when the month's employee_month_summary rows are complete; new months start complete
+    summary_refreshed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True, default=lambda: datetime.now(timezone.utc))
     __table_args__ = (UniqueConstraint("year", "month", name="uq_monthinfo"),)
+
+class EmployeeMonthSummary(Base):
+    """Materialized per-employee monthly payroll totals (from salary_components and vacations).
+
+    Rows exist only for employees with components or vacation in the month; readers
+    treat a missing row as zero totals.
+    """
+    __tablename__ = "employee_month_summary"
+    year: Mapped[int] = mapped_column(Integer, primary_key=True)
+    month: Mapped[int] = mapped_column(Integer, primary_key=True)
+    employee_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("employees.id", ondelete="CASCADE"), primary_key=True)
+    bonus_total: Mapped[float] = mapped_column(Numeric(12,2), nullable=False, default=0)
+    adjustment_total: Mapped[float] = mapped_column(Numeric(12,2), nullable=False, default=0)
+    vacation_days: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+
+    __table_args__ = (
+        Index("ix_employee_month_summary_employee_id", "employee_id"),
+    )
+
+class ManagerMonthState(Base):
+    """Change tracker for a manager's monthly reports.
+
+    ``data_version`` is bumped in the same transaction as any write that changes the
+    manager's CSV or slips for the month; ``csv_version`` / ``pdfs_version`` record the
+    data version the last successful generation read. A report is dirty while its version
+    is behind (or was never recorded).
+    """
+    __tablename__ = "manager_month_state"
+    manager_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("employees.id", ondelete="CASCADE"), primary_key=True)
+    year: Mapped[int] = mapped_column(Integer, primary_key=True)
+    month: Mapped[int] = mapped_column(Integer, primary_key=True)
+    data_version: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    csv_version: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    pdfs_version: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    changed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+
+    __table_args__ = (
+        Index("ix_manager_month_state_year_month", "year", "month"),
+    )
+
+class Job(Base):
+    """Durable background job (report generation / sending), claimed by workers with SKIP LOCKED."""
+    __tablename__ = "jobs"
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    kind: Mapped[str] = mapped_column(String(64), nullable=False)
+    status: Mapped[str] = mapped_column(String(16), default="queued", nullable=False)  # queued/running/succeeded/failed
+    params: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
+    # Duplicate submissions with the same key return the existing job (derived from Idempotency-Key)
+    dedupe_key: Mapped[str | None] = mapped_column(String(255), nullable=True, unique=True)
+    requested_by: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
+    progress_total: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    progress_done: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    progress_failed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    result: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    # Handler-defined resume state saved as work completes (survives worker crashes/retries)
+    checkpoint: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    max_attempts: Mapped[int] = mapped_column(Integer, default=3, nullable=False)
+    locked_by: Mapped[str | None] = mapped_column(String(128), nullable=True)
+    # Heartbeat of the worker holding the job; stale locks are requeued
+    locked_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    run_after: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # Claim query: oldest runnable queued job
+        Index("ix_jobs_status_run_after_created_at", "status", "run_after", "created_at"),
+        Index("ix_jobs_kind_created_at", "kind", "created_at"),
+    )
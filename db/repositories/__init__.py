@@ -13,24 +13,37 @@ from .report_files_repo import *  # noqa: F401,F403
 from .refresh_tokens_repo import *  # noqa: F401,F403
 from .auth_repo import *  # noqa: F401,F403
 from .reporting_queries import *  # noqa: F401,F403
+from .jobs_repo import *  # noqa: F401,F403
+from .payroll_summary_repo import *  # noqa: F401,F403
+from .manager_month_state_repo import *  # noqa: F401,F403
+from .bulk_import_repo import *  # noqa: F401,F403
 
 __all__ = [
     # employees
-    'repo_list_employees','repo_get_employees_by_manager','repo_get_employee_by_email','repo_get_employee_by_id','repo_create_employee','repo_update_employee','repo_delete_employee',
+    'repo_list_employees','repo_list_employees_async','repo_get_employees_by_manager','repo_get_employee_by_email','repo_get_employee_by_id','repo_get_employee_by_id_async','repo_create_employee','repo_update_employee','repo_delete_employee','repo_get_employee_keys','repo_bulk_upsert_employees','repo_get_employee_identity',
     # salary components
     'repo_create_salary_component','repo_update_salary_component','repo_delete_salary_component','repo_list_salary_components','repo_get_salary_component_by_id',
     # vacations
     'repo_create_vacation','repo_update_vacation','repo_delete_vacation','repo_list_vacations','repo_get_vacation_by_id',
     # months
-    'repo_create_month','repo_update_month','repo_delete_month','repo_list_months','repo_get_month_by_id','repo_get_month_info_by_year_month',
+    'repo_create_month','repo_update_month','repo_delete_month','repo_list_months','repo_list_months_async','repo_get_month_by_id','repo_get_month_by_id_async','repo_get_month_info_by_year_month',
     # idempotency
     'repo_create_idempotency_key','repo_update_idempotency_key','repo_delete_idempotency_key','repo_list_idempotency_keys','repo_get_idempotency_key_by_id','repo_get_idempotency_key_by_key','repo_mark_idempotency_key_succeeded',
     # report files
-    'repo_create_report_file','repo_update_report_file','repo_delete_report_file','repo_list_report_files','repo_get_report_file_by_id','repo_get_report_file_by_path',
+    'repo_create_report_file','repo_bulk_upsert_report_files','repo_update_report_file','repo_move_report_file','repo_move_report_files','repo_delete_report_file','repo_list_report_files','repo_list_report_files_async','repo_get_report_file_by_id','repo_get_report_file_by_id_async','repo_get_report_file_by_path','repo_list_report_files_by_paths','repo_get_report_file_with_content','repo_get_inline_content_size','repo_mark_inline_content_moved','repo_read_inline_content_range',
     # refresh tokens
     'repo_create_refresh_token','repo_get_refresh_token_by_hash','repo_rotate_refresh_token','repo_issue_refresh_token','repo_validate_refresh_token_and_get_user','repo_rotate_refresh_token_and_issue',
     # auth
-    'repo_validate_login',
+    'repo_validate_login','repo_get_principal','repo_get_principal_async','repo_bump_token_versions','repo_forget_principals','repo_revoke_employee_tokens',
     # reporting queries
-    'repo_get_manager','repo_list_subordinates','repo_list_salary_components_for_employees_month','repo_list_vacations_for_employees_month','repo_aggregate_employee_month_summary',
+    'repo_get_manager','repo_list_subordinates','repo_list_subtree','repo_list_salary_components_for_employees_month','repo_list_vacations_for_employees_month','repo_aggregate_employee_month_summary','repo_aggregate_company_month_summary','repo_list_manager_ids',
+    # payroll summary
+    'repo_refresh_employee_month_summary','repo_ensure_employee_month_summary','repo_apply_employee_month_deltas',
+    # manager month state (report change tracking)
+    'repo_bump_manager_month_versions','repo_bump_manager_versions','repo_bump_month_versions',
+    'repo_get_manager_month_state','repo_list_manager_month_states','repo_record_manager_month_generated',
+    # bulk imports (COPY + ON CONFLICT merge)
+    'repo_bulk_upsert_salary_components','repo_bulk_upsert_vacations',
+    # jobs
+    'repo_enqueue_job','repo_get_job_by_id','repo_list_jobs','repo_claim_next_job','repo_update_job_progress','repo_save_job_checkpoint','repo_complete_job','repo_fail_job','repo_requeue_stale_jobs',
 ]
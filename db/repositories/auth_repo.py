@@ -1,11 +1,36 @@
+from typing import TYPE_CHECKING, Iterable, NamedTuple
+from uuid import UUID
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
+from core.settings import settings
 from db import models
+from utils.ttl_cache import TTLCache
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
 
 __all__ = [
     'repo_validate_login',
+    'repo_get_principal',
+    'repo_get_principal_async',
+    'repo_bump_token_versions',
+    'repo_forget_principals',
+    'repo_revoke_employee_tokens',
 ]
 
+class Principal(NamedTuple):
+    """The authenticated employee as protected routes see it (no ORM row, no session)."""
+    id: UUID
+    email: str
+    is_manager: bool
+    token_version: int
+
+# (str(id), token version) -> Principal; only valid principals are cached. Writers that change
+# is_active / is_manager / email / token_version forget the entry after committing; the TTL bounds
+# how long other processes keep it.
+_principal_cache = TTLCache('principal', settings.REFERENCE_CACHE_MAX_ENTRIES, settings.PRINCIPAL_CACHE_TTL_SECONDS)
+
 def repo_validate_login(db: Session, email: str, password: str, verify_fn) -> models.Employee:
     """Validate login credentials and return employee or raise HTTP 401."""
     user = db.query(models.Employee).filter(models.Employee.email == email).first()
@@ -14,3 +39,50 @@ def repo_validate_login(db: Session, email: str, password: str, verify_fn) -> mo
     if not user.is_active:
         raise HTTPException(status_code=401, detail="Inactive user")
     return user
+
+def _principal_stmt(employee_id):
+    e = models.Employee
+    return select(e.id, e.email, e.is_manager, e.is_active, e.token_version).where(e.id == employee_id)
+
+def _principal(row, token_version: int) -> Principal | None:
+    if row is None or not row.is_active or row.token_version != token_version:
+        return None
+    return Principal(row.id, row.email, row.is_manager, row.token_version)
+
+def _load_principal(db: Session, employee_id, token_version: int) -> Principal | None:
+    return _principal(db.execute(_principal_stmt(employee_id)).first(), token_version)
+
+async def _load_principal_async(db: "AsyncSession", employee_id, token_version: int) -> Principal | None:
+    return _principal((await db.execute(_principal_stmt(employee_id))).first(), token_version)
+
+def repo_get_principal(db: Session, employee_id, token_version: int) -> Principal | None:
+    """Active employee whose tokens are at ``token_version``, else None; cached per (id, version)."""
+    return _principal_cache.get_or_load((str(employee_id), token_version), lambda: _load_principal(db, employee_id, token_version))
+
+async def repo_get_principal_async(db: "AsyncSession", employee_id, token_version: int) -> Principal | None:
+    """Async ``repo_get_principal``; ``db`` is only used (and connects) on a cache miss."""
+    return await _principal_cache.get_or_load_async((str(employee_id), token_version), lambda: _load_principal_async(db, employee_id, token_version))
+
+def repo_forget_principals(versions: dict) -> None:
+    """Drop cached principals for ``{employee_id: token_version}``; call after committing."""
+    _principal_cache.invalidate(*((str(employee_id), version) for employee_id, version in versions.items()))
+
+def repo_bump_token_versions(db: Session, employee_ids: Iterable) -> None:
+    """Revoke every access and refresh token of the employees; no commit."""
+    ids = list(employee_ids)
+    if not ids:
+        return
+    e = models.Employee
+    db.execute(update(e).where(e.id.in_(ids)).values(token_version=e.token_version + 1).execution_options(synchronize_session=False))
+    rt = models.RefreshToken
+    db.execute(update(rt).where(rt.employee_id.in_(ids), rt.revoked.is_(False)).values(revoked=True).execution_options(synchronize_session=False))
+
+def repo_revoke_employee_tokens(db: Session, employee_id: str) -> dict:
+    employee = db.get(models.Employee, employee_id)
+    if not employee:
+        raise HTTPException(status_code=404, detail="Employee not found")
+    previous = employee.token_version
+    repo_bump_token_versions(db, [employee.id])
+    db.commit()
+    repo_forget_principals({employee.id: previous})
+    return {"revoked": True, "id": employee_id, "tokenVersion": previous + 1}
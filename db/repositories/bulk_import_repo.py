@@ -0,0 +1,113 @@
+from typing import Iterable
+from sqlalchemy import column, select, table, text
+from sqlalchemy.orm import Session
+from db.repositories.payroll_summary_repo import _replace_summary_rows
+from db.repositories.manager_month_state_repo import repo_bump_manager_month_versions
+
+__all__ = [
+    'repo_bulk_upsert_salary_components',
+    'repo_bulk_upsert_vacations',
+]
+
+# Rows written by the merge (inserted or actually changed); drives the summary / tracker upkeep
+_CHANGED = table('bulk_changed', column('employee_id'), column('year'), column('month'))
+
+_SALARY_COMPONENTS = {
+    'stage': 'salary_components_stage',
+    'columns': ['line', 'employee_id', 'year', 'month', 'type', 'amount', 'note'],
+    'ddl': (
+        "line integer NOT NULL, employee_id uuid NOT NULL, year integer NOT NULL, month integer NOT NULL, "
+        "type text NOT NULL, amount numeric(12,2) NOT NULL, note varchar(255)"
+    ),
+    'key': ['employee_id', 'year', 'month', 'type'],
+    'merge': (
+        "INSERT INTO salary_components (id, employee_id, year, month, type, amount, note) "
+        "SELECT DISTINCT ON (s.employee_id, s.year, s.month, s.type) "
+        "gen_random_uuid(), s.employee_id, s.year, s.month, s.type::salarycomponenttype, s.amount, s.note "
+        "FROM salary_components_stage s JOIN employees e ON e.id = s.employee_id "
+        "ORDER BY s.employee_id, s.year, s.month, s.type, s.line DESC "
+        "ON CONFLICT ON CONSTRAINT uq_salary_component DO UPDATE SET amount = EXCLUDED.amount, note = EXCLUDED.note "
+        "WHERE (salary_components.amount, salary_components.note) IS DISTINCT FROM (EXCLUDED.amount, EXCLUDED.note)"
+    ),
+}
+
+_VACATIONS = {
+    'stage': 'vacations_stage',
+    'columns': ['line', 'employee_id', 'year', 'month', 'days_taken'],
+    'ddl': "line integer NOT NULL, employee_id uuid NOT NULL, year integer NOT NULL, month integer NOT NULL, days_taken integer NOT NULL",
+    'key': ['employee_id', 'year', 'month'],
+    'merge': (
+        "INSERT INTO vacations (id, employee_id, year, month, days_taken) "
+        "SELECT DISTINCT ON (s.employee_id, s.year, s.month) gen_random_uuid(), s.employee_id, s.year, s.month, s.days_taken "
+        "FROM vacations_stage s JOIN employees e ON e.id = s.employee_id "
+        "ORDER BY s.employee_id, s.year, s.month, s.line DESC "
+        "ON CONFLICT ON CONSTRAINT uq_vacation DO UPDATE SET days_taken = EXCLUDED.days_taken "
+        "WHERE vacations.days_taken IS DISTINCT FROM EXCLUDED.days_taken"
+    ),
+}
+
+
+def _bulk_upsert(db: Session, spec: dict, rows: Iterable[tuple]) -> dict:
+    """COPY ``rows`` into a staging table and merge them into the target in one transaction.
+
+    Rows are tuples in ``spec['columns']`` order, starting with the source line number.
+    Lines naming an unknown employee, or superseded by a later line with the same key, are
+    rejected; the rest are upserted (rows whose values already match are left untouched).
+    Summary rows and manager report versions for the changed keys are maintained before the
+    single commit. PostgreSQL only: the load goes through psycopg's COPY support.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect != 'postgresql':
+        raise NotImplementedError(f"Bulk import requires PostgreSQL, not {dialect!r}")
+    stage, key = spec['stage'], ', '.join(spec['key'])
+    try:
+        db.execute(text(f"CREATE TEMP TABLE {stage} ({spec['ddl']}) ON COMMIT DROP"))
+        db.execute(text("CREATE TEMP TABLE bulk_changed (employee_id uuid, year integer, month integer, inserted boolean) ON COMMIT DROP"))
+        raw = db.connection().connection.driver_connection
+        with raw.cursor() as cur:
+            with cur.copy(f"COPY {stage} ({', '.join(spec['columns'])}) FROM STDIN") as copy:
+                for row in rows:
+                    copy.write_row(row)
+        staged = db.execute(text(f"SELECT count(*) FROM {stage}")).scalar()
+        rejects = [(line, 'Employee not found') for (line,) in db.execute(text(
+            f"SELECT s.line FROM {stage} s WHERE NOT EXISTS (SELECT 1 FROM employees e WHERE e.id = s.employee_id)"
+        ))]
+        rejects += [(line, f'Superseded by line {kept}') for line, kept in db.execute(text(
+            f"SELECT line, kept FROM (SELECT s.line, max(s.line) OVER (PARTITION BY {key}) AS kept FROM {stage} s "
+            "WHERE EXISTS (SELECT 1 FROM employees e WHERE e.id = s.employee_id)) d WHERE line <> kept"
+        ))]
+        db.execute(text(
+            f"WITH merged AS ({spec['merge']} RETURNING employee_id, year, month, (xmax = 0) AS inserted) "
+            "INSERT INTO bulk_changed SELECT employee_id, year, month, inserted FROM merged"
+        ))
+        inserted, updated = db.execute(text(
+            "SELECT count(*) FILTER (WHERE inserted), count(*) FILTER (WHERE NOT inserted) FROM bulk_changed"
+        )).one()
+        periods = db.execute(select(_CHANGED.c.year, _CHANGED.c.month).distinct()).all()
+        for year, month in periods:
+            changed_ids = select(_CHANGED.c.employee_id).where(_CHANGED.c.year == year, _CHANGED.c.month == month)
+            _replace_summary_rows(db, year, month, changed_ids)
+        repo_bump_manager_month_versions(db, db.execute(text(
+            "SELECT DISTINCT e.manager_id, c.year, c.month FROM bulk_changed c JOIN employees e ON e.id = c.employee_id"
+        )).all())
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return {
+        'staged': staged,
+        'inserted': inserted,
+        'updated': updated,
+        'unchanged': staged - len(rejects) - inserted - updated,
+        'rejects': sorted(rejects),
+    }
+
+
+def repo_bulk_upsert_salary_components(db: Session, rows: Iterable[tuple]) -> dict:
+    """Rows: ``(line, employee_id, year, month, type, amount, note)``."""
+    return _bulk_upsert(db, _SALARY_COMPONENTS, rows)
+
+
+def repo_bulk_upsert_vacations(db: Session, rows: Iterable[tuple]) -> dict:
+    """Rows: ``(line, employee_id, year, month, days_taken)``."""
+    return _bulk_upsert(db, _VACATIONS, rows)
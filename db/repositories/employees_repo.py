@@ -1,20 +1,160 @@
-from sqlalchemy.orm import Session
+import uuid
+from datetime import date, datetime
+from typing import TYPE_CHECKING, Iterable, NamedTuple, Sequence
+from uuid import UUID
+from sqlalchemy import func, insert, select, tuple_, update
+from sqlalchemy.orm import Session, load_only
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException
 from db import models
+from db.repositories.auth_repo import repo_bump_token_versions, repo_forget_principals
+from db.repositories.manager_month_state_repo import repo_bump_manager_versions
+from core.settings import settings
+from utils.ttl_cache import TTLCache
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
 
 __all__ = [
     'repo_list_employees',
+    'repo_list_employees_async',
     'repo_get_employees_by_manager',
     'repo_get_employee_by_email',
     'repo_get_employee_by_id',
+    'repo_get_employee_by_id_async',
     'repo_create_employee',
     'repo_update_employee',
     'repo_delete_employee',
+    'repo_get_employee_keys',
+    'repo_bulk_upsert_employees',
+    'repo_get_employee_identity',
 ]
 
-def repo_list_employees(db: Session):
-    return db.query(models.Employee).all()
+# Keeps IN lists well under driver/server bind parameter limits
+_LOOKUP_CHUNK = 1000
+
+# Columns exposed by listings (EmployeeResponse); password_hash and org_path are never loaded there
+EMPLOYEE_PUBLIC_COLUMNS = (
+    models.Employee.id,
+    models.Employee.email,
+    models.Employee.is_active,
+    models.Employee.is_manager,
+    models.Employee.created_at,
+    models.Employee.first_name,
+    models.Employee.last_name,
+    models.Employee.cnp,
+    models.Employee.hire_date,
+    models.Employee.base_salary,
+    models.Employee.manager_id,
+)
+
+# Fields printed on manager CSVs / salary slips; changing one makes those reports stale
+_REPORT_FIELDS = {'first_name', 'last_name', 'cnp', 'hire_date', 'base_salary', 'manager_id'}
+
+def _revokes_tokens(data: dict, was_active: bool, previous_hash: str | None) -> bool:
+    """Deactivation and password changes invalidate the employee's outstanding tokens.
+
+    Resending the stored hash (or none) is not a password change.
+    """
+    new_hash = data.get('password_hash')
+    return (new_hash is not None and new_hash != previous_hash) or (was_active and data.get('is_active') is False)
+
+class EmployeeIdentity(NamedTuple):
+    """Cached copy of the columns that identify an employee on reports (names, CNP, salary, manager)."""
+    id: UUID
+    email: str
+    first_name: str
+    last_name: str
+    cnp: str
+    hire_date: date
+    base_salary: float
+    manager_id: UUID | None
+
+# str(id) -> EmployeeIdentity; every write below invalidates the employees it touched after committing
+_identity_cache = TTLCache('employee_identity', settings.REFERENCE_CACHE_MAX_ENTRIES, settings.REFERENCE_CACHE_TTL_SECONDS)
+
+def _forget(*employee_ids) -> None:
+    _identity_cache.invalidate(*(str(employee_id) for employee_id in employee_ids))
+
+def _org_path(db: Session, employee_id) -> str | None:
+    return db.query(models.Employee.org_path).filter(models.Employee.id == employee_id).scalar()
+
+def _child_path(parent_path: str | None, employee_id) -> str:
+    return f"{parent_path or '/'}{employee_id}/"
+
+def _move_subtree(db: Session, employee_id, manager_id) -> None:
+    """Re-root the employee's org_path, and every descendant's, under ``manager_id``; no commit."""
+    e = models.Employee
+    parent_path = _org_path(db, manager_id) if manager_id is not None else None
+    if manager_id is not None and (str(manager_id) == str(employee_id) or f"/{employee_id}/" in (parent_path or '')):
+        raise HTTPException(status_code=400, detail="Manager change would create a management cycle")
+    old_path, new_path = _org_path(db, employee_id), _child_path(parent_path, employee_id)
+    if old_path is None:
+        stmt = update(e).where(e.id == employee_id).values(org_path=new_path)
+    elif old_path != new_path:
+        stmt = update(e).where(e.org_path.startswith(old_path, autoescape=True)).values(
+            org_path=new_path + func.substr(e.org_path, len(old_path) + 1))
+    else:
+        return
+    db.execute(stmt.execution_options(synchronize_session=False))
+
+def _list_employees_stmt(limit, after, manager_id, is_active, hired_from, hired_to, columns):
+    """SELECT shared by the sync and async listings."""
+    e = models.Employee
+    if columns is None:
+        stmt = select(e).options(load_only(*EMPLOYEE_PUBLIC_COLUMNS))
+    else:
+        stmt = select(*(getattr(e, name) for name in columns))
+    if manager_id is not None:
+        stmt = stmt.where(e.manager_id == manager_id)
+    if is_active is not None:
+        stmt = stmt.where(e.is_active == is_active)
+    if hired_from is not None:
+        stmt = stmt.where(e.hire_date >= hired_from)
+    if hired_to is not None:
+        stmt = stmt.where(e.hire_date <= hired_to)
+    if after is not None:
+        stmt = stmt.where(tuple_(e.created_at, e.id) < tuple_(*after))
+    stmt = stmt.order_by(e.created_at.desc(), e.id.desc())
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
+
+def _employee_rows(result, columns: Sequence[str] | None) -> list:
+    if columns is None:
+        return list(result.scalars().all())
+    return [dict(row) for row in result.mappings()]
+
+def repo_list_employees(
+    db: Session,
+    limit: int | None = None,
+    after: tuple[datetime, UUID] | None = None,
+    manager_id: str | None = None,
+    is_active: bool | None = None,
+    hired_from: date | None = None,
+    hired_to: date | None = None,
+    columns: Sequence[str] | None = None,
+):
+    """List employees newest first using keyset pagination on (created_at, id).
+
+    Without ``columns`` returns Employee objects loaded with the public columns only. With
+    ``columns`` (attribute names) only those are selected and rows come back as plain dicts,
+    bypassing entity loading and the identity map.
+    """
+    return _employee_rows(db.execute(_list_employees_stmt(limit, after, manager_id, is_active, hired_from, hired_to, columns)), columns)
+
+async def repo_list_employees_async(
+    db: "AsyncSession",
+    limit: int | None = None,
+    after: tuple[datetime, UUID] | None = None,
+    manager_id: str | None = None,
+    is_active: bool | None = None,
+    hired_from: date | None = None,
+    hired_to: date | None = None,
+    columns: Sequence[str] | None = None,
+):
+    """Async variant of repo_list_employees (same filters, ordering and projection)."""
+    return _employee_rows(await db.execute(_list_employees_stmt(limit, after, manager_id, is_active, hired_from, hired_to, columns)), columns)
 
 def repo_get_employees_by_manager(db: Session, manager_id: str):
     """Return all employees managed by the given manager (excludes manager themselves)."""
@@ -29,9 +169,28 @@ def repo_get_employee_by_id(db: Session, employee_id: str):
         raise HTTPException(status_code=404, detail="Employee not found")
     return employee
 
+async def repo_get_employee_by_id_async(db: "AsyncSession", employee_id: str):
+    employee = await db.get(models.Employee, employee_id)
+    if not employee:
+        raise HTTPException(status_code=404, detail="Employee not found")
+    return employee
+
+def _load_identity(db: Session, employee_id) -> EmployeeIdentity | None:
+    e = models.Employee
+    row = db.query(e.id, e.email, e.first_name, e.last_name, e.cnp, e.hire_date, e.base_salary, e.manager_id).filter(e.id == employee_id).first()
+    return EmployeeIdentity(*row) if row else None
+
+def repo_get_employee_identity(db: Session, employee_id) -> EmployeeIdentity | None:
+    """Identity snapshot of an employee (None when missing), served from the in-process cache when possible."""
+    return _identity_cache.get_or_load(str(employee_id), lambda: _load_identity(db, employee_id))
+
 def repo_create_employee(db: Session, **data):
     employee = models.Employee(**data)
+    if employee.id is None:
+        employee.id = uuid.uuid4()
+    employee.org_path = _child_path(_org_path(db, employee.manager_id) if employee.manager_id else None, employee.id)
     db.add(employee)
+    repo_bump_manager_versions(db, [employee.manager_id])
     try:
         db.commit()
     except IntegrityError as e:
@@ -44,13 +203,23 @@ def repo_update_employee(db: Session, employee_id: str, **data):
     employee = db.get(models.Employee, employee_id)
     if not employee:
         raise HTTPException(status_code=404, detail="Employee not found")
+    previous_manager_id, previous_version = employee.manager_id, employee.token_version
+    if _revokes_tokens(data, employee.is_active, employee.password_hash):
+        repo_bump_token_versions(db, [employee.id])
+    if 'manager_id' in data and data['manager_id'] != previous_manager_id:
+        _move_subtree(db, employee.id, data['manager_id'])
     for key, value in data.items():
         setattr(employee, key, value)
+    if _REPORT_FIELDS.intersection(data):
+        # Old and new manager rosters, plus the employee's own team (manager name on slips)
+        repo_bump_manager_versions(db, [previous_manager_id, employee.manager_id, employee.id])
     try:
         db.commit()
     except IntegrityError as e:
         db.rollback()
         raise HTTPException(status_code=400, detail="Employee violates unique constraint") from e
+    _forget(employee.id)
+    repo_forget_principals({employee.id: previous_version})
     db.refresh(employee)
     return employee
 
@@ -58,6 +227,69 @@ def repo_delete_employee(db: Session, employee_id: str):
     employee = db.get(models.Employee, employee_id)
     if not employee:
         raise HTTPException(status_code=404, detail="Employee not found")
+    version = employee.token_version
+    repo_bump_manager_versions(db, [employee.manager_id])
     db.delete(employee)
     db.commit()
+    _forget(employee_id)
+    repo_forget_principals({employee_id: version})
     return {"deleted": True, "id": employee_id}
+
+def _chunks(values: list) -> Iterable[list]:
+    for start in range(0, len(values), _LOOKUP_CHUNK):
+        yield values[start:start + _LOOKUP_CHUNK]
+
+def repo_get_employee_keys(db: Session, emails: Iterable[str] = (), cnps: Iterable[str] = (), ids: Iterable = ()) -> list:
+    """``(id, email, cnp, manager_id, org_path)`` of employees matching any of the emails, CNPs or ids."""
+    e = models.Employee
+    rows = {}
+    for column, values in ((e.email, emails), (e.cnp, cnps), (e.id, ids)):
+        for chunk in _chunks(list(set(values))):
+            for row in db.query(e.id, e.email, e.cnp, e.manager_id, e.org_path).filter(column.in_(chunk)).all():
+                rows[row.id] = row
+    return list(rows.values())
+
+def repo_bulk_upsert_employees(db: Session, inserts: list[dict], updates: list[dict]) -> None:
+    """Write a resolved import batch in one transaction.
+
+    ``inserts`` carry their own ids and are ordered managers-first, so each manager row
+    exists before (or in the same multi-row statement as) its reports. ``updates`` are
+    keyed by id and applied after the inserts, so they may point at a new manager; moved
+    employees then have their org_path subtree re-rooted (also managers-first). Deactivated
+    employees and new passwords revoke the employee's tokens.
+    """
+    e = models.Employee
+    update_ids = [row['id'] for row in updates]
+    previous, versions, active, hashes = {}, {}, {}, {}
+    for chunk in _chunks(update_ids):
+        for row in db.query(e.id, e.manager_id, e.token_version, e.is_active, e.password_hash).filter(e.id.in_(chunk)).all():
+            previous[row.id], versions[row.id], active[row.id], hashes[row.id] = row.manager_id, row.token_version, row.is_active, row.password_hash
+    paths = {}
+    outside_parents = {row['manager_id'] for row in inserts if row['manager_id']} - {row['id'] for row in inserts}
+    for chunk in _chunks(list(outside_parents)):
+        paths.update(db.query(e.id, e.org_path).filter(e.id.in_(chunk)).all())
+    for row in inserts:
+        row['org_path'] = paths[row['id']] = _child_path(paths.get(row['manager_id']), row['id'])
+    try:
+        if inserts:
+            db.execute(insert(e), inserts)
+        if updates:
+            db.execute(update(e), updates)
+            for chunk in _chunks([row['id'] for row in updates if _revokes_tokens(row, active.get(row['id'], False), hashes.get(row['id']))]):
+                repo_bump_token_versions(db, chunk)
+        for row in updates:
+            if 'manager_id' in row and row['manager_id'] != previous.get(row['id']):
+                _move_subtree(db, row['id'], row['manager_id'])
+        # Rosters gained or lost people, and updated managers' own names may be on slips
+        touched = {row.get('manager_id') for row in inserts + updates} | set(previous.values()) | set(update_ids)
+        for chunk in _chunks(list(touched)):
+            repo_bump_manager_versions(db, chunk)
+        db.commit()
+        _forget(*update_ids)
+        repo_forget_principals(versions)
+    except IntegrityError as ex:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Employees changed during import (unique constraint); retry the upload") from ex
+    except HTTPException:
+        db.rollback()
+        raise
@@ -0,0 +1,154 @@
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from fastapi import HTTPException
+from db import models
+
+__all__ = [
+    'repo_enqueue_job',
+    'repo_get_job_by_id',
+    'repo_list_jobs',
+    'repo_claim_next_job',
+    'repo_update_job_progress',
+    'repo_save_job_checkpoint',
+    'repo_complete_job',
+    'repo_fail_job',
+    'repo_requeue_stale_jobs',
+]
+
+JOB_STATUSES = ('queued', 'running', 'succeeded', 'failed')
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+def _same_params(job, params: dict):
+    if job.params != params:
+        raise HTTPException(status_code=422, detail="Idempotency-Key was already used with different parameters")
+    return job
+
+def repo_enqueue_job(db: Session, kind: str, params: dict, dedupe_key: str | None = None, requested_by=None, max_attempts: int = 3):
+    """Insert a queued job. With ``dedupe_key`` an existing job for the same key is returned instead.
+
+    Reusing a key with different params is a client error (422), never the other job's result.
+    """
+    if dedupe_key:
+        existing = db.query(models.Job).filter(models.Job.dedupe_key == dedupe_key).first()
+        if existing:
+            return _same_params(existing, params)
+    job = models.Job(kind=kind, params=params, dedupe_key=dedupe_key, requested_by=requested_by, max_attempts=max_attempts, status='queued', run_after=_now())
+    db.add(job)
+    try:
+        db.commit()
+    except IntegrityError:
+        # Concurrent submission with the same dedupe key won the race
+        db.rollback()
+        existing = db.query(models.Job).filter(models.Job.dedupe_key == dedupe_key).first()
+        if existing:
+            return _same_params(existing, params)
+        raise
+    db.refresh(job)
+    return job
+
+def repo_get_job_by_id(db: Session, job_id: str):
+    job = db.get(models.Job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+def repo_list_jobs(db: Session, status: str | None = None, kind: str | None = None, limit: int = 100):
+    q = db.query(models.Job)
+    if status is not None:
+        q = q.filter(models.Job.status == status)
+    if kind is not None:
+        q = q.filter(models.Job.kind == kind)
+    return q.order_by(models.Job.created_at.desc(), models.Job.id.desc()).limit(limit).all()
+
+def repo_claim_next_job(db: Session, worker_id: str, kinds: list[str] | None = None):
+    """Atomically claim the oldest runnable queued job.
+
+    ``FOR UPDATE SKIP LOCKED`` lets any number of workers poll concurrently: rows locked
+    by another worker's claim are skipped instead of waited on.
+    """
+    now = _now()
+    stmt = (
+        select(models.Job)
+        .where(models.Job.status == 'queued', models.Job.run_after <= now)
+        .order_by(models.Job.run_after, models.Job.created_at)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    )
+    if kinds:
+        stmt = stmt.where(models.Job.kind.in_(kinds))
+    job = db.execute(stmt).scalar_one_or_none()
+    if job is None:
+        db.rollback()
+        return None
+    job.status = 'running'
+    job.attempts += 1
+    job.locked_by = worker_id
+    job.locked_at = now
+    job.started_at = job.started_at or now
+    db.commit()
+    db.refresh(job)
+    return job
+
+def repo_update_job_progress(db: Session, job_id, total: int | None = None, done: int | None = None, failed: int | None = None):
+    """Store progress counters and refresh the worker heartbeat."""
+    values = {'locked_at': _now()}
+    if total is not None:
+        values['progress_total'] = total
+    if done is not None:
+        values['progress_done'] = done
+    if failed is not None:
+        values['progress_failed'] = failed
+    db.execute(update(models.Job).where(models.Job.id == job_id, models.Job.status == 'running').values(**values))
+    db.commit()
+
+def repo_save_job_checkpoint(db: Session, job_id, checkpoint: dict):
+    db.execute(update(models.Job).where(models.Job.id == job_id).values(checkpoint=checkpoint, locked_at=_now()))
+    db.commit()
+
+def repo_complete_job(db: Session, job, result: dict | None):
+    job.status = 'succeeded'
+    job.result = result
+    job.error = None
+    job.finished_at = _now()
+    job.locked_by = None
+    job.locked_at = None
+    db.commit()
+    db.refresh(job)
+    return job
+
+def repo_fail_job(db: Session, job, error: str, retry: bool = True, retry_delay_seconds: float = 30.0):
+    """Record a failed attempt; requeue with linear backoff until ``max_attempts`` is reached."""
+    job.error = error
+    job.locked_by = None
+    job.locked_at = None
+    if retry and job.attempts < job.max_attempts:
+        job.status = 'queued'
+        job.run_after = _now() + timedelta(seconds=retry_delay_seconds * job.attempts)
+    else:
+        job.status = 'failed'
+        job.finished_at = _now()
+    db.commit()
+    db.refresh(job)
+    return job
+
+def repo_requeue_stale_jobs(db: Session, stale_after_seconds: float) -> int:
+    """Put back running jobs whose worker stopped heartbeating (crashed or killed)."""
+    cutoff = _now() - timedelta(seconds=stale_after_seconds)
+    stale = (models.Job.status == 'running', models.Job.locked_at < cutoff)
+    db.execute(
+        update(models.Job)
+        .where(*stale, models.Job.attempts >= models.Job.max_attempts)
+        .values(status='failed', error='Worker stopped responding', locked_by=None, locked_at=None, finished_at=_now())
+    )
+    result = db.execute(
+        update(models.Job)
+        .where(*stale, models.Job.attempts < models.Job.max_attempts)
+        .values(status='queued', locked_by=None, locked_at=None, run_after=_now())
+    )
+    db.commit()
+    return result.rowcount or 0
@@ -0,0 +1,82 @@
+from datetime import datetime, timezone
+from typing import Iterable
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from db import models
+from db.upsert import upsert_insert
+
+__all__ = [
+    'repo_bump_manager_month_versions',
+    'repo_bump_manager_versions',
+    'repo_bump_month_versions',
+    'repo_get_manager_month_state',
+    'repo_list_manager_month_states',
+    'repo_record_manager_month_generated',
+]
+
+REPORT_ARTIFACTS = ('csv', 'pdfs')
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+def repo_bump_manager_month_versions(db: Session, keys: Iterable[tuple]) -> None:
+    """Mark (manager_id, year, month) keys changed; no commit (runs in the writer's transaction)."""
+    rows = {(manager_id, year, month) for manager_id, year, month in keys if manager_id is not None}
+    if not rows:
+        return
+    state = models.ManagerMonthState
+    now = _now()
+    stmt = upsert_insert(db, state).values([
+        {'manager_id': manager_id, 'year': year, 'month': month, 'data_version': 1, 'changed_at': now}
+        for manager_id, year, month in rows
+    ])
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=['manager_id', 'year', 'month'],
+        set_={'data_version': state.data_version + 1, 'changed_at': stmt.excluded.changed_at},
+    ))
+
+def repo_bump_manager_versions(db: Session, manager_ids: Iterable) -> None:
+    """Mark every tracked month of these managers changed (employee profile/roster edits); no commit."""
+    ids = [manager_id for manager_id in set(manager_ids) if manager_id is not None]
+    if not ids:
+        return
+    state = models.ManagerMonthState
+    db.execute(update(state).where(state.manager_id.in_(ids)).values(data_version=state.data_version + 1, changed_at=_now()))
+
+def repo_bump_month_versions(db: Session, year: int, month: int) -> None:
+    """Mark every manager's reports for a month changed (month info created, edited or deleted); no commit."""
+    state = models.ManagerMonthState
+    db.execute(update(state).where(state.year == year, state.month == month).values(data_version=state.data_version + 1, changed_at=_now()))
+
+def repo_get_manager_month_state(db: Session, manager_id: str, year: int, month: int):
+    return db.get(models.ManagerMonthState, (manager_id, year, month))
+
+def repo_list_manager_month_states(db: Session, year: int, month: int) -> dict:
+    """All tracked managers for a month keyed by manager id (str)."""
+    rows = db.query(models.ManagerMonthState).filter(models.ManagerMonthState.year == year, models.ManagerMonthState.month == month).all()
+    return {str(row.manager_id): row for row in rows}
+
+def repo_record_manager_month_generated(db: Session, year: int, month: int, artifact: str, versions: dict) -> None:
+    """Record that ``artifact`` ('csv' or 'pdfs') was generated for ``{manager_id: data_version}``.
+
+    Each version is the one read *before* loading the report data (0 when the manager had
+    no state row), so a write that raced the generation leaves the report dirty. ``None``
+    clears the record (the stored output does not reflect the tracked data).
+    """
+    if artifact not in REPORT_ARTIFACTS:
+        raise ValueError(f"Unknown report artifact: {artifact}")
+    if not versions:
+        return
+    column = f'{artifact}_version'
+    state = models.ManagerMonthState
+    now = _now()
+    stmt = upsert_insert(db, state).values([
+        {'manager_id': manager_id, 'year': year, 'month': month, 'data_version': version or 0, 'changed_at': now, column: version}
+        for manager_id, version in versions.items()
+    ])
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=['manager_id', 'year', 'month'],
+        set_={column: getattr(stmt.excluded, column)},
+    ))
+    db.commit()
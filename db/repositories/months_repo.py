@@ -1,52 +1,88 @@
+from typing import TYPE_CHECKING, NamedTuple
+from uuid import UUID
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException
 from db import models
+from db.repositories.manager_month_state_repo import repo_bump_month_versions
+from core.settings import settings
+from utils.ttl_cache import TTLCache
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
 
 __all__ = [
     'repo_create_month',
     'repo_update_month',
     'repo_delete_month',
     'repo_list_months',
+    'repo_list_months_async',
     'repo_get_month_by_id',
+    'repo_get_month_by_id_async',
     'repo_get_month_info_by_year_month',
 ]
 
+class MonthRef(NamedTuple):
+    """Cached copy of a month's reference columns."""
+    id: UUID
+    year: int
+    month: int
+    working_days: int
+
+# (year, month) -> MonthRef; every write below invalidates after committing
+_month_cache = TTLCache('month_info', settings.REFERENCE_CACHE_MAX_ENTRIES, settings.REFERENCE_CACHE_TTL_SECONDS)
+
 def repo_create_month(db: Session, **data):
     month = models.MonthInfo(**data)
     db.add(month)
+    # Reports stored while the month was missing (or before it was deleted) are stale
+    repo_bump_month_versions(db, month.year, month.month)
     try:
         db.commit()
     except IntegrityError as e:
         db.rollback()
         raise HTTPException(status_code=400, detail="Month violates unique constraint") from e
     db.refresh(month)
+    _month_cache.invalidate((month.year, month.month))
     return month
 
 def repo_update_month(db: Session, month_id: str, **data):
     month = db.get(models.MonthInfo, month_id)
     if not month:
         raise HTTPException(status_code=404, detail="Month not found")
+    previous = (month.year, month.month)
     for k, v in data.items():
         setattr(month, k, v)
+    # Working days appear on every CSV and slip of the month
+    repo_bump_month_versions(db, *previous)
+    if (month.year, month.month) != previous:
+        repo_bump_month_versions(db, month.year, month.month)
     try:
         db.commit()
     except IntegrityError as e:
         db.rollback()
         raise HTTPException(status_code=400, detail="Month violates unique constraint") from e
     db.refresh(month)
+    _month_cache.invalidate(previous, (month.year, month.month))
     return month
 
 def repo_delete_month(db: Session, month_id: str):
     month = db.get(models.MonthInfo, month_id)
     if not month:
         raise HTTPException(status_code=404, detail="Month not found")
+    key = (month.year, month.month)
     db.delete(month)
+    repo_bump_month_versions(db, *key)
     db.commit()
+    _month_cache.invalidate(key)
     return {"deleted": True, "id": month_id}
 
 def repo_list_months(db: Session):
-    return db.query(models.MonthInfo).all()
+    return db.scalars(select(models.MonthInfo)).all()
+
+async def repo_list_months_async(db: "AsyncSession"):
+    return (await db.scalars(select(models.MonthInfo))).all()
 
 def repo_get_month_by_id(db: Session, month_id: str):
     month = db.get(models.MonthInfo, month_id)
@@ -54,8 +90,20 @@ def repo_get_month_by_id(db: Session, month_id: str):
         raise HTTPException(status_code=404, detail="Month not found")
     return month
 
-def repo_get_month_info_by_year_month(db: Session, year: int, month: int):
-    mi = db.query(models.MonthInfo).filter(models.MonthInfo.year == year, models.MonthInfo.month == month).first()
+async def repo_get_month_by_id_async(db: "AsyncSession", month_id: str):
+    month = await db.get(models.MonthInfo, month_id)
+    if not month:
+        raise HTTPException(status_code=404, detail="Month not found")
+    return month
+
+def _load_month_ref(db: Session, year: int, month: int) -> MonthRef | None:
+    m = models.MonthInfo
+    row = db.query(m.id, m.year, m.month, m.working_days).filter(m.year == year, m.month == month).first()
+    return MonthRef(*row) if row else None
+
+def repo_get_month_info_by_year_month(db: Session, year: int, month: int) -> MonthRef:
+    """Month reference data, served from the in-process cache when possible."""
+    mi = _month_cache.get_or_load((int(year), int(month)), lambda: _load_month_ref(db, year, month))
     if not mi:
         raise HTTPException(status_code=400, detail="Month info not defined")
     return mi
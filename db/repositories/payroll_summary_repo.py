@@ -0,0 +1,136 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Iterable
+from sqlalchemy import Integer, case, delete, func, insert, literal, literal_column, select, union_all
+from sqlalchemy.orm import Session
+from db import models
+from db.upsert import upsert_insert
+from db.repositories.manager_month_state_repo import repo_bump_manager_month_versions
+
+__all__ = [
+    'repo_refresh_employee_month_summary',
+    'repo_ensure_employee_month_summary',
+    'repo_apply_employee_month_deltas',
+]
+
+_SUMMARY_COLUMNS = ['year', 'month', 'employee_id', 'bonus_total', 'adjustment_total', 'vacation_days', 'updated_at']
+
+
+def _aggregate_select(year: int, month: int, employee_ids=None):
+    """INSERT ... SELECT source: one row per employee with components or vacation in the month."""
+    comp_filters = [models.SalaryComponent.year == year, models.SalaryComponent.month == month]
+    vac_filters = [models.Vacation.year == year, models.Vacation.month == month]
+    if employee_ids is not None:
+        comp_filters.append(models.SalaryComponent.employee_id.in_(employee_ids))
+        vac_filters.append(models.Vacation.employee_id.in_(employee_ids))
+    comp = select(
+        models.SalaryComponent.employee_id.label('employee_id'),
+        func.sum(case((models.SalaryComponent.type == models.SalaryComponentType.bonus, models.SalaryComponent.amount), else_=0)).label('bonus_total'),
+        func.sum(case((models.SalaryComponent.type == models.SalaryComponentType.adjustment, models.SalaryComponent.amount), else_=0)).label('adjustment_total'),
+        literal_column('0').label('vacation_days'),
+    ).where(*comp_filters).group_by(models.SalaryComponent.employee_id)
+    vac = select(
+        models.Vacation.employee_id.label('employee_id'),
+        literal_column('0').label('bonus_total'),
+        literal_column('0').label('adjustment_total'),
+        func.sum(models.Vacation.days_taken).label('vacation_days'),
+    ).where(*vac_filters).group_by(models.Vacation.employee_id)
+    both = union_all(comp, vac).subquery()
+    return select(
+        literal(year, Integer),
+        literal(month, Integer),
+        both.c.employee_id,
+        func.sum(both.c.bonus_total),
+        func.sum(both.c.adjustment_total),
+        func.sum(both.c.vacation_days),
+        func.now(),
+    ).group_by(both.c.employee_id)
+
+
+def repo_refresh_employee_month_summary(db: Session, year: int, month: int, employee_ids=None) -> int:
+    """Rebuild summary rows for a month (or only ``employee_ids``) in one set-based statement pair.
+
+    A full-month refresh also stamps ``months.summary_refreshed_at``. Returns rows written.
+    """
+    written = _replace_summary_rows(db, year, month, employee_ids)
+    if employee_ids is None:
+        month_info = db.query(models.MonthInfo).filter(models.MonthInfo.year == year, models.MonthInfo.month == month).first()
+        if month_info is not None:
+            month_info.summary_refreshed_at = datetime.now(timezone.utc)
+    db.commit()
+    return written
+
+
+def _replace_summary_rows(db: Session, year: int, month: int, employee_ids=None) -> int:
+    """Delete and re-aggregate the month's summary rows; no commit.
+
+    ``employee_ids`` may be a list or a SELECT of ids (e.g. from a staging table).
+    """
+    target = delete(models.EmployeeMonthSummary).where(models.EmployeeMonthSummary.year == year, models.EmployeeMonthSummary.month == month)
+    if employee_ids is not None:
+        target = target.where(models.EmployeeMonthSummary.employee_id.in_(employee_ids))
+    db.execute(target)
+    stmt = insert(models.EmployeeMonthSummary).from_select(_SUMMARY_COLUMNS, _aggregate_select(year, month, employee_ids))
+    # rowcount of an INSERT is only kept when asked for (-1 otherwise on psycopg)
+    result = db.execute(stmt.execution_options(preserve_rowcount=True))
+    return max(result.rowcount, 0)
+
+
+def repo_ensure_employee_month_summary(db: Session, year: int, month: int) -> None:
+    """Materialize a month whose ``summary_refreshed_at`` is NULL; a no-op otherwise.
+
+    The migration materializes existing months, new months are stamped on creation and
+    writes keep the rows current, so this only fires for a month reset after a bulk load.
+    The rebuild runs in its own transaction (never committing the caller's read) under a
+    row lock on the month, so concurrent first reads build it once. Periods without a
+    ``months`` row are left alone: their rows are already kept current by the write deltas.
+    """
+    m = models.MonthInfo
+    row = db.query(m.id, m.summary_refreshed_at).filter(m.year == year, m.month == month).first()
+    if row is None or row.summary_refreshed_at is not None:
+        return
+    with Session(bind=db.get_bind()) as own:
+        locked = own.query(m).filter(m.id == row.id).with_for_update().first()
+        if locked is not None and locked.summary_refreshed_at is None:
+            _replace_summary_rows(own, year, month)
+            locked.summary_refreshed_at = datetime.now(timezone.utc)
+        own.commit()
+
+
+def repo_apply_employee_month_deltas(db: Session, deltas: Iterable[tuple]) -> None:
+    """Add ``(employee_id, year, month, bonus, adjustment, vacation_days)`` deltas to the summary.
+
+    Called by salary component / vacation writes before they commit, so totals change
+    atomically with the row. Each key is one ``INSERT ... ON CONFLICT DO UPDATE`` adding
+    the delta (concurrent writers never lose an increment), and the owning managers'
+    month versions are bumped so report generation knows their output is stale.
+    """
+    combined: dict[tuple, list] = {}
+    for employee_id, year, month, bonus, adjustment, vacation_days in deltas:
+        if employee_id is None or year is None or month is None:
+            continue
+        totals = combined.setdefault((employee_id, year, month), [Decimal(0), Decimal(0), 0])
+        totals[0] += Decimal(str(bonus or 0))
+        totals[1] += Decimal(str(adjustment or 0))
+        totals[2] += int(vacation_days or 0)
+    changed = {key: totals for key, totals in combined.items() if any(totals)}
+    if not changed:
+        return
+    now = datetime.now(timezone.utc)
+    summary = models.EmployeeMonthSummary
+    stmt = upsert_insert(db, summary).values([
+        {'employee_id': employee_id, 'year': year, 'month': month, 'bonus_total': bonus, 'adjustment_total': adjustment, 'vacation_days': days, 'updated_at': now}
+        for (employee_id, year, month), (bonus, adjustment, days) in changed.items()
+    ])
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=['year', 'month', 'employee_id'],
+        set_={
+            'bonus_total': summary.bonus_total + stmt.excluded.bonus_total,
+            'adjustment_total': summary.adjustment_total + stmt.excluded.adjustment_total,
+            'vacation_days': summary.vacation_days + stmt.excluded.vacation_days,
+            'updated_at': stmt.excluded.updated_at,
+        },
+    ))
+    employee_ids = {employee_id for employee_id, _, _ in changed}
+    managers = dict(db.query(models.Employee.id, models.Employee.manager_id).filter(models.Employee.id.in_(employee_ids)).all())
+    repo_bump_manager_month_versions(db, [(managers.get(employee_id), year, month) for employee_id, year, month in changed])
@@ -1,36 +1,99 @@
-from sqlalchemy.orm import Session
+import re
+import uuid
+from datetime import datetime
+from typing import TYPE_CHECKING
+from uuid import UUID
+from sqlalchemy import case, func, select, tuple_, update
+from sqlalchemy.orm import Session, load_only, undefer
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException
 from db import models
+from db.upsert import upsert_insert
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
 
 __all__ = [
     'repo_create_report_file',
+    'repo_bulk_upsert_report_files',
     'repo_update_report_file',
+    'repo_move_report_file',
+    'repo_move_report_files',
     'repo_delete_report_file',
     'repo_list_report_files',
+    'repo_list_report_files_async',
     'repo_get_report_file_by_id',
+    'repo_get_report_file_by_id_async',
     'repo_get_report_file_by_path',
+    'repo_list_report_files_by_paths',
+    'repo_get_report_file_with_content',
+    'repo_get_inline_content_size',
+    'repo_mark_inline_content_moved',
+    'repo_read_inline_content_range',
 ]
 
+# Columns returned by listings / metadata endpoints (everything except the content blob)
+REPORT_FILE_METADATA_COLUMNS = (
+    models.ReportFile.id,
+    models.ReportFile.path,
+    models.ReportFile.type,
+    models.ReportFile.owner_id,
+    models.ReportFile.created_at,
+    models.ReportFile.archived,
+    models.ReportFile.content_type,
+    models.ReportFile.size_bytes,
+    models.ReportFile.period,
+    models.ReportFile.content_sha256,
+)
+
+# Paths per bulk statement; keeps IN lists, CASE arms and VALUES rows under bind parameter limits
+_PATH_CHUNK = 1000
+
+# Overwritten when a bulk upsert hits an existing path (new bytes replace legacy inline content)
+_UPSERT_COLUMNS = ('type', 'owner_id', 'archived', 'period', 'content', 'content_type', 'content_sha256', 'size_bytes', 'fingerprint')
+
+_PERIOD_RE = re.compile(r"(\d{4}-\d{2})")
+
+def _period_from_path(path: str | None) -> str | None:
+    """Extract the YYYY-MM reporting period from a generated report path."""
+    if not path:
+        return None
+    match = _PERIOD_RE.search(path)
+    return match.group(1) if match else None
+
+MIME_MAP = {'csv': 'text/csv', 'pdf': 'application/pdf', 'zip': 'application/zip'}
+
 def repo_create_report_file(db: Session, **data):
-    """Create or update a ReportFile for a given path to prevent duplicate rows."""
+    """Create or update a ReportFile for a given path to prevent duplicate rows.
+
+    Bytes are referenced through ``content_sha256`` (blob store digest) plus ``size_bytes``;
+    passing raw ``content`` still stores it inline for legacy callers.
+    """
     path = data.get('path')
+    data.setdefault('period', _period_from_path(path))
     existing = None
     if path:
         existing = db.query(models.ReportFile).filter(models.ReportFile.path == path).first()
     content = data.get('content')
+    digest = data.get('content_sha256')
     if existing:
-        if content is not None:
+        if digest is not None:
+            existing.content_sha256 = digest
+            existing.size_bytes = data.get('size_bytes')
+            existing.content = None
+        elif content is not None:
             existing.content = content
             existing.size_bytes = len(content)
+        if digest is not None or content is not None:
+            # New bytes: a fingerprint only describes the content it was computed for
+            existing.fingerprint = data.get('fingerprint')
             ctype = data.get('content_type')
             if ctype:
                 existing.content_type = ctype
             elif not existing.content_type:
                 ftype = data.get('type', existing.type)
-                mime_map = {'csv': 'text/csv', 'pdf': 'application/pdf', 'zip': 'application/zip'}
-                existing.content_type = mime_map.get(ftype, 'application/octet-stream')
-        for field in ['type','owner_id','archived']:
+                existing.content_type = MIME_MAP.get(ftype, 'application/octet-stream')
+        for field in ['type','owner_id','archived','period']:
             if field in data and getattr(existing, field) != data[field]:
                 setattr(existing, field, data[field])
         try:
@@ -42,10 +105,9 @@ def repo_create_report_file(db: Session, **data):
         return existing
     if content is not None:
         data.setdefault('size_bytes', len(content))
+    if digest is not None or content is not None:
         if 'content_type' not in data or data['content_type'] is None:
-            ftype = data.get('type')
-            mime_map = {'csv': 'text/csv', 'pdf': 'application/pdf', 'zip': 'application/zip'}
-            data['content_type'] = mime_map.get(ftype, 'application/octet-stream')
+            data['content_type'] = MIME_MAP.get(data.get('type'), 'application/octet-stream')
     report = models.ReportFile(**data)
     db.add(report)
     try:
@@ -56,10 +118,44 @@ def repo_create_report_file(db: Session, **data):
     db.refresh(report)
     return report
 
+def repo_bulk_upsert_report_files(db: Session, records: list[dict]) -> dict:
+    """Create or update many blob-backed ReportFiles keyed by path in one transaction.
+
+    Each record carries ``path``, ``type``, ``owner_id``, ``content_sha256``, ``size_bytes`` and
+    optionally ``fingerprint`` / ``archived``. Rows are written with
+    ``INSERT ... ON CONFLICT (path) DO UPDATE ... RETURNING`` (one statement per chunk, one
+    commit); an updated row keeps its id and created_at, like repo_create_report_file.
+    A path repeated in ``records`` keeps its last record. Returns path -> id.
+    """
+    rows = {}
+    for record in records:
+        row = {'archived': False, 'fingerprint': None, **record, 'content': None}
+        row.setdefault('period', _period_from_path(row['path']))
+        row.setdefault('content_type', MIME_MAP.get(row['type'], 'application/octet-stream'))
+        row.setdefault('id', uuid.uuid4())
+        rows[row['path']] = row
+    rows = list(rows.values())
+    ids = {}
+    try:
+        for start in range(0, len(rows), _PATH_CHUNK):
+            stmt = upsert_insert(db, models.ReportFile).values(rows[start:start + _PATH_CHUNK])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[models.ReportFile.path],
+                set_={name: stmt.excluded[name] for name in _UPSERT_COLUMNS},
+            ).returning(models.ReportFile.path, models.ReportFile.id)
+            ids.update(db.execute(stmt).all())
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Report file violates unique constraint") from e
+    return ids
+
 def repo_update_report_file(db: Session, report_id: str, **data):
     report = db.get(models.ReportFile, report_id)
     if not report:
         raise HTTPException(status_code=404, detail="Report not found")
+    if 'path' in data and 'period' not in data:
+        data['period'] = _period_from_path(data['path'])
     for k, v in data.items():
         setattr(report, k, v)
     try:
@@ -70,6 +166,49 @@ def repo_update_report_file(db: Session, report_id: str, **data):
     db.refresh(report)
     return report
 
+def repo_move_report_file(db: Session, report_id: str, path: str, **data):
+    """Re-key a report to ``path`` (archiving), replacing any other row already stored there.
+
+    ``report_files.path`` is unique and re-sending a period archives to the same path again;
+    the superseded row is deleted in the same transaction (its blob stays in the store).
+    """
+    report = db.get(models.ReportFile, report_id)
+    if not report:
+        raise HTTPException(status_code=404, detail="Report not found")
+    db.query(models.ReportFile).filter(models.ReportFile.path == path, models.ReportFile.id != report.id).delete(synchronize_session=False)
+    report.path = path
+    report.period = data.pop('period', _period_from_path(path))
+    for k, v in data.items():
+        setattr(report, k, v)
+    db.commit()
+    db.refresh(report)
+    return report
+
+def repo_move_report_files(db: Session, moves: dict[str, str], **data) -> int:
+    """Bulk repo_move_report_file keyed by current path (``{old_path: new_path}``).
+
+    Rows already stored at a target path are deleted, then every moved row is re-keyed by one
+    ``UPDATE ... WHERE path IN (...)`` per chunk; all in one transaction. Returns rows moved.
+    """
+    rf = models.ReportFile
+    items = list(moves.items())
+    moved = 0
+    try:
+        for start in range(0, len(items), _PATH_CHUNK):
+            chunk = dict(items[start:start + _PATH_CHUNK])
+            db.query(rf).filter(rf.path.in_(list(chunk.values())), rf.path.notin_(list(chunk))).delete(synchronize_session=False)
+            stmt = update(rf).where(rf.path.in_(list(chunk))).values(
+                path=case(chunk, value=rf.path),
+                period=case({old: _period_from_path(new) for old, new in chunk.items()}, value=rf.path),
+                **data,
+            )
+            moved += db.execute(stmt.execution_options(synchronize_session=False)).rowcount
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Report file violates unique constraint") from e
+    return moved
+
 def repo_delete_report_file(db: Session, report_id: str):
     report = db.get(models.ReportFile, report_id)
     if not report:
@@ -78,8 +217,52 @@ def repo_delete_report_file(db: Session, report_id: str):
     db.commit()
     return {"deleted": True, "id": report_id}
 
-def repo_list_report_files(db: Session):
-    return db.query(models.ReportFile).all()
+def _list_report_files_stmt(limit, after, owner_id, type, archived, period):
+    """SELECT shared by the sync and async listings."""
+    rf = models.ReportFile
+    stmt = select(rf).options(load_only(*REPORT_FILE_METADATA_COLUMNS))
+    if owner_id is not None:
+        stmt = stmt.where(rf.owner_id == owner_id)
+    if type is not None:
+        stmt = stmt.where(rf.type == type)
+    if archived is not None:
+        stmt = stmt.where(rf.archived == archived)
+    if period is not None:
+        stmt = stmt.where(rf.period == period)
+    if after is not None:
+        stmt = stmt.where(tuple_(rf.created_at, rf.id) < tuple_(*after))
+    stmt = stmt.order_by(rf.created_at.desc(), rf.id.desc())
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
+
+def repo_list_report_files(
+    db: Session,
+    limit: int | None = None,
+    after: tuple[datetime, UUID] | None = None,
+    owner_id: str | None = None,
+    type: str | None = None,
+    archived: bool | None = None,
+    period: str | None = None,
+):
+    """List report metadata newest first using keyset pagination on (created_at, id).
+
+    The content column is never selected. ``after`` is the (created_at, id) of the
+    last row of the previous page.
+    """
+    return db.scalars(_list_report_files_stmt(limit, after, owner_id, type, archived, period)).all()
+
+async def repo_list_report_files_async(
+    db: "AsyncSession",
+    limit: int | None = None,
+    after: tuple[datetime, UUID] | None = None,
+    owner_id: str | None = None,
+    type: str | None = None,
+    archived: bool | None = None,
+    period: str | None = None,
+):
+    """Async variant of repo_list_report_files."""
+    return (await db.scalars(_list_report_files_stmt(limit, after, owner_id, type, archived, period))).all()
 
 def repo_get_report_file_by_id(db: Session, report_id: str):
     report = db.get(models.ReportFile, report_id)
@@ -87,5 +270,50 @@ def repo_get_report_file_by_id(db: Session, report_id: str):
         raise HTTPException(status_code=404, detail="Report not found")
     return report
 
+async def repo_get_report_file_by_id_async(db: "AsyncSession", report_id: str):
+    """Metadata of one report (content is not loaded)."""
+    rf = models.ReportFile
+    report = await db.scalar(select(rf).options(load_only(*REPORT_FILE_METADATA_COLUMNS)).where(rf.id == report_id))
+    if not report:
+        raise HTTPException(status_code=404, detail="Report not found")
+    return report
+
 def repo_get_report_file_by_path(db: Session, path: str):
     return db.query(models.ReportFile).filter(models.ReportFile.path == path).first()
+
+def repo_list_report_files_by_paths(db: Session, paths: list[str]) -> dict:
+    """Map path -> ReportFile (metadata and fingerprint) for many paths, one query per chunk."""
+    found = {}
+    for start in range(0, len(paths), _PATH_CHUNK):
+        chunk = paths[start:start + _PATH_CHUNK]
+        rows = db.query(models.ReportFile).options(load_only(*REPORT_FILE_METADATA_COLUMNS, models.ReportFile.fingerprint)).filter(models.ReportFile.path.in_(chunk)).all()
+        found.update((r.path, r) for r in rows)
+    return found
+
+def repo_get_report_file_with_content(db: Session, report_id: str):
+    """Fetch a report including its inline content (used by the download endpoint)."""
+    report = db.query(models.ReportFile).options(undefer(models.ReportFile.content)).filter(models.ReportFile.id == report_id).first()
+    if not report:
+        raise HTTPException(status_code=404, detail="Report not found")
+    return report
+
+def repo_get_inline_content_size(db: Session, report_id) -> int | None:
+    """Length of a report's legacy inline content (None when it has none), computed in the database."""
+    size = db.query(func.length(models.ReportFile.content)).filter(
+        models.ReportFile.id == report_id, models.ReportFile.content.isnot(None)).scalar()
+    return None if size is None else int(size)
+
+def repo_mark_inline_content_moved(db: Session, report_id, digest: str, size: int) -> None:
+    """Point a legacy inline row at its blob and drop the inline bytes (no-op if already moved)."""
+    rf = models.ReportFile
+    db.execute(
+        update(rf).where(rf.id == report_id, rf.content.isnot(None))
+        .values(content_sha256=digest, size_bytes=size, content=None)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+def repo_read_inline_content_range(db: Session, report_id, offset: int, length: int) -> bytes:
+    """Read ``length`` bytes of inline content starting at ``offset`` without loading the whole blob."""
+    chunk = db.query(func.substring(models.ReportFile.content, offset + 1, length)).filter(models.ReportFile.id == report_id).scalar()
+    return bytes(chunk or b'')
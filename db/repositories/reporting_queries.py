@@ -1,24 +1,62 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, aliased
 from fastapi import HTTPException
-from sqlalchemy import func, case, literal_column, select
+from sqlalchemy import Integer, and_, func, literal, literal_column, select
 from db import models
+from db.repositories.employees_repo import repo_get_employee_identity
+from db.repositories.payroll_summary_repo import repo_ensure_employee_month_summary
 
 __all__ = [
     'repo_get_manager',
     'repo_list_subordinates',
+    'repo_list_subtree',
     'repo_list_salary_components_for_employees_month',
     'repo_list_vacations_for_employees_month',
     'repo_aggregate_employee_month_summary',
+    'repo_aggregate_company_month_summary',
+    'repo_list_manager_ids',
 ]
 
 def repo_get_manager(db: Session, manager_id: str):
-    mgr = db.get(models.Employee, manager_id)
+    """Identity snapshot (``EmployeeIdentity``, cached) of the manager a report is run for."""
+    mgr = repo_get_employee_identity(db, manager_id)
     if not mgr:
         raise HTTPException(status_code=404, detail="Manager not found")
     return mgr
 
-def repo_list_subordinates(db: Session, manager_id: str):
-    return db.query(models.Employee).filter(models.Employee.manager_id == manager_id).all()
+REPORT_SCOPES = ('direct', 'subtree')
+# Deepest chain the recursive walk follows; also stops it on a corrupt (cyclic) hierarchy
+MAX_ORG_DEPTH = 32
+
+def _subtree_cte(manager_id):
+    """Recursive CTE ``(id, manager_id, depth)`` of everyone below ``manager_id`` (depth 1 = direct report)."""
+    e = models.Employee
+    tree = select(e.id, e.manager_id, literal(1, Integer).label('depth')).where(e.manager_id == manager_id).cte('subtree', recursive=True)
+    child = aliased(models.Employee)
+    return tree.union_all(
+        select(child.id, child.manager_id, tree.c.depth + 1).where(child.manager_id == tree.c.id, tree.c.depth < MAX_ORG_DEPTH)
+    )
+
+def _scope_employee_ids(manager_id, scope: str):
+    """SELECT of the employee ids a manager's reports cover: direct reports or the whole subtree."""
+    if scope not in REPORT_SCOPES:
+        raise HTTPException(status_code=400, detail=f"Unknown scope: {scope}")
+    if scope == 'subtree':
+        return select(_subtree_cte(manager_id).c.id)
+    return select(models.Employee.id).where(models.Employee.manager_id == manager_id)
+
+def repo_list_subordinates(db: Session, manager_id: str, scope: str = 'direct'):
+    """Direct reports, or with ``scope='subtree'`` everyone below the manager in org_path order."""
+    if scope == 'direct':
+        return db.query(models.Employee).filter(models.Employee.manager_id == manager_id).all()
+    return db.query(models.Employee).filter(models.Employee.id.in_(_scope_employee_ids(manager_id, scope))).order_by(models.Employee.org_path).all()
+
+def repo_list_subtree(db: Session, manager_id: str, max_depth: int | None = None) -> list[tuple]:
+    """``(employee, depth)`` for everyone below the manager in one recursive query, depth-first."""
+    tree = _subtree_cte(manager_id)
+    query = db.query(models.Employee, tree.c.depth).join(tree, tree.c.id == models.Employee.id)
+    if max_depth is not None:
+        query = query.filter(tree.c.depth <= max_depth)
+    return query.order_by(models.Employee.org_path, models.Employee.id).all()
 
 def repo_list_salary_components_for_employees_month(db: Session, employee_ids: list[str], year: int, month: int):
     if not employee_ids:
@@ -38,47 +76,81 @@ def repo_list_vacations_for_employees_month(db: Session, employee_ids: list[str]
         models.Vacation.month == month
     ).all()
 
-def repo_aggregate_employee_month_summary(db: Session, manager_id: str, year: int, month: int):
-    """Return list of dicts with per-employee aggregated financial data for a manager."""
-    subq_emps = select(models.Employee.id).where(models.Employee.manager_id == manager_id).subquery()
-    comp_aggr = select(
-        models.SalaryComponent.employee_id.label('employee_id'),
-        func.sum(case((models.SalaryComponent.type == models.SalaryComponentType.bonus, models.SalaryComponent.amount), else_=0)).label('bonus_total'),
-        func.sum(case((models.SalaryComponent.type == models.SalaryComponentType.adjustment, models.SalaryComponent.amount), else_=0)).label('adjustment_total')
-    ).where(
-        models.SalaryComponent.employee_id.in_(select(subq_emps.c.id)),
-        models.SalaryComponent.year == year,
-        models.SalaryComponent.month == month
-    ).group_by(models.SalaryComponent.employee_id).subquery()
-    vac_aggr = select(
-        models.Vacation.employee_id.label('employee_id'),
-        func.sum(models.Vacation.days_taken).label('vacation_days')
-    ).where(
-        models.Vacation.employee_id.in_(select(subq_emps.c.id)),
-        models.Vacation.year == year,
-        models.Vacation.month == month
-    ).group_by(models.Vacation.employee_id).subquery()
+def _month_summary_query(db: Session, employees, year: int, month: int, *extra_columns):
+    """Per-employee bonus/adjustment/vacation totals for the employees matching ``employees`` (a criterion).
+
+    Reads the materialized ``employee_month_summary`` rows (covering index, no re-aggregation
+    of salary_components / vacations); employees without a row have zero totals.
+    """
+    repo_ensure_employee_month_summary(db, year, month)
+    summary = models.EmployeeMonthSummary
     query = db.query(
         models.Employee.id.label('employee_id'),
         models.Employee.first_name,
         models.Employee.last_name,
         models.Employee.cnp,
         models.Employee.base_salary,
-        func.coalesce(comp_aggr.c.bonus_total, literal_column('0')).label('bonus_total'),
-        func.coalesce(comp_aggr.c.adjustment_total, literal_column('0')).label('adjustment_total'),
-        func.coalesce(vac_aggr.c.vacation_days, literal_column('0')).label('vacation_days')
-    ).filter(models.Employee.id.in_(select(subq_emps.c.id)))
-    query = query.outerjoin(comp_aggr, models.Employee.id == comp_aggr.c.employee_id).outerjoin(vac_aggr, models.Employee.id == vac_aggr.c.employee_id)
+        func.coalesce(summary.bonus_total, literal_column('0')).label('bonus_total'),
+        func.coalesce(summary.adjustment_total, literal_column('0')).label('adjustment_total'),
+        func.coalesce(summary.vacation_days, literal_column('0')).label('vacation_days'),
+        *extra_columns,
+    ).filter(employees)
+    return query.outerjoin(summary, and_(summary.employee_id == models.Employee.id, summary.year == year, summary.month == month))
+
+def _summary_row(row) -> dict:
+    return {
+        'employee_id': str(row.employee_id),
+        'first_name': row.first_name,
+        'last_name': row.last_name,
+        'cnp': row.cnp,
+        'base_salary': float(row.base_salary),
+        'bonus_total': float(row.bonus_total),
+        'adjustment_total': float(row.adjustment_total),
+        'vacation_days': int(row.vacation_days),
+    }
+
+def repo_aggregate_employee_month_summary(db: Session, manager_id: str, year: int, month: int, scope: str = 'direct'):
+    """Return list of dicts with per-employee aggregated financial data for a manager.
+
+    ``scope='subtree'`` covers everyone below the manager in the same single query; rows
+    then also carry ``manager_id`` and come in org_path (depth-first) order.
+    """
+    if scope == 'direct':
+        # Plain filter (manager_id index); an IN over the same table lets the planner seq-scan employees
+        query = _month_summary_query(db, models.Employee.manager_id == manager_id, year, month)
+        return [_summary_row(row) for row in query.all()]
+    employees = models.Employee.id.in_(_scope_employee_ids(manager_id, scope))
+    query = _month_summary_query(db, employees, year, month, models.Employee.manager_id).order_by(models.Employee.org_path)
+    return [{**_summary_row(row), 'manager_id': str(row.manager_id)} for row in query.all()]
+
+def repo_aggregate_company_month_summary(db: Session, year: int, month: int):
+    """One set-based pass over every employee that has a manager (month close).
+
+    Rows carry the ``repo_aggregate_employee_month_summary`` fields plus what slips and CSVs
+    need (manager id/name, hire date, email), ordered by manager so callers can group.
+    """
+    manager = aliased(models.Employee)
+    query = _month_summary_query(
+        db, models.Employee.manager_id.isnot(None), year, month,
+        models.Employee.manager_id,
+        models.Employee.hire_date,
+        models.Employee.email,
+        manager.first_name.label('manager_first_name'),
+        manager.last_name.label('manager_last_name'),
+    ).join(manager, models.Employee.manager_id == manager.id).order_by(models.Employee.manager_id, models.Employee.id)
     results = []
     for row in query.all():
-        results.append({
-            'employee_id': str(row.employee_id),
-            'first_name': row.first_name,
-            'last_name': row.last_name,
-            'cnp': row.cnp,
-            'base_salary': float(row.base_salary),
-            'bonus_total': float(row.bonus_total),
-            'adjustment_total': float(row.adjustment_total),
-            'vacation_days': int(row.vacation_days),
+        item = _summary_row(row)
+        item.update({
+            'manager_id': str(row.manager_id),
+            'manager_name': f"{row.manager_first_name} {row.manager_last_name}",
+            'hire_date': row.hire_date,
+            'email': row.email,
         })
+        results.append(item)
     return results
+
+def repo_list_manager_ids(db: Session) -> list[str]:
+    """Ids (as strings, like the summary rows' ``manager_id``) of every active manager."""
+    e = models.Employee
+    return [str(manager_id) for manager_id in db.scalars(select(e.id).where(e.is_manager.is_(True), e.is_active.is_(True)).order_by(e.id))]
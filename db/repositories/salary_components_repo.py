@@ -1,7 +1,9 @@
+from decimal import Decimal
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException
 from db import models
+from db.repositories.payroll_summary_repo import repo_apply_employee_month_deltas
 
 __all__ = [
     'repo_create_salary_component',
@@ -11,10 +13,22 @@ __all__ = [
     'repo_get_salary_component_by_id',
 ]
 
+def _summary_delta(component: models.SalaryComponent, sign: int = 1) -> tuple:
+    """This component's contribution to employee_month_summary (base components add nothing)."""
+    kind = models.SalaryComponentType(component.type) if component.type is not None else None
+    amount = sign * Decimal(str(component.amount or 0))
+    return (
+        component.employee_id, component.year, component.month,
+        amount if kind == models.SalaryComponentType.bonus else 0,
+        amount if kind == models.SalaryComponentType.adjustment else 0,
+        0,
+    )
+
 def repo_create_salary_component(db: Session, **data):
     component = models.SalaryComponent(**data)
     db.add(component)
     try:
+        repo_apply_employee_month_deltas(db, [_summary_delta(component)])
         db.commit()
     except IntegrityError as e:
         db.rollback()
@@ -26,9 +40,11 @@ def repo_update_salary_component(db: Session, component_id: str, **data):
     component = db.get(models.SalaryComponent, component_id)
     if not component:
         raise HTTPException(status_code=404, detail="Salary component not found")
+    before = _summary_delta(component, sign=-1)
     for k, v in data.items():
         setattr(component, k, v)
     try:
+        repo_apply_employee_month_deltas(db, [before, _summary_delta(component)])
         db.commit()
     except IntegrityError as e:
         db.rollback()
@@ -40,7 +56,9 @@ def repo_delete_salary_component(db: Session, component_id: str):
     component = db.get(models.SalaryComponent, component_id)
     if not component:
         raise HTTPException(status_code=404, detail="Salary component not found")
+    delta = _summary_delta(component, sign=-1)
     db.delete(component)
+    repo_apply_employee_month_deltas(db, [delta])
     db.commit()
     return {"deleted": True, "id": component_id}
 
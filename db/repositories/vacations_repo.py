@@ -2,6 +2,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException
 from db import models
+from db.repositories.payroll_summary_repo import repo_apply_employee_month_deltas
 
 __all__ = [
     'repo_create_vacation',
@@ -11,10 +12,15 @@ __all__ = [
     'repo_get_vacation_by_id',
 ]
 
+def _summary_delta(vacation: models.Vacation, sign: int = 1) -> tuple:
+    """This vacation's contribution to employee_month_summary."""
+    return (vacation.employee_id, vacation.year, vacation.month, 0, 0, sign * (vacation.days_taken or 0))
+
 def repo_create_vacation(db: Session, **data):
     vacation = models.Vacation(**data)
     db.add(vacation)
     try:
+        repo_apply_employee_month_deltas(db, [_summary_delta(vacation)])
         db.commit()
     except IntegrityError as e:
         db.rollback()
@@ -26,9 +32,11 @@ def repo_update_vacation(db: Session, vacation_id: str, **data):
     vacation = db.get(models.Vacation, vacation_id)
     if not vacation:
         raise HTTPException(status_code=404, detail="Vacation not found")
+    before = _summary_delta(vacation, sign=-1)
     for k, v in data.items():
         setattr(vacation, k, v)
     try:
+        repo_apply_employee_month_deltas(db, [before, _summary_delta(vacation)])
         db.commit()
     except IntegrityError as e:
         db.rollback()
@@ -40,7 +48,9 @@ def repo_delete_vacation(db: Session, vacation_id: str):
     vacation = db.get(models.Vacation, vacation_id)
     if not vacation:
         raise HTTPException(status_code=404, detail="Vacation not found")
+    delta = _summary_delta(vacation, sign=-1)
     db.delete(vacation)
+    repo_apply_employee_month_deltas(db, [delta])
     db.commit()
     return {"deleted": True, "id": vacation_id}
 
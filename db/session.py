@@ -11,6 +11,11 @@ SessionLocal = sessionmaker(
     bind=engine, autoflush=False, autocommit=False, future=True
 )
 
+# asyncpg engine for the async read endpoints (DB_ASYNC_READS); created on first use so the
+# sync stack, workers and scripts never need sqlalchemy[asyncio] / asyncpg installed
+_async_engine = None
+_AsyncSessionLocal = None
+
 def get_db():
     """Yield a database session for dependency injection."""
     db = SessionLocal()
@@ -18,3 +23,27 @@ def get_db():
         yield db
     finally:
         db.close()
+
+def get_async_engine():
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+        _async_engine = create_async_engine(
+            settings.ASYNC_DATABASE_URL, pool_pre_ping=True,
+            pool_size=settings.ASYNC_DB_POOL_SIZE, max_overflow=settings.ASYNC_DB_MAX_OVERFLOW,
+        )
+        # Nothing is committed on the read paths; keep loaded rows usable after the request ends
+        _AsyncSessionLocal = async_sessionmaker(_async_engine, autoflush=False, expire_on_commit=False)
+    return _async_engine
+
+async def get_async_db():
+    """Yield an AsyncSession for dependency injection (async counterpart of get_db)."""
+    get_async_engine()
+    async with _AsyncSessionLocal() as db:
+        yield db
+
+async def dispose_async_engine() -> None:
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    _async_engine = _AsyncSessionLocal = None
@@ -0,0 +1,17 @@
+"""Dialect-aware INSERT ... ON CONFLICT for repositories that maintain derived rows."""
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+
+def upsert_insert(db: Session, model):
+    """Return an ``insert(model)`` supporting ``on_conflict_do_update`` for the session's dialect.
+
+    PostgreSQL is the deployment target; SQLite is accepted for local tooling and tests.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(model)
+    if dialect == "sqlite":
+        return sqlite.insert(model)
+    raise NotImplementedError(f"Upsert not supported for dialect {dialect!r}")
@@ -0,0 +1,73 @@
+"""Micro-benchmark: single-pass slip rendering vs the previous PyPDF2 re-encrypt flow.
+
+Usage:
+    python -m scripts.bench_pdf [count]
+"""
+
+import io
+import sys
+import time
+
+from PyPDF2 import PdfReader, PdfWriter
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import mm
+from reportlab.pdfgen import canvas
+
+from utils.pdf import render_salary_pdf
+
+
+FIELDS = ['employee_id','name','cnp','hire_date','manager_name','base_salary','bonus_total','adjustment_total','gross_salary','working_days','vacation_days']
+
+
+def legacy_render_salary_pdf(data: dict) -> bytes:
+	"""Previous implementation: draw, re-parse with PdfReader, copy pages, encrypt."""
+	buffer = io.BytesIO()
+	c = canvas.Canvas(buffer, pagesize=A4)
+	textobject = c.beginText(20*mm, 270*mm)
+	textobject.setFont('Helvetica', 12)
+	textobject.textLine(f"Salary Slip - {data['year']}-{data['month']}")
+	textobject.textLine("")
+	for key in FIELDS:
+		if key in data:
+			textobject.textLine(f"{key.replace('_',' ').title()}: {data[key]}")
+	c.drawText(textobject)
+	c.showPage()
+	c.save()
+	reader = PdfReader(io.BytesIO(buffer.getvalue()))
+	writer = PdfWriter()
+	for page in reader.pages:
+		writer.add_page(page)
+	writer.encrypt(data.get('cnp') or 'password')
+	out = io.BytesIO()
+	writer.write(out)
+	return out.getvalue()
+
+
+def sample_payload(idx: int) -> dict:
+	return {
+		'year': 2025, 'month': 8, 'employee_id': f'00000000-0000-0000-0000-{idx:012d}',
+		'name': f'First{idx} Last{idx}', 'cnp': f'{idx:013d}', 'hire_date': '2023-01-15',
+		'manager_name': 'Jane Manager', 'base_salary': '5000.00', 'bonus_total': '250.00',
+		'adjustment_total': '0.00', 'gross_salary': '5250.00', 'working_days': 21, 'vacation_days': 2,
+	}
+
+
+def bench(fn, payloads) -> float:
+	start = time.perf_counter()
+	for p in payloads:
+		fn(p)
+	return time.perf_counter() - start
+
+
+def main(count: int = 1000):
+	payloads = [sample_payload(i) for i in range(count)]
+	legacy = bench(legacy_render_salary_pdf, payloads)
+	single = bench(render_salary_pdf, payloads)
+	print(f"slips={count}")
+	print(f"legacy (reportlab + PyPDF2): {legacy:.2f}s  {legacy / count * 1000:.2f} ms/slip")
+	print(f"single-pass (template):      {single:.2f}s  {single / count * 1000:.2f} ms/slip")
+	print(f"speedup: {legacy / single:.2f}x")
+
+
+if __name__ == "__main__":
+	main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
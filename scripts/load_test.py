@@ -0,0 +1,97 @@
+"""Load test: requests per second of the read endpoints on the sync vs the async DB stack.
+
+Run two API instances against the same database, one per stack, e.g.:
+	DB_ASYNC_READS=false uvicorn main:app --port 8000 --workers 1
+	DB_ASYNC_READS=true  uvicorn main:app --port 8001 --workers 1
+then:
+	python -m scripts.load_test --token <manager access token> \\
+		--target sync=http://localhost:8000 --target async=http://localhost:8001 \\
+		--concurrency 200 --duration 20
+
+Each target is hit by ``--concurrency`` concurrent clients for ``--duration`` seconds, cycling
+through ``--path`` (default: the employees, months and reports listings). Targets run one after
+the other so they do not compete for the database.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+DEFAULT_PATHS = ['/api/employees?limit=50', '/api/months', '/api/reports?limit=50']
+
+
+async def _client_loop(client: httpx.AsyncClient, paths: list[str], offset: int, deadline: float, latencies: list, errors: list) -> None:
+	i = offset
+	while time.perf_counter() < deadline:
+		path = paths[i % len(paths)]
+		i += 1
+		started = time.perf_counter()
+		try:
+			resp = await client.get(path)
+			if resp.status_code >= 400:
+				errors.append(resp.status_code)
+				continue
+		except httpx.HTTPError as e:
+			errors.append(type(e).__name__)
+			continue
+		latencies.append(time.perf_counter() - started)
+
+
+async def run_target(base_url: str, token: str, paths: list[str], concurrency: int, duration: float, warmup: float) -> dict:
+	limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+	headers = {'Authorization': f'Bearer {token}'}
+	async with httpx.AsyncClient(base_url=base_url, headers=headers, limits=limits, timeout=30.0) as client:
+		if warmup > 0:
+			deadline = time.perf_counter() + warmup
+			await asyncio.gather(*(_client_loop(client, paths, n, deadline, [], []) for n in range(concurrency)))
+		latencies, errors = [], []
+		started = time.perf_counter()
+		deadline = started + duration
+		await asyncio.gather(*(_client_loop(client, paths, n, deadline, latencies, errors) for n in range(concurrency)))
+		elapsed = time.perf_counter() - started
+	latencies.sort()
+	return {
+		'requests': len(latencies),
+		'errors': len(errors),
+		'rps': round(len(latencies) / elapsed, 1),
+		'p50_ms': round(statistics.median(latencies) * 1000, 1) if latencies else None,
+		'p95_ms': round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 1) if latencies else None,
+	}
+
+
+def _target(value: str) -> tuple[str, str]:
+	label, sep, url = value.partition('=')
+	if not sep or not url:
+		raise argparse.ArgumentTypeError("expected LABEL=URL")
+	return label, url.rstrip('/')
+
+
+async def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument('--target', type=_target, action='append', required=True, help='LABEL=BASE_URL, repeatable')
+	parser.add_argument('--token', required=True, help='Bearer access token of a manager')
+	parser.add_argument('--path', action='append', help=f'GET path to cycle through, repeatable (default: {DEFAULT_PATHS})')
+	parser.add_argument('--concurrency', type=int, default=100)
+	parser.add_argument('--duration', type=float, default=15.0, help='Measured seconds per target')
+	parser.add_argument('--warmup', type=float, default=3.0, help='Unmeasured seconds per target (fills pools and caches)')
+	args = parser.parse_args()
+
+	paths = args.path or DEFAULT_PATHS
+	results = {}
+	for label, url in args.target:
+		results[label] = await run_target(url, args.token, paths, args.concurrency, args.duration, args.warmup)
+		print(f"{label:<8} {url}: {results[label]}")
+
+	baseline = results[args.target[0][0]]['rps']
+	print(f"\n{'target':<8} {'rps':>9} {'p50 ms':>8} {'p95 ms':>8} {'errors':>7} {'vs first':>9}")
+	for label, r in results.items():
+		ratio = f"{r['rps'] / baseline:.2f}x" if baseline else '-'
+		print(f"{label:<8} {r['rps']:>9} {r['p50_ms']!s:>8} {r['p95_ms']!s:>8} {r['errors']:>7} {ratio:>9}")
+
+
+if __name__ == '__main__':
+	asyncio.run(main())
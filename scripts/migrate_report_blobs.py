@@ -0,0 +1,49 @@
+"""Move legacy inline report_files.content into the blob store.
+
+Each row with inline bytes gets content_sha256/size_bytes set and its content column
+cleared. Identical files collapse onto one blob. Safe to re-run.
+
+Usage:
+    python -m scripts.migrate_report_blobs [batch_size]
+"""
+
+import sys
+
+from sqlalchemy.orm import undefer
+
+from db.session import SessionLocal
+from db.models import ReportFile
+from utils.blob_store import get_blob_store
+
+
+def migrate(batch_size: int = 100) -> int:
+	db = SessionLocal()
+	store = get_blob_store()
+	moved = 0
+	try:
+		while True:
+			rows = (
+				db.query(ReportFile)
+				.options(undefer(ReportFile.content))
+				.filter(ReportFile.content.isnot(None), ReportFile.content_sha256.is_(None))
+				.limit(batch_size)
+				.all()
+			)
+			if not rows:
+				break
+			for row in rows:
+				ref = store.put(row.content)
+				row.content_sha256 = ref.digest
+				row.size_bytes = ref.size
+				row.content = None
+			db.commit()
+			moved += len(rows)
+			print(f"Moved {moved} report blobs...")
+	finally:
+		db.close()
+	return moved
+
+
+if __name__ == "__main__":
+	total = migrate(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
+	print(f"Done. {total} rows migrated.")
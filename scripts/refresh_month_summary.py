@@ -0,0 +1,45 @@
+"""Rebuild the employee_month_summary table from salary_components and vacations.
+
+Writes keep the summary current and the migration materialized existing months, so this is
+only needed after bulk loads that bypass the repositories (seed data, SQL imports).
+
+Usage:
+    python -m scripts.refresh_month_summary [year month]
+"""
+
+import sys
+
+from sqlalchemy import union
+
+from db.session import SessionLocal
+from db.models import SalaryComponent, Vacation
+from db.repositories.payroll_summary_repo import repo_refresh_employee_month_summary
+from db.repositories.manager_month_state_repo import repo_bump_month_versions
+
+
+def refresh(year: int | None = None, month: int | None = None) -> int:
+	db = SessionLocal()
+	written = 0
+	try:
+		if year is not None and month is not None:
+			periods = [(year, month)]
+		else:
+			periods = sorted(db.execute(union(
+				db.query(SalaryComponent.year, SalaryComponent.month).distinct().statement,
+				db.query(Vacation.year, Vacation.month).distinct().statement,
+			)).all())
+		for y, m in periods:
+			# Bulk-loaded rows bypassed the repositories, so stored reports may be stale too
+			repo_bump_month_versions(db, y, m)
+			count = repo_refresh_employee_month_summary(db, y, m)
+			written += count
+			print(f"{y}-{m:02d}: {count} summary rows")
+	finally:
+		db.close()
+	return written
+
+
+if __name__ == "__main__":
+	args = [int(a) for a in sys.argv[1:3]]
+	total = refresh(*args) if len(args) == 2 else refresh()
+	print(f"Done. {total} rows written.")
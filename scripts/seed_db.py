@@ -2,8 +2,10 @@
 
 from db.session import SessionLocal
 from db.models import Employee, MonthInfo, SalaryComponent, Vacation, SalaryComponentType
-from utils.security import hash_password
+from scripts.refresh_month_summary import refresh as refresh_month_summary
+from utils.security import hash_passwords
 from datetime import date
+import uuid
 
 from faker import Faker
 import random
@@ -27,10 +29,14 @@ def seed():
 		employees = []
 		# Create manager employees (top-level, no manager)
 		default_password = "Password123!"  # Dev default
+		# bcrypt dominates seeding time: hash everyone in one batch on the process pool.
+		# Ids are assigned up front so rows need no flush before their reports reference them.
+		password_hashes = iter(hash_passwords([default_password] * (NUM_MANAGERS + NUM_EMPLOYEES)))
 		for _ in range(NUM_MANAGERS):
 			employee = Employee(
+				id=uuid.uuid4(),
 				email=fake.unique.email(),
-				password_hash=hash_password(default_password),
+				password_hash=next(password_hashes),
 				is_active=True,
 				is_manager=True,
 				first_name=fake.first_name(),
@@ -40,8 +46,8 @@ def seed():
 				base_salary=random.randint(7000, 12000),
 				manager_id=None
 			)
+			employee.org_path = f"/{employee.id}/"
 			db.add(employee)
-			db.flush()
 			employees.append(employee)
 
 		# Create regular employees (assign random manager from above)
@@ -50,8 +56,9 @@ def seed():
 			hire_date = fake.date_between(start_date='-3y', end_date='today')
 			base_salary = random.randint(3000, 8000)
 			employee = Employee(
+				id=uuid.uuid4(),
 				email=fake.unique.email(),
-				password_hash=hash_password(default_password),
+				password_hash=next(password_hashes),
 				is_active=True,
 				is_manager=False,
 				first_name=fake.first_name(),
@@ -61,8 +68,8 @@ def seed():
 				base_salary=base_salary,
 				manager_id=manager.id
 			)
+			employee.org_path = f"{manager.org_path}{employee.id}/"
 			db.add(employee)
-			db.flush()
 			employees.append(employee)
 
 		# Create MonthInfo for all months 2023-2028
@@ -115,6 +122,8 @@ def seed():
 				db.add(vacation)
 
 		db.commit()
+		# Rows were added directly, bypassing the summary deltas the repositories apply
+		refresh_month_summary()
 		print("Database seeded successfully with fake data.")
 	except Exception as e:
 		db.rollback()
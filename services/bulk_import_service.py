@@ -0,0 +1,87 @@
+"""Bulk CSV / NDJSON imports of salary components and vacations.
+
+Records are validated one by one as they stream out of the upload; valid rows are fed
+straight into the repository's COPY load, invalid ones become per-line rejects. The
+repository merges everything in a single transaction, so an import is all or nothing
+apart from the rejected lines.
+"""
+import math
+from decimal import Decimal
+from typing import IO, Callable, Iterator
+
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from api.schemas import SalaryComponentCreate, VacationCreate
+from db.models import SalaryComponentType
+from db.repositories.bulk_import_repo import repo_bulk_upsert_salary_components, repo_bulk_upsert_vacations
+from utils.bulk_records import describe_validation_error, iter_records
+
+MAX_AMOUNT = Decimal("1e10")  # numeric(12,2)
+MAX_NOTE_LENGTH = 255
+_COMPONENT_TYPES = {t.value for t in SalaryComponentType}
+
+
+def _check_period(year: int, month: int) -> None:
+    if not 1 <= year <= 9999:
+        raise ValueError("year: must be between 1 and 9999")
+    if not 1 <= month <= 12:
+        raise ValueError("month: must be between 1 and 12")
+
+
+def _salary_component_row(record: dict) -> tuple:
+    item = SalaryComponentCreate.model_validate(record)
+    _check_period(item.year, item.month)
+    if item.type not in _COMPONENT_TYPES:
+        raise ValueError(f"type: must be one of {', '.join(sorted(_COMPONENT_TYPES))}")
+    if not math.isfinite(item.amount):
+        raise ValueError("amount: must be a finite number")
+    amount = round(Decimal(str(item.amount)), 2)
+    if abs(amount) >= MAX_AMOUNT:
+        raise ValueError(f"amount: must be below {MAX_AMOUNT:,.0f}")
+    if item.note is not None and len(item.note) > MAX_NOTE_LENGTH:
+        raise ValueError(f"note: at most {MAX_NOTE_LENGTH} characters")
+    return item.employee_id, item.year, item.month, item.type, amount, item.note
+
+
+def _vacation_row(record: dict) -> tuple:
+    item = VacationCreate.model_validate(record)
+    _check_period(item.year, item.month)
+    if not 0 <= item.days_taken <= 31:
+        raise ValueError("daysTaken: must be between 0 and 31")
+    return item.employee_id, item.year, item.month, item.days_taken
+
+
+def _valid_rows(fileobj: IO[bytes], fmt: str, to_row: Callable[[dict], tuple], rejects: list) -> Iterator[tuple]:
+    for line, record, error in iter_records(fileobj, fmt):
+        if error is None:
+            try:
+                yield (line, *to_row(record))
+                continue
+            except ValidationError as e:
+                error = describe_validation_error(e)
+            except ValueError as e:
+                error = str(e)
+        rejects.append((line, error))
+
+
+def _import(db: Session, fileobj: IO[bytes], fmt: str, to_row: Callable[[dict], tuple], load: Callable) -> dict:
+    rejects: list[tuple[int, str]] = []
+    result = load(db, _valid_rows(fileobj, fmt, to_row, rejects))
+    rejects = sorted(rejects + list(result['rejects']))
+    return {
+        'received': result['staged'] + len(rejects) - len(result['rejects']),
+        'inserted': result['inserted'],
+        'updated': result['updated'],
+        'unchanged': result['unchanged'],
+        'rejected': len(rejects),
+        'rejects': [{'line': line, 'error': error} for line, error in rejects],
+    }
+
+
+def import_salary_components(db: Session, fileobj: IO[bytes], fmt: str) -> dict:
+    return _import(db, fileobj, fmt, _salary_component_row, repo_bulk_upsert_salary_components)
+
+
+def import_vacations(db: Session, fileobj: IO[bytes], fmt: str) -> dict:
+    return _import(db, fileobj, fmt, _vacation_row, repo_bulk_upsert_vacations)
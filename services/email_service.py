@@ -5,12 +5,21 @@ There are two send functions:
 2. send_email -> Uses the current runtime settings loaded from .env (production/live capable).
 
 Use the *Live* API endpoints to call send_email. Use the non-live endpoints to call send_email_dev.
+
+Both go through a per-server SMTPConnectionPool, so connections (and their STARTTLS/login
+handshake) are reused across messages. Batches should use send_many / send_many_dev.
 """
 
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple, Union
 import logging
 import os
+import queue
 import smtplib
+import threading
+import time
 from email.message import EmailMessage
 from core.settings import settings
 
@@ -21,8 +30,303 @@ DEV_SMTP_FROM = "slipsalaryapp@payroll.com"  # Distinct from production From (ca
 
 logger = logging.getLogger(__name__)
 
+# An attachment is either a file path or an in-memory (filename, bytes) pair
+Attachment = Union[str, Tuple[str, bytes]]
+
+
+@dataclass(frozen=True)
+class SMTPConfig:
+    host: str
+    port: int
+    from_addr: str
+    tls: bool = False
+    username: str | None = None
+    password: str | None = None
+    timeout: float = 10.0
+
+
+@dataclass
+class OutgoingEmail:
+    to: str
+    subject: str
+    body: str
+    attachments: List[Attachment] | None = None
+
+
+@dataclass
+class SendResult:
+    """Outcome of one message: delivered or not, how long it took and why it failed."""
+    to: str
+    ok: bool
+    latency_ms: float
+    error: str | None = None
+    attempts: int = 1
+
+    def to_dict(self) -> dict:
+        return {"to": self.to, "ok": self.ok, "latencyMs": round(self.latency_ms, 1), "error": self.error, "attempts": self.attempts}
+
+
+@dataclass
+class DispatchReport:
+    results: List[SendResult] = field(default_factory=list)
+    concurrency: int = 1
+    wall_ms: float = 0.0
+
+    @property
+    def delivered(self) -> int:
+        return sum(1 for r in self.results if r.ok)
+
+    @property
+    def failed(self) -> int:
+        return len(self.results) - self.delivered
+
+    def failures(self) -> List[dict]:
+        return [r.to_dict() for r in self.results if not r.ok]
+
+    def stats(self) -> dict:
+        """Timing summary suitable for API responses and logs."""
+        latencies = [r.latency_ms for r in self.results]
+        return {
+            "concurrency": self.concurrency,
+            "messages": len(latencies),
+            "delivered": self.delivered,
+            "failed": self.failed,
+            "wallMs": round(self.wall_ms, 1),
+            "avgLatencyMs": round(sum(latencies) / len(latencies), 1) if latencies else 0.0,
+            "maxLatencyMs": round(max(latencies), 1) if latencies else 0.0,
+        }
+
+
+class RateLimiter:
+    """Thread-safe token bucket: at most ``rate`` acquisitions per second (bursts up to ``burst``)."""
+
+    def __init__(self, rate: float, burst: int = 1, clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            self._sleep(wait)
+
+
+_rate_limiters: Dict[str, RateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(host: str) -> RateLimiter | None:
+    """Shared limiter for ``host`` when SMTP_RATE_LIMIT_PER_SECOND is configured."""
+    rate = settings.SMTP_RATE_LIMIT_PER_SECOND
+    if not rate or rate <= 0:
+        return None
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(host)
+        if limiter is None or limiter.rate != rate:
+            limiter = _rate_limiters[host] = RateLimiter(rate)
+        return limiter
+
+
+def _dev_config() -> SMTPConfig:
+    # MailHog typically does not use TLS or auth.
+    return SMTPConfig(DEV_SMTP_HOST, DEV_SMTP_PORT, DEV_SMTP_FROM, timeout=settings.SMTP_TIMEOUT)
+
+
+def _live_config() -> SMTPConfig:
+    return SMTPConfig(
+        host=settings.SMTP_HOST,
+        port=settings.SMTP_PORT,
+        from_addr=settings.SMTP_FROM,
+        tls=settings.SMTP_TLS,
+        username=settings.SMTP_USERNAME,
+        password=settings.SMTP_PASSWORD,
+        timeout=settings.SMTP_TIMEOUT,
+    )
+
+
+def _is_transient(exc: Exception) -> bool:
+    """Errors after which a fresh connection is worth one more try (dropped/idle-closed sessions)."""
+    if isinstance(exc, smtplib.SMTPResponseException):
+        return exc.smtp_code == 421
+    return isinstance(exc, (smtplib.SMTPServerDisconnected, TimeoutError, ConnectionError))
+
+
+class _PooledConnection:
+    def __init__(self, smtp: smtplib.SMTP):
+        self.smtp = smtp
+        self.sent = 0
+
+
+class SMTPConnectionPool:
+    """Bounded pool of open, already authenticated SMTP connections to one server.
 
-def _build_email_message(to: str, subject: str, body: str, attachments: List[str] | None = None, from_addr: str | None = None) -> EmailMessage:
+    A connection is used by one thread at a time. Connections are recycled after
+    ``max_messages`` and replaced (with a single retry) when the server drops them,
+    answers 421 or times out.
+    """
+
+    def __init__(self, config: SMTPConfig, size: int | None = None, max_messages: int | None = None, factory: Callable[..., smtplib.SMTP] = smtplib.SMTP):
+        self.config = config
+        self.size = max(1, size or settings.SMTP_POOL_SIZE)
+        self.max_messages = max(1, max_messages or settings.SMTP_MAX_MESSAGES_PER_CONNECTION)
+        self._factory = factory
+        self._idle: "queue.LifoQueue[_PooledConnection]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self.connects = 0
+
+    def _connect(self) -> _PooledConnection:
+        cfg = self.config
+        smtp = self._factory(cfg.host, cfg.port, timeout=cfg.timeout)
+        self.connects += 1
+        if cfg.tls:
+            try:
+                smtp.starttls()
+            except Exception as e:
+                logger.error(f"Failed to start TLS: {e}")
+        if cfg.username and cfg.password:
+            try:
+                smtp.login(cfg.username, cfg.password)
+            except Exception as e:
+                logger.error(f"SMTP login failed: {e}")
+        return _PooledConnection(smtp)
+
+    @staticmethod
+    def _discard(conn: _PooledConnection) -> None:
+        try:
+            conn.smtp.quit()
+        except Exception:
+            try:
+                conn.smtp.close()
+            except Exception:  # pragma: no cover - defensive
+                pass
+
+    @contextmanager
+    def connection(self) -> Iterator[_PooledConnection]:
+        """Check out a connection; it returns to the pool unless the body raised."""
+        self._slots.acquire()
+        try:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._connect()
+            try:
+                yield conn
+            except BaseException:
+                self._discard(conn)
+                raise
+            if conn.sent >= self.max_messages:
+                self._discard(conn)
+            else:
+                self._idle.put(conn)
+        finally:
+            self._slots.release()
+
+    def send(self, msg: EmailMessage) -> int:
+        """Send one message, reconnecting once on a transient failure.
+
+        Returns the number of attempts made; raises on error.
+        """
+        attempts, error = self._try_send(msg)
+        if error is not None:
+            raise error
+        return attempts
+
+    def _try_send(self, msg: EmailMessage) -> tuple[int, Exception | None]:
+        """``(attempts made, final error or None)``; a failed retry counts as two attempts."""
+        for attempt in (1, 2):
+            try:
+                with self.connection() as conn:
+                    conn.smtp.send_message(msg)
+                    conn.sent += 1
+                return attempt, None
+            except Exception as e:
+                if attempt == 2 or not _is_transient(e):
+                    return attempt, e
+                logger.warning(f"SMTP connection to {self.config.host} lost ({e}); reconnecting")
+
+    def _send_one(self, email: OutgoingEmail, rate_limiter: RateLimiter | None) -> SendResult:
+        start = time.perf_counter()
+        attempts = 0
+        try:
+            msg = _build_email_message(email.to, email.subject, email.body, email.attachments, from_addr=self.config.from_addr)
+            if rate_limiter is not None:
+                rate_limiter.acquire()
+            attempts, error = self._try_send(msg)
+            if error is not None:
+                raise error
+            return SendResult(email.to, True, (time.perf_counter() - start) * 1000, attempts=attempts)
+        except Exception as e:
+            logger.error(f"Failed to send email to {email.to}: {e}")
+            return SendResult(email.to, False, (time.perf_counter() - start) * 1000, error=f"{type(e).__name__}: {e}", attempts=attempts)
+
+    def send_many(self, emails: Iterable[OutgoingEmail], concurrency: int | None = None, rate_limiter: RateLimiter | None = None, on_result: Callable[[SendResult], None] | None = None) -> DispatchReport:
+        """Send a batch over pooled connections with up to ``concurrency`` messages in flight.
+
+        Concurrency is capped by the pool size (one connection per in-flight message).
+        Results keep the input order; ``on_result`` is called (from worker threads) as each
+        message completes.
+        """
+        emails = list(emails)
+        workers = max(1, min(concurrency or settings.EMAIL_SEND_CONCURRENCY, self.size, len(emails) or 1))
+        start = time.perf_counter()
+        report = DispatchReport(concurrency=workers)
+
+        def send(email: OutgoingEmail) -> SendResult:
+            result = self._send_one(email, rate_limiter)
+            if on_result is not None:
+                on_result(result)
+            return result
+
+        if workers == 1:
+            report.results = [send(e) for e in emails]
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="smtp-send") as executor:
+                report.results = list(executor.map(send, emails))
+        report.wall_ms = (time.perf_counter() - start) * 1000
+        return report
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                return
+
+
+_pools: Dict[SMTPConfig, SMTPConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_smtp_pool(config: SMTPConfig) -> SMTPConnectionPool:
+    """Return the process-wide pool for ``config`` (one per server/credentials)."""
+    pool = _pools.get(config)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(config)
+            if pool is None:
+                pool = _pools[config] = SMTPConnectionPool(config)
+    return pool
+
+
+def close_smtp_pools() -> None:
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
+
+
+def _build_email_message(to: str, subject: str, body: str, attachments: List[Attachment] | None = None, from_addr: str | None = None) -> EmailMessage:
     """Internal helper to construct an EmailMessage with attachments."""
     msg = EmailMessage()
     msg["From"] = from_addr or settings.SMTP_FROM
@@ -31,6 +335,10 @@ def _build_email_message(to: str, subject: str, body: str, attachments: List[str
     msg.set_content(body)
 
     for path in attachments or []:
+        if isinstance(path, tuple):
+            filename, data = path
+            msg.add_attachment(data, maintype="application", subtype="octet-stream", filename=filename)
+            continue
         if not os.path.exists(path):
             logger.warning(f"Attachment path does not exist: {path}")
             continue
@@ -49,16 +357,14 @@ def _build_email_message(to: str, subject: str, body: str, attachments: List[str
     return msg
 
 
-def send_email_dev(to: str, subject: str, body: str, attachments: List[str] | None = None) -> bool:
+def send_email_dev(to: str, subject: str, body: str, attachments: List[Attachment] | None = None) -> bool:
     """Send an email using forced MailHog localhost settings.
 
     Ignores .env overrides so accidental real sends cannot happen through dev endpoints.
     """
     msg = _build_email_message(to, subject, body, attachments, from_addr=DEV_SMTP_FROM)
     try:
-        with smtplib.SMTP(DEV_SMTP_HOST, DEV_SMTP_PORT, timeout=10) as smtp:
-            # MailHog typically does not use TLS or auth.
-            smtp.send_message(msg)
+        get_smtp_pool(_dev_config()).send(msg)
         logger.info(f"[DEV] Email sent to {to} subject={subject} attachments={len(attachments or [])}")
         return True
     except Exception as e:
@@ -66,14 +372,14 @@ def send_email_dev(to: str, subject: str, body: str, attachments: List[str] | No
         return False
 
 
-def send_email(to: str, subject: str, body: str, attachments: List[str] | None = None) -> bool:
+def send_email(to: str, subject: str, body: str, attachments: List[Attachment] | None = None) -> bool:
     """Send an email via SMTP.
 
     Parameters:
     - to: recipient email address
     - subject: subject line
     - body: plain text body
-    - attachments: list of file paths to attach
+    - attachments: file paths or (filename, bytes) pairs to attach
 
     Returns True on success, False otherwise. Logs any errors encountered.
     """
@@ -81,20 +387,29 @@ def send_email(to: str, subject: str, body: str, attachments: List[str] | None =
 
     try:
         # Production / live capable path: use settings from .env
-        with smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT, timeout=10) as smtp:
-            if settings.SMTP_TLS:
-                try:
-                    smtp.starttls()
-                except Exception as e:
-                    logger.error(f"Failed to start TLS: {e}")
-            if settings.SMTP_USERNAME and settings.SMTP_PASSWORD:
-                try:
-                    smtp.login(settings.SMTP_USERNAME, settings.SMTP_PASSWORD)
-                except Exception as e:
-                    logger.error(f"SMTP login failed: {e}")
-            smtp.send_message(msg)
+        get_smtp_pool(_live_config()).send(msg)
         logger.info(f"Email sent to {to} subject={subject} attachments={len(attachments or [])}")
         return True
     except Exception as e:
         logger.error(f"Failed to send email to {to}: {e}")
         return False
+
+
+def _dispatch(config: SMTPConfig, emails: Iterable[OutgoingEmail], concurrency: int | None, on_result, label: str) -> DispatchReport:
+    report = get_smtp_pool(config).send_many(emails, concurrency=concurrency, rate_limiter=get_rate_limiter(config.host), on_result=on_result)
+    stats = report.stats()
+    logger.info(
+        f"{label}Batch sent delivered={stats['delivered']} failed={stats['failed']} concurrency={stats['concurrency']} "
+        f"wall_ms={stats['wallMs']} avg_latency_ms={stats['avgLatencyMs']} max_latency_ms={stats['maxLatencyMs']}"
+    )
+    return report
+
+
+def send_many_dev(emails: Iterable[OutgoingEmail], concurrency: int | None = None, on_result: Callable[[SendResult], None] | None = None) -> DispatchReport:
+    """Batch variant of send_email_dev reusing pooled MailHog connections."""
+    return _dispatch(_dev_config(), emails, concurrency, on_result, "[DEV] ")
+
+
+def send_many(emails: Iterable[OutgoingEmail], concurrency: int | None = None, on_result: Callable[[SendResult], None] | None = None) -> DispatchReport:
+    """Batch variant of send_email: one TLS/login handshake per pooled connection, not per message."""
+    return _dispatch(_live_config(), emails, concurrency, on_result, "")
@@ -0,0 +1,266 @@
+"""Bulk employee import (onboarding a whole organisation from one file).
+
+Lines are upserted on email and CNP. A line names its manager either by ``managerId``
+(an existing employee) or by ``managerEmail``, which may be another line of the same
+file; managers are written before their reports (topological order) and management
+cycles are rejected. Plain ``password`` values are hashed in one batch on the shared
+process pool, since bcrypt dominates the cost of an import.
+"""
+import logging
+import time
+import uuid
+from collections import deque
+from typing import IO
+
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from api.schemas import EmployeeImportRecord
+from db.repositories.employees_repo import repo_bulk_upsert_employees, repo_get_employee_keys
+from utils.bulk_records import describe_validation_error, iter_records
+from utils.process_pool import resolve_workers
+from utils.security import MIN_PARALLEL_HASHES, hash_passwords
+
+logger = logging.getLogger(__name__)
+
+# Columns written for every inserted row, so all inserts share one key set (and one statement shape)
+_INSERT_FIELDS = ['email', 'password_hash', 'is_active', 'is_manager', 'first_name', 'last_name', 'cnp', 'hire_date', 'base_salary']
+# Empty CSV cells arrive as None; flags fall back to the single-create defaults
+_FLAG_DEFAULTS = {'is_active': True, 'is_manager': False}
+
+
+def _ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 1)
+
+
+def _read(fileobj: IO[bytes], fmt: str, rejects: list) -> tuple[int, dict]:
+    """Validated records keyed by email (a later line for the same email wins)."""
+    received, by_email = 0, {}
+    for line, record, error in iter_records(fileobj, fmt):
+        received += 1
+        if error is None:
+            try:
+                item = EmployeeImportRecord.model_validate(record)
+            except ValidationError as e:
+                error = describe_validation_error(e)
+        if error is not None:
+            rejects.append((line, error))
+            continue
+        if item.email in by_email:
+            rejects.append((by_email[item.email][0], f'Superseded by line {line}'))
+        by_email[item.email] = (line, item)
+    cnp_owner = {}
+    for email, (line, item) in sorted(by_email.items(), key=lambda kv: kv[1][0]):
+        if item.cnp in cnp_owner:
+            rejects.append((line, f'cnp already used on line {by_email[cnp_owner[item.cnp]][0]}'))
+            del by_email[email]
+        else:
+            cnp_owner[item.cnp] = email
+    return received, by_email
+
+
+def _resolve(db: Session, by_email: dict, rejects: list) -> list[dict]:
+    """Match lines to existing employees, resolve managers and order managers first.
+
+    Returns one entry per accepted line: ``{line, item, id, existing, manager_id, parent}``
+    where ``parent`` is the email of a manager that is itself in the batch.
+    """
+    manager_emails = {item.manager_email for _, item in by_email.values() if item.manager_email}
+    existing = repo_get_employee_keys(
+        db,
+        emails=set(by_email) | manager_emails,
+        cnps={item.cnp for _, item in by_email.values()},
+        ids={item.manager_id for _, item in by_email.values() if item.manager_id},
+    )
+    db_by_email = {row.email: row for row in existing}
+    db_by_cnp = {row.cnp: row for row in existing}
+    db_by_id = {row.id: row for row in existing}
+
+    entries, claimed = {}, {}
+    for email, (line, item) in sorted(by_email.items(), key=lambda kv: kv[1][0]):
+        match_email, match_cnp = db_by_email.get(email), db_by_cnp.get(item.cnp)
+        if match_email and match_cnp and match_email.id != match_cnp.id:
+            rejects.append((line, 'email and cnp belong to different employees'))
+            continue
+        match = match_email or match_cnp
+        if match is not None and match.id in claimed:
+            rejects.append((line, f'Same employee as line {claimed[match.id]}'))
+            continue
+        if match is not None:
+            claimed[match.id] = line
+        entries[email] = {'line': line, 'item': item, 'id': match.id if match else uuid.uuid4(), 'existing': match is not None}
+    batch_by_id = {entry['id']: email for email, entry in entries.items() if entry['existing']}
+
+    for email, entry in list(entries.items()):
+        item = entry['item']
+        parent, manager_id = None, None
+        if item.manager_email:
+            if item.manager_email in by_email:
+                parent = item.manager_email
+            elif item.manager_email in db_by_email:
+                manager_id = db_by_email[item.manager_email].id
+            else:
+                rejects.append((entry['line'], f'Manager {item.manager_email} not found'))
+                del entries[email]
+                continue
+        elif item.manager_id:
+            if item.manager_id in batch_by_id:
+                parent = batch_by_id[item.manager_id]
+            elif item.manager_id in db_by_id:
+                manager_id = item.manager_id
+            else:
+                rejects.append((entry['line'], f'Manager {item.manager_id} not found'))
+                del entries[email]
+                continue
+        if parent == email:
+            rejects.append((entry['line'], 'An employee cannot manage themselves'))
+            del entries[email]
+            continue
+        entry['parent'], entry['manager_id'] = parent, manager_id
+
+    # Moving someone under one of their own stored reports (listed in the file or not)
+    stored_paths = {str(row.id): row.org_path for row in existing}
+    for email, entry in sorted(entries.items(), key=lambda kv: kv[1]['line']):
+        if entry['existing'] and _moves_under_own_report(entry, entries, stored_paths):
+            rejects.append((entry['line'], 'Management cycle'))
+            del entries[email]
+
+    # Kahn's algorithm over in-batch manager links: a line is ready once its manager is placed
+    children, ready = {}, deque()
+    for email, entry in entries.items():
+        if entry['parent'] is None:
+            ready.append(email)
+        else:
+            children.setdefault(entry['parent'], []).append(email)
+    ordered = []
+    while ready:
+        email = ready.popleft()
+        entry = entries[email]
+        if entry['parent'] is not None:
+            entry['manager_id'] = entries[entry['parent']]['id']
+        ordered.append(entry)
+        ready.extend(children.pop(email, []))
+    placed = {entry['item'].email for entry in ordered}
+    for email, entry in entries.items():
+        if email not in placed:
+            rejects.append((entry['line'], _unplaced_reason(email, entries, by_email)))
+    return ordered
+
+
+def _new_manager(entry: dict, entries: dict):
+    """Manager id a line assigns (None when it names none or its in-batch manager was rejected)."""
+    if entry['parent'] is not None:
+        parent = entries.get(entry['parent'])
+        return parent['id'] if parent is not None else None
+    return entry['manager_id']
+
+
+def _moves_under_own_report(entry: dict, entries: dict, stored_paths: dict) -> bool:
+    """Whether the line's new manager chain, with the batch's manager changes applied, reaches the employee.
+
+    Stored ancestors come from ``org_path``; an ancestor whose own line assigns a manager is
+    followed to that manager instead. Cycles made only of batch lines are left to the ordering.
+    """
+    by_id = {str(other['id']): other for other in entries.values()}
+    target, seen = str(entry['id']), set()
+    current = _new_manager(entry, entries)
+    while current is not None and str(current) not in seen:
+        node = str(current)
+        if node == target:
+            return True
+        seen.add(node)
+        other = by_id.get(node)
+        if other is not None and (other['parent'] is not None or other['manager_id'] is not None):
+            current = _new_manager(other, entries)
+            continue
+        # Unchanged position: climb the stored path until an ancestor whose line moves it
+        current = None
+        for ancestor in reversed((stored_paths.get(node) or '').strip('/').split('/')[:-1]):
+            if ancestor == target:
+                return True
+            other = by_id.get(ancestor)
+            if other is not None and (other['parent'] is not None or other['manager_id'] is not None):
+                current = _new_manager(other, entries)
+                break
+    return False
+
+
+def _unplaced_reason(email: str, entries: dict, by_email: dict) -> str:
+    seen = set()
+    while email in entries and email not in seen:
+        seen.add(email)
+        email = entries[email]['parent']
+    if email in seen:
+        return 'Management cycle'
+    return f'Manager on line {by_email[email][0]} was rejected'
+
+
+def _rows(ordered: list[dict], hashes: dict) -> tuple[list[dict], list[dict]]:
+    inserts, updates = [], []
+    for entry in ordered:
+        item, line = entry['item'], entry['line']
+        if entry['existing']:
+            # A CSV line sets every header column; empty cells (None) keep the stored value
+            row = {'id': entry['id'], **item.model_dump(include=item.model_fields_set & set(_INSERT_FIELDS), exclude_none=True)}
+            if item.manager_id or item.manager_email:
+                row['manager_id'] = entry['manager_id']
+            if line in hashes:
+                row['password_hash'] = hashes[line]
+            updates.append(row)
+        else:
+            row = {'id': entry['id'], **item.model_dump(include=set(_INSERT_FIELDS)), 'manager_id': entry['manager_id']}
+            row['password_hash'] = hashes.get(line, row['password_hash'])
+            for flag, default in _FLAG_DEFAULTS.items():
+                if row[flag] is None:
+                    row[flag] = default
+            inserts.append(row)
+    return inserts, updates
+
+
+def _hash_workers(count: int) -> int:
+    # Hashing runs on the shared process pool, which PDF_RENDER_WORKERS sizes for rendering too
+    if count == 0:
+        return 0
+    return 1 if count < MIN_PARALLEL_HASHES else min(resolve_workers(), count)
+
+
+def import_employees(db: Session, fileobj: IO[bytes], fmt: str) -> dict:
+    started = time.perf_counter()
+    rejects: list[tuple[int, str]] = []
+    received, by_email = _read(fileobj, fmt, rejects)
+    ordered = _resolve(db, by_email, rejects)
+    parse_ms = _ms(started)
+
+    hash_started = time.perf_counter()
+    to_hash = [(entry['line'], entry['item'].password) for entry in ordered if entry['item'].password]
+    hashes = dict(zip([line for line, _ in to_hash], hash_passwords([password for _, password in to_hash])))
+    hash_ms = _ms(hash_started)
+
+    write_started = time.perf_counter()
+    inserts, updates = _rows(ordered, hashes)
+    if inserts or updates:
+        repo_bulk_upsert_employees(db, inserts, updates)
+    write_ms = _ms(write_started)
+
+    total_s = time.perf_counter() - started
+    metrics = {
+        'parseMs': parse_ms,
+        'hashMs': hash_ms,
+        'hashed': len(to_hash),
+        'hashWorkers': _hash_workers(len(to_hash)),
+        'writeMs': write_ms,
+        'totalMs': round(total_s * 1000, 1),
+        'rowsPerSecond': round(len(ordered) / total_s, 1) if total_s > 0 else 0.0,
+    }
+    logger.info(
+        f"Employee import received={received} inserted={len(inserts)} updated={len(updates)} rejected={len(rejects)} "
+        f"hash_ms={hash_ms} write_ms={write_ms} rows_per_s={metrics['rowsPerSecond']}"
+    )
+    return {
+        'received': received,
+        'inserted': len(inserts),
+        'updated': len(updates),
+        'rejected': len(rejects),
+        'rejects': [{'line': line, 'error': error} for line, error in sorted(rejects)],
+        'metrics': metrics,
+    }
@@ -1,17 +1,74 @@
+from datetime import date
+from typing import TYPE_CHECKING
+from fastapi import HTTPException
 from sqlalchemy.orm import Session
 from db.repositories.employees_repo import (
     repo_list_employees,
+    repo_list_employees_async,
     repo_get_employee_by_id,
+    repo_get_employee_by_id_async,
     repo_create_employee,
     repo_update_employee,
     repo_delete_employee,
     repo_get_employees_by_manager,
 )
-from api.schemas import EmployeeCreate, EmployeeUpdate
+from db.repositories.auth_repo import repo_revoke_employee_tokens
+from db.repositories.reporting_queries import repo_list_subtree
+from api.schemas import EmployeeCreate, EmployeeResponse, EmployeeSubtreeResponse, EmployeeUpdate
+from utils.pagination import decode_cursor
 
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+# Always selected by a projection: they form the pagination cursor
+_KEYSET_FIELDS = ['id', 'created_at']
+
+
+def _projection(fields: str | None) -> list[str] | None:
+    """Attribute names for a comma-separated ``fields`` value (camelCase or snake_case)."""
+    if not fields:
+        return None
+    known = {name: name for name in EmployeeResponse.model_fields}
+    known.update({info.alias: name for name, info in EmployeeResponse.model_fields.items() if info.alias})
+    requested = [f.strip() for f in fields.split(',') if f.strip()]
+    unknown = [f for f in requested if f not in known]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown employee field(s): {', '.join(unknown)}")
+    return list(dict.fromkeys(_KEYSET_FIELDS + [known[f] for f in requested]))
+
+
+def _list_filters(limit, cursor, manager_id, is_active, hired_from, hired_to, fields) -> dict:
+    return {
+        'limit': limit, 'after': decode_cursor(cursor) if cursor else None, 'manager_id': manager_id,
+        'is_active': is_active, 'hired_from': hired_from, 'hired_to': hired_to, 'columns': _projection(fields),
+    }
+
+
+def get_employees(
+    db: Session,
+    limit: int | None = 100,
+    cursor: str | None = None,
+    manager_id: str | None = None,
+    is_active: bool | None = None,
+    hired_from: date | None = None,
+    hired_to: date | None = None,
+    fields: str | None = None,
+):
+    return repo_list_employees(db, **_list_filters(limit, cursor, manager_id, is_active, hired_from, hired_to, fields))
+
+
+async def get_employees_async(
+    db: "AsyncSession",
+    limit: int | None = 100,
+    cursor: str | None = None,
+    manager_id: str | None = None,
+    is_active: bool | None = None,
+    hired_from: date | None = None,
+    hired_to: date | None = None,
+    fields: str | None = None,
+):
+    return await repo_list_employees_async(db, **_list_filters(limit, cursor, manager_id, is_active, hired_from, hired_to, fields))
 
-def get_employees(db: Session):
-    return repo_list_employees(db)
 
 def get_employees_by_manager(db: Session, manager_id: str):
     return repo_get_employees_by_manager(db, manager_id)
@@ -21,6 +78,19 @@ def get_employee_by_id(db: Session, employee_id: str):
     return repo_get_employee_by_id(db, employee_id)
 
 
+async def get_employee_by_id_async(db: "AsyncSession", employee_id: str):
+    return await repo_get_employee_by_id_async(db, employee_id)
+
+
+def get_employee_subtree(db: Session, employee_id: str, max_depth: int | None = None):
+    """Everyone below the employee (depth 1 = direct reports), depth-first."""
+    repo_get_employee_by_id(db, employee_id)
+    return [
+        EmployeeSubtreeResponse(**EmployeeResponse.model_validate(employee, from_attributes=True).model_dump(), depth=depth)
+        for employee, depth in repo_list_subtree(db, employee_id, max_depth)
+    ]
+
+
 def create_employee(db: Session, employee_in: EmployeeCreate):
     data = employee_in.model_dump()
     return repo_create_employee(db, **data)
@@ -33,3 +103,7 @@ def update_employee(db: Session, employee_id: str, patch: EmployeeUpdate):
 
 def delete_employee(db: Session, employee_id: str):
     return repo_delete_employee(db, employee_id)
+
+
+def revoke_employee_tokens(db: Session, employee_id: str):
+    return repo_revoke_employee_tokens(db, employee_id)
@@ -0,0 +1,206 @@
+"""Durable background jobs for report generation and sending.
+
+API endpoints enqueue a row in the ``jobs`` table and answer 202 immediately; one or
+more ``worker.py`` processes claim jobs with ``SELECT ... FOR UPDATE SKIP LOCKED`` and run
+the matching handler. Handlers report per-item progress through ``JobProgress``, which also
+heartbeats the job so a crashed worker's jobs are requeued.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import traceback
+from typing import Callable, Dict
+from uuid import UUID
+
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.orm import Session
+
+from core.settings import settings
+from db.session import SessionLocal
+from db.repositories.jobs_repo import (
+    JOB_STATUSES,
+    repo_enqueue_job,
+    repo_get_job_by_id,
+    repo_list_jobs,
+    repo_claim_next_job,
+    repo_update_job_progress,
+    repo_save_job_checkpoint,
+    repo_complete_job,
+    repo_fail_job,
+    repo_requeue_stale_jobs,
+)
+from services import report_generation_service as reports
+from services.month_close_service import close_month
+
+logger = logging.getLogger(__name__)
+
+
+class JobProgress:
+    """Thread-safe per-item counters for a running job.
+
+    Counters live in memory; a background thread flushes them (and the worker heartbeat)
+    every ``interval`` seconds using its own session, so handlers never commit on the
+    caller's session just to report progress.
+    """
+
+    def __init__(self, job_id, interval: float | None = None, session_factory: Callable[[], Session] = SessionLocal, checkpoint: dict | None = None):
+        self.job_id = job_id
+        # Resume state from a previous attempt (see save_checkpoint)
+        self.checkpoint: dict = dict(checkpoint or {})
+        self.interval = interval if interval is not None else max(1.0, settings.JOB_STALE_AFTER_SECONDS / 10)
+        self.total = 0
+        self.done = 0
+        self.failed = 0
+        self._session_factory = session_factory
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def set_total(self, total: int) -> None:
+        with self._lock:
+            self.total = total
+
+    def advance(self, done: int = 0, failed: int = 0) -> None:
+        with self._lock:
+            self.done += done
+            self.failed += failed
+
+    def record_send(self, result) -> None:
+        """``on_result`` callback for email dispatch (SendResult)."""
+        self.advance(done=1 if result.ok else 0, failed=0 if result.ok else 1)
+
+    def save_checkpoint(self, checkpoint: dict) -> None:
+        """Durably store resume state right away (unlike counters, which are flushed periodically)."""
+        self.checkpoint = dict(checkpoint)
+        db = self._session_factory()
+        try:
+            repo_save_job_checkpoint(db, self.job_id, jsonable_encoder(self.checkpoint))
+        finally:
+            db.close()
+
+    def flush(self) -> None:
+        with self._lock:
+            total, done, failed = self.total, self.done, self.failed
+        db = self._session_factory()
+        try:
+            repo_update_job_progress(db, self.job_id, total=total, done=done, failed=failed)
+        except Exception as e:  # progress is best effort; never fail the job over it
+            logger.warning(f"Failed to record progress for job {self.job_id}: {e}")
+        finally:
+            db.close()
+
+    def _heartbeat(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.flush()
+
+    def __enter__(self) -> "JobProgress":
+        self._thread = threading.Thread(target=self._heartbeat, name=f"job-{self.job_id}-heartbeat", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+
+
+def _manager_args(params: dict) -> tuple:
+    return UUID(params['managerId']), int(params['year']), int(params['month'])
+
+
+def _scope(params: dict) -> str:
+    # Jobs queued before report scopes existed cover direct reports
+    return params.get('scope', 'direct')
+
+
+# kind -> handler(db, params, progress) returning a JSON-serialisable result
+JOB_HANDLERS: Dict[str, Callable[[Session, dict, JobProgress], dict]] = {
+    'generate_manager_csv': lambda db, p, progress: reports.generate_manager_csv_idempotent(
+        db, *_manager_args(p), include_bonuses=p.get('includeBonuses', True), scope=_scope(p)),
+    'send_manager_csv': lambda db, p, progress: reports.send_manager_csv(
+        db, *_manager_args(p), scope=_scope(p), progress=progress),
+    'send_manager_csv_live': lambda db, p, progress: reports.send_manager_csv_live(
+        db, *_manager_args(p), scope=_scope(p), progress=progress),
+    'generate_employee_pdfs': lambda db, p, progress: reports.generate_employee_pdfs_idempotent(
+        db, *_manager_args(p), overwrite=p.get('overwrite', False), progress=progress, scope=_scope(p)),
+    'send_employee_pdfs': lambda db, p, progress: reports.send_employee_pdfs(
+        db, *_manager_args(p), regenerate_missing=p.get('regenerateMissing', False), progress=progress, scope=_scope(p)),
+    'send_employee_pdfs_live': lambda db, p, progress: reports.send_employee_pdfs_live(
+        db, *_manager_args(p), regenerate_missing=p.get('regenerateMissing', False), progress=progress, scope=_scope(p)),
+    'close_month': lambda db, p, progress: close_month(
+        db, int(p['year']), int(p['month']), overwrite=p.get('overwrite', False), progress=progress),
+}
+
+# Kinds that must fail fast at submission when SMTP is not production ready
+LIVE_SMTP_KINDS = {'send_manager_csv_live', 'send_employee_pdfs_live'}
+
+
+def enqueue_job(db: Session, kind: str, params: dict, idempotency_key: str | None = None, requested_by=None):
+    """Queue a job; the same Idempotency-Key for the same kind returns the existing job."""
+    if kind not in JOB_HANDLERS:
+        raise HTTPException(status_code=400, detail=f"Unknown job kind: {kind}")
+    if kind in LIVE_SMTP_KINDS:
+        reports.require_live_smtp_settings()
+    params = jsonable_encoder(params)
+    # The job row is the idempotency record: a retried submission gets the same job (and its result)
+    dedupe_key = f"{kind}:{idempotency_key}" if idempotency_key else None
+    return repo_enqueue_job(db, kind, params, dedupe_key=dedupe_key, requested_by=requested_by, max_attempts=settings.JOB_MAX_ATTEMPTS)
+
+
+def job_accepted(job) -> dict:
+    """Body of the 202 response returned by endpoints that enqueue work."""
+    return {"jobId": str(job.id), "kind": job.kind, "status": job.status, "statusUrl": f"/api/jobs/{job.id}"}
+
+
+def get_job(db: Session, job_id: str):
+    return repo_get_job_by_id(db, job_id)
+
+
+def list_jobs(db: Session, status: str | None = None, kind: str | None = None, limit: int = 100):
+    if status is not None and status not in JOB_STATUSES:
+        raise HTTPException(status_code=400, detail=f"status must be one of {', '.join(JOB_STATUSES)}")
+    return repo_list_jobs(db, status=status, kind=kind, limit=limit)
+
+
+def run_job(db: Session, job, progress: JobProgress | None = None):
+    """Execute a claimed job and record success, a retry, or final failure."""
+    handler = JOB_HANDLERS.get(job.kind)
+    progress = progress or JobProgress(job.id, checkpoint=job.checkpoint)
+    try:
+        if handler is None:
+            raise RuntimeError(f"No handler registered for job kind {job.kind!r}")
+        with progress:
+            result = handler(db, job.params or {}, progress)
+            if progress.total == 0:
+                # Single-item jobs (CSV) never set a total
+                progress.set_total(1)
+                progress.advance(done=1)
+    except Exception as e:
+        db.rollback()
+        detail = e.detail if isinstance(e, HTTPException) else str(e)
+        # Client errors (bad manager, missing month info) will not succeed on retry
+        retry = not (isinstance(e, HTTPException) and e.status_code < 500)
+        logger.error(f"Job {job.id} kind={job.kind} attempt={job.attempts} failed: {detail}" + (f"\n{traceback.format_exc()}" if retry else ""))
+        return repo_fail_job(db, job, f"{type(e).__name__}: {detail}", retry=retry, retry_delay_seconds=settings.JOB_RETRY_DELAY_SECONDS)
+    logger.info(f"Job {job.id} kind={job.kind} succeeded done={progress.done} failed={progress.failed}")
+    return repo_complete_job(db, job, jsonable_encoder(result))
+
+
+def run_next_job(db: Session, worker_id: str, kinds: list[str] | None = None) -> bool:
+    """Claim and run one job. Returns False when the queue had nothing runnable."""
+    job = repo_claim_next_job(db, worker_id, kinds=kinds)
+    if job is None:
+        return False
+    logger.info(f"Worker {worker_id} claimed job {job.id} kind={job.kind} attempt={job.attempts}")
+    run_job(db, job)
+    return True
+
+
+def requeue_stale_jobs(db: Session) -> int:
+    count = repo_requeue_stale_jobs(db, settings.JOB_STALE_AFTER_SECONDS)
+    if count:
+        logger.warning(f"Requeued {count} jobs whose worker stopped heartbeating")
+    return count
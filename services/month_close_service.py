@@ -0,0 +1,153 @@
+"""Organisation-wide month close: every manager CSV and every employee slip in one run.
+
+Month info and the salary aggregation are loaded once for the whole company (one
+set-based query instead of one per manager). Managers are processed in batches whose slips
+are rendered together on the process pool; after each batch the completed managers are
+checkpointed on the job, so a retried or requeued run resumes where the last one stopped.
+Managers whose month data has not changed since their CSV / slips were written (see
+``manager_month_state``) keep their stored output; for the others only slips whose
+render input fingerprint changed are rendered again.
+"""
+from __future__ import annotations
+
+import logging
+from itertools import groupby
+from typing import Dict, List
+
+from sqlalchemy.orm import Session
+
+from core.settings import settings
+from db.repositories.reporting_queries import repo_aggregate_company_month_summary, repo_list_manager_ids
+from db.repositories.report_files_repo import repo_list_report_files_by_paths
+from db.repositories.manager_month_state_repo import (
+    repo_list_manager_month_states,
+    repo_record_manager_month_generated,
+)
+from db.repositories.months_repo import repo_get_month_info_by_year_month
+from services.report_outputs import (
+    blob_available,
+    data_version,
+    employee_pdf_path,
+    manager_csv_content,
+    manager_csv_path,
+    report_is_current,
+    slip_payload,
+    store_report_files,
+)
+from utils.pdf import slip_fingerprint
+from utils.pdf_render import render_salary_pdfs
+
+logger = logging.getLogger(__name__)
+
+
+def _manager_batches(managers: List[str], rows_by_manager: Dict[str, list], max_slips: int) -> List[List[str]]:
+    """Group managers so each batch renders about ``max_slips`` slips (a manager is never split)."""
+    batches: List[List[str]] = []
+    current: List[str] = []
+    size = 0
+    for manager_id in managers:
+        count = len(rows_by_manager[manager_id])
+        if current and size + count > max_slips:
+            batches.append(current)
+            current, size = [], 0
+        current.append(manager_id)
+        size += count
+    if current:
+        batches.append(current)
+    return batches
+
+
+def close_month(db: Session, year: int, month: int, overwrite: bool = False, progress=None) -> dict:
+    """Generate all manager CSVs and employee slips for ``year``/``month``.
+
+    ``progress`` is the job's JobProgress: it counts slips and carries the resume checkpoint
+    (``{"managers": [...done ids], "totals": {...}}``). Without it the run is not resumable.
+    """
+    # Versions are read before the data so writes racing the run leave those managers dirty
+    states = repo_list_manager_month_states(db, year, month)
+    versions = {manager_id: data_version(state) for manager_id, state in states.items()}
+    csv_current = {manager_id for manager_id, state in states.items() if report_is_current(state, 'csv')}
+    pdfs_current = {manager_id for manager_id, state in states.items() if report_is_current(state, 'pdfs')}
+    month_info = repo_get_month_info_by_year_month(db, year, month)
+    rows = repo_aggregate_company_month_summary(db, year, month)
+    rows_by_manager = {manager_id: list(group) for manager_id, group in groupby(rows, key=lambda r: r['manager_id'])}
+    # Managers without direct reports have nothing to report; they are counted, not given empty CSVs
+    without_reports = [m for m in repo_list_manager_ids(db) if m not in rows_by_manager]
+    if without_reports:
+        logger.info(f"Month close {year}-{month:02d}: skipping {len(without_reports)} managers without direct reports")
+
+    checkpoint = dict(progress.checkpoint) if progress is not None else {}
+    done_managers = set(checkpoint.get('managers', []))
+    totals = {'csvFiles': 0, 'csvUnchanged': 0, 'generated': 0, 'reused': 0, **checkpoint.get('totals', {})}
+    pending = [m for m in rows_by_manager if m not in done_managers]
+    if progress is not None:
+        progress.set_total(len(rows))
+        progress.advance(done=sum(len(rows_by_manager[m]) for m in done_managers if m in rows_by_manager))
+    if done_managers:
+        logger.info(f"Month close {year}-{month:02d} resuming: {len(done_managers)} managers already done, {len(pending)} pending")
+
+    render_ms = 0.0
+    for batch in _manager_batches(pending, rows_by_manager, max(1, settings.MONTH_CLOSE_BATCH_SLIPS)):
+        csv_paths = {manager_id: manager_csv_path(manager_id, year, month) for manager_id in batch}
+        batch_rows = [row for manager_id in batch for row in rows_by_manager[manager_id]]
+        paths = [employee_pdf_path(row['employee_id'], year, month) for row in batch_rows]
+        existing = {} if overwrite else repo_list_report_files_by_paths(db, paths + list(csv_paths.values()))
+
+        # CSVs and slips of the batch are written together with one bulk upsert
+        files = []
+        for manager_id in batch:
+            if manager_id in csv_current and blob_available(existing.get(csv_paths[manager_id])):
+                totals['csvUnchanged'] += 1
+                continue
+            content = manager_csv_content(rows_by_manager[manager_id], month_info.working_days)
+            files.append((csv_paths[manager_id], 'csv', manager_id, content, None))
+            totals['csvFiles'] += 1
+
+        pending_rows = []
+        for row, path in zip(batch_rows, paths):
+            report = existing.get(path)
+            if row['manager_id'] in pdfs_current and blob_available(report):
+                totals['reused'] += 1
+                continue
+            # Manager data changed: only slips whose render input differs are rendered again
+            payload = slip_payload(
+                year, month, row['employee_id'], f"{row['first_name']} {row['last_name']}", row['cnp'], row['hire_date'],
+                row['manager_name'], row['base_salary'], row['bonus_total'], row['adjustment_total'],
+                month_info.working_days, row['vacation_days'],
+            )
+            fingerprint = slip_fingerprint(payload)
+            if report is not None and report.fingerprint == fingerprint and blob_available(report):
+                totals['reused'] += 1
+            else:
+                pending_rows.append((row, path, payload, fingerprint))
+        if progress is not None:
+            progress.advance(done=len(batch_rows) - len(pending_rows))
+
+        rendered = render_salary_pdfs([payload for _, _, payload, _ in pending_rows])
+        render_ms += rendered.wall_ms
+        files.extend((path, 'pdf', row['employee_id'], slip.content, fingerprint) for (row, path, _, fingerprint), slip in zip(pending_rows, rendered.slips))
+        store_report_files(db, files)
+        totals['generated'] += len(pending_rows)
+        if progress is not None:
+            progress.advance(done=len(pending_rows))
+
+        batch_versions = {manager_id: versions.get(manager_id, 0) for manager_id in batch}
+        repo_record_manager_month_generated(db, year, month, 'csv', batch_versions)
+        repo_record_manager_month_generated(db, year, month, 'pdfs', batch_versions)
+        done_managers.update(batch)
+        if progress is not None:
+            progress.save_checkpoint({'managers': sorted(done_managers), 'totals': totals})
+
+    return {
+        "status": "closed",
+        "period": f"{year}-{month:02d}",
+        "managers": len(rows_by_manager),
+        "managersWithoutReports": len(without_reports),
+        "employees": len(rows),
+        "resumedManagers": len(rows_by_manager) - len(pending),
+        **totals,
+        "renderWallMs": round(render_ms, 1),
+    }
+
+
+__all__ = ["close_month"]
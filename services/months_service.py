@@ -1,22 +1,36 @@
+from typing import TYPE_CHECKING
 from sqlalchemy.orm import Session
 from db.repositories.months_repo import (
     repo_list_months,
+    repo_list_months_async,
     repo_get_month_by_id,
+    repo_get_month_by_id_async,
     repo_create_month,
     repo_update_month,
     repo_delete_month,
 )
 from api.schemas import MonthInfoCreate, MonthInfoUpdate
 
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
 
 def get_months(db: Session):
     return repo_list_months(db)
 
 
+async def get_months_async(db: "AsyncSession"):
+    return await repo_list_months_async(db)
+
+
 def get_month_by_id(db: Session, month_id: str):
     return repo_get_month_by_id(db, month_id)
 
 
+async def get_month_by_id_async(db: "AsyncSession", month_id: str):
+    return await repo_get_month_by_id_async(db, month_id)
+
+
 def create_month(db: Session, month_in: MonthInfoCreate):
     data = month_in.model_dump()
     return repo_create_month(db, **data)
@@ -1,6 +1,7 @@
 import os
-from typing import List, Tuple
-import shutil
+from datetime import date
+from functools import cached_property
+from typing import Iterable, List, NamedTuple, Tuple
 
 from uuid import UUID
 from sqlalchemy.orm import Session
@@ -8,77 +9,186 @@ from fastapi import HTTPException
 from db import models
 from db.repositories.report_files_repo import (
     repo_create_report_file,
-    repo_update_report_file,
+    repo_move_report_file,
+    repo_move_report_files,
     repo_get_report_file_by_path,
+    repo_list_report_files_by_paths,
 )
 from db.repositories.reporting_queries import (
     repo_get_manager,
     repo_list_subordinates,
     repo_aggregate_employee_month_summary,
 )
-from db.repositories.months_repo import repo_get_month_info_by_year_month
+from db.repositories.employees_repo import EmployeeIdentity
+from db.repositories.months_repo import MonthRef, repo_get_month_info_by_year_month
+from db.repositories.manager_month_state_repo import (
+    repo_get_manager_month_state,
+    repo_record_manager_month_generated,
+)
 from db.repositories.idempotency_repo import (
     repo_get_idempotency_key_by_key,
     repo_create_idempotency_key,
     repo_mark_idempotency_key_succeeded,
 )
-from utils.files import write_csv, zip_paths, ensure_dir
-import mimetypes
-from utils.pdf import build_salary_pdf
-from services.email_service import send_email, send_email_dev
-
-BASE_REPORT_DIR = "reports"
+from utils.blob_store import get_blob_store
+from utils.files import ZipContent, write_zip
+from utils.pdf import slip_fingerprint
+from utils.pdf_render import render_salary_pdfs
+from services.email_service import DispatchReport, OutgoingEmail, send_many, send_many_dev
+from services.report_outputs import (
+    BASE_REPORT_DIR,
+    SlipFile,
+    blob_available,
+    data_version,
+    employee_pdf_path,
+    manager_csv_content,
+    manager_csv_path,
+    report_is_current,
+    scope_suffix,
+    slip_payload,
+    store_report_files,
+)
 
+def require_live_smtp_settings() -> None:
+    """Reject live sends while SMTP settings still point at MailHog or lack TLS/auth."""
+    from core.settings import settings
+    if settings.SMTP_HOST in {"localhost", "127.0.0.1"}:
+        raise HTTPException(status_code=400, detail="SMTP_HOST points to localhost; configure real SMTP before using live endpoint.")
+    if not settings.SMTP_TLS and not (settings.SMTP_USERNAME and settings.SMTP_PASSWORD):
+        raise HTTPException(status_code=400, detail="Production sending requires TLS or SMTP auth credentials.")
 
-def _get_manager(db: Session, manager_id: UUID) -> models.Employee:
+def _get_manager(db: Session, manager_id: UUID) -> EmployeeIdentity:
     return repo_get_manager(db, str(manager_id))
 
-def _get_subordinates(db: Session, manager_id: UUID) -> List[models.Employee]:
-    return repo_list_subordinates(db, str(manager_id))
+def _get_subordinates(db: Session, manager_id: UUID, scope: str = 'direct') -> List[models.Employee]:
+    return repo_list_subordinates(db, str(manager_id), scope)
 
-def _get_month_info(db: Session, year: int, month: int) -> models.MonthInfo:
+def _get_month_info(db: Session, year: int, month: int) -> MonthRef:
     return repo_get_month_info_by_year_month(db, year, month)
 
-def _get_summary(db: Session, manager_id: UUID, year: int, month: int):
-    return repo_aggregate_employee_month_summary(db, str(manager_id), year, month)
-
-
-def generate_manager_csv(db: Session, manager_id: UUID, year: int, month: int, include_bonuses: bool = True) -> models.ReportFile:
-    manager = _get_manager(db, manager_id)
-    subs = _get_subordinates(db, manager_id)
-    month_info = _get_month_info(db, year, month)
-    summary_rows = _get_summary(db, manager_id, year, month)
-
-    headers = ["employee_id","first_name","last_name","cnp","gross_salary_month","base_salary","bonus_total","adjustment_total","working_days","vacation_days"]
-    rows = []
-    for row in summary_rows:
-        bonus_total = row['bonus_total'] if include_bonuses else 0.0
-        adjustment_total = row['adjustment_total']
-        gross_salary = row['base_salary'] + bonus_total + adjustment_total
-        rows.append([
-            row['employee_id'], row['first_name'], row['last_name'], row['cnp'],
-            f"{gross_salary:.2f}", f"{row['base_salary']:.2f}", f"{bonus_total:.2f}", f"{adjustment_total:.2f}", month_info.working_days, row['vacation_days']
-        ])
-
-    # Directory and file path
-    dir_path = os.path.join(BASE_REPORT_DIR, 'csv', f"{year}-{month:02d}")
-    ensure_dir(dir_path)
-    file_path = os.path.join(dir_path, f"{manager_id}.csv")
-    write_csv(file_path, headers, rows)
-
-    # Load bytes for inline storage
-    with open(file_path, 'rb') as f:
-        content_bytes = f.read()
-    report = repo_create_report_file(db, path=file_path, type='csv', owner_id=manager_id, archived=False, content=content_bytes)
+def _get_summary(db: Session, manager_id: UUID, year: int, month: int, scope: str = 'direct'):
+    return repo_aggregate_employee_month_summary(db, str(manager_id), year, month, scope)
+
+def _store_report_file(db: Session, path: str, file_type: str, owner_id: UUID, content: bytes, archived: bool = False, fingerprint: str | None = None) -> models.ReportFile:
+    """Put bytes in the blob store and upsert the ReportFile row referencing their digest."""
+    ref = get_blob_store().put(content)
+    return repo_create_report_file(db, path=path, type=file_type, owner_id=owner_id, archived=archived, content_sha256=ref.digest, size_bytes=ref.size, fingerprint=fingerprint)
+
+def _store_report_zip(db: Session, path: str, owner_id: UUID, entries: Iterable[Tuple[str, ZipContent]], archived: bool = False) -> models.ReportFile:
+    """Stream a ZIP bundle straight into the blob store (hashed and sized while writing)."""
+    with get_blob_store().writer() as sink:
+        write_zip(sink, entries)
+    ref = sink.ref
+    return repo_create_report_file(db, path=path, type='zip', owner_id=owner_id, archived=archived, content_sha256=ref.digest, size_bytes=ref.size)
+
+def _read_report_bytes(report: models.ReportFile) -> bytes | None:
+    """Return a report's bytes from the blob store, legacy inline content, or legacy disk file."""
+    if report.content_sha256:
+        return get_blob_store().get(report.content_sha256)
+    if report.content is not None:
+        return report.content
+    if os.path.exists(report.path):
+        with open(report.path, 'rb') as f:
+            return f.read()
+    return None
+
+def _archive_report(db: Session, report: models.ReportFile, archive_path: str) -> models.ReportFile:
+    """Mark a report archived under its archive path; the blob itself is shared, not copied."""
+    return repo_move_report_file(db, str(report.id), archive_path, archived=True)
+
+
+class ReportPerson(NamedTuple):
+    """Plain copy of the employee columns a report run reads."""
+    id: UUID
+    email: str
+    first_name: str
+    last_name: str
+    cnp: str
+    hire_date: date
+    base_salary: float
+    manager_id: UUID | None
+
+    @classmethod
+    def of(cls, e: models.Employee) -> "ReportPerson":
+        return cls(e.id, e.email, e.first_name, e.last_name, e.cnp, e.hire_date, e.base_salary, e.manager_id)
+
+
+class ReportContext:
+    """Everything one manager/month report run reads, each piece loaded at most once.
+
+    The manager (404 when missing) and the change-tracker state are read up front, the state
+    before any report data so a concurrent write keeps the output dirty. The team, month info
+    and summary load on first use, so a run that reuses its stored output never queries them.
+    Every report-file write commits, which expires ORM rows; people are therefore kept as
+    ReportPerson snapshots instead of being re-SELECTed one by one while slips are mailed.
+    """
+
+    def __init__(self, db: Session, manager_id: UUID, year: int, month: int, scope: str = 'direct'):
+        self.db = db
+        self.manager_id = manager_id
+        self.year = year
+        self.month = month
+        self.scope = scope
+        # Subtree runs span many managers' tracked months, so only direct runs use the tracker
+        self.tracked = scope == 'direct'
+        self.manager = ReportPerson(*_get_manager(db, manager_id))
+        state = repo_get_manager_month_state(db, str(manager_id), year, month)
+        self.version = data_version(state)
+        self._current = {artifact: self.tracked and report_is_current(state, artifact) for artifact in ('csv', 'pdfs')}
+
+    def is_current(self, artifact: str) -> bool:
+        """True when the stored ``artifact`` ('csv'/'pdfs') was generated from the current data."""
+        return self._current[artifact]
+
+    @cached_property
+    def employees(self) -> List[ReportPerson]:
+        return [ReportPerson.of(e) for e in _get_subordinates(self.db, self.manager_id, self.scope)]
+
+    @cached_property
+    def working_days(self) -> int:
+        return _get_month_info(self.db, self.year, self.month).working_days
+
+    @cached_property
+    def summary(self) -> list:
+        return _get_summary(self.db, self.manager_id, self.year, self.month, self.scope)
+
+
+def _generate_manager_csv(ctx: ReportContext, include_bonuses: bool = True) -> Tuple[models.ReportFile, bytes]:
+    """Build the manager's CSV, reusing the stored one when the month's data is unchanged.
+
+    Only the default (bonuses included) direct-reports variant is tracked; the other
+    always regenerates and clears the record since it overwrites the same path. Subtree
+    CSVs are always rebuilt (one query).
+    """
+    db = ctx.db
+    file_path = manager_csv_path(ctx.manager_id, ctx.year, ctx.month, ctx.scope)
+    # Read first: a month without info (e.g. deleted) is a 400 even if its CSV is still stored
+    working_days = ctx.working_days
+    if include_bonuses and ctx.is_current('csv'):
+        existing = repo_get_report_file_by_path(db, file_path)
+        if blob_available(existing):
+            return existing, get_blob_store().get(existing.content_sha256)
+
+    content = manager_csv_content(ctx.summary, working_days, include_bonuses, with_manager=not ctx.tracked)
+
+    # Logical path (period/owner key); bytes live in the blob store
+    report = _store_report_file(db, file_path, 'csv', ctx.manager_id, content)
+    if ctx.tracked:
+        repo_record_manager_month_generated(db, ctx.year, ctx.month, 'csv', {ctx.manager_id: ctx.version if include_bonuses else None})
+    return report, content
+
+
+def generate_manager_csv(db: Session, manager_id: UUID, year: int, month: int, include_bonuses: bool = True, scope: str = 'direct') -> models.ReportFile:
+    report, _ = _generate_manager_csv(ReportContext(db, manager_id, year, month, scope), include_bonuses=include_bonuses)
     return report
 
 
-def generate_manager_csv_idempotent(db: Session, manager_id: UUID, year: int, month: int, include_bonuses: bool = True, idempotency_key: str | None = None) -> dict:
+def generate_manager_csv_idempotent(db: Session, manager_id: UUID, year: int, month: int, include_bonuses: bool = True, idempotency_key: str | None = None, scope: str = 'direct') -> dict:
     """Idempotent wrapper for generate_manager_csv.
 
     Returns a dict mirroring previous createAggregatedEmployeeData response plus idempotency metadata.
     """
-    endpoint_sig = f"generate_manager_csv:{manager_id}:{year}-{month:02d}:bonuses{int(include_bonuses)}"
+    endpoint_sig = f"generate_manager_csv{scope_suffix(scope)}:{manager_id}:{year}-{month:02d}:bonuses{int(include_bonuses)}"
     if idempotency_key:
         key_obj = repo_get_idempotency_key_by_key(db, idempotency_key)
         if key_obj:
@@ -89,7 +199,7 @@ def generate_manager_csv_idempotent(db: Session, manager_id: UUID, year: int, mo
                 raise HTTPException(status_code=409, detail="Operation already in progress")
         else:
             repo_create_idempotency_key(db, key=idempotency_key, endpoint=endpoint_sig, status='started')
-    report = generate_manager_csv(db, manager_id, year, month, include_bonuses=include_bonuses)
+    report = generate_manager_csv(db, manager_id, year, month, include_bonuses=include_bonuses, scope=scope)
     if idempotency_key:
         key_obj = repo_get_idempotency_key_by_key(db, idempotency_key)
         if key_obj:
@@ -97,11 +207,11 @@ def generate_manager_csv_idempotent(db: Session, manager_id: UUID, year: int, mo
     return {"status": "generated", "fileId": str(report.id), "filePath": report.path, "archived": report.archived, "idempotent": bool(idempotency_key)}
 
 
-def send_manager_csv(db: Session, manager_id: UUID, year: int, month: int, idempotency_key: str | None = None) -> dict:
+def send_manager_csv(db: Session, manager_id: UUID, year: int, month: int, idempotency_key: str | None = None, scope: str = 'direct', progress=None) -> dict:
     # Idempotency check
     if idempotency_key:
         key_obj = repo_get_idempotency_key_by_key(db, idempotency_key)
-        endpoint_sig = f"send_manager_csv:{manager_id}:{year}-{month:02d}"
+        endpoint_sig = f"send_manager_csv{scope_suffix(scope)}:{manager_id}:{year}-{month:02d}"
         if key_obj:
             # If same endpoint and succeeded, return cached reference
             if key_obj.endpoint == endpoint_sig and key_obj.status == 'succeeded':
@@ -113,28 +223,22 @@ def send_manager_csv(db: Session, manager_id: UUID, year: int, month: int, idemp
             # Create started record
             repo_create_idempotency_key(db, key=idempotency_key, endpoint=endpoint_sig, status='started')
 
-    report = generate_manager_csv(db, manager_id, year, month)
-    manager = _get_manager(db, manager_id)
-    # Dev/local send uses forced MailHog settings via send_email_dev
-    send_email_dev(manager.email, f"Monthly CSV {year}-{month:02d}", "Attached CSV report", [report.path])
+    ctx = ReportContext(db, manager_id, year, month, scope)
+    report, content = _generate_manager_csv(ctx)
+    # Dev/local send uses forced MailHog settings via send_many_dev
+    dispatch = _send_manager_csv_once(ctx, report, content, send_many_dev, progress)
 
-    archive_dir = os.path.join(BASE_REPORT_DIR, 'archives', f"{year}-{month:02d}")
-    ensure_dir(archive_dir)
-    archive_path = os.path.join(archive_dir, os.path.basename(report.path))
-    try:
-        shutil.copy2(report.path, archive_path)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to archive CSV: {e}")
-    report = repo_update_report_file(db, str(report.id), archived=True, path=archive_path)
+    archive_path = os.path.join(BASE_REPORT_DIR, 'archives', f"{year}-{month:02d}", os.path.basename(report.path))
+    report = _archive_report(db, report, archive_path)
 
     if idempotency_key:
         key_obj = repo_get_idempotency_key_by_key(db, idempotency_key)
         if key_obj:
             repo_mark_idempotency_key_succeeded(db, key_obj, result_path=archive_path)
-    return {"status":"sent","fileId": str(report.id), "archived": True, "archivePath": archive_path, "idempotent": bool(idempotency_key)}
+    return {"status":"sent","sent": dispatch.delivered, "alreadySent": 1 - len(dispatch.results), "dispatch": dispatch.stats(), "fileId": str(report.id), "archived": True, "archivePath": archive_path, "idempotent": bool(idempotency_key)}
 
 
-def send_manager_csv_live(db: Session, manager_id: UUID, year: int, month: int, idempotency_key: str | None = None) -> dict:
+def send_manager_csv_live(db: Session, manager_id: UUID, year: int, month: int, idempotency_key: str | None = None, scope: str = 'direct', progress=None) -> dict:
     """Live (production) variant of send_manager_csv.
 
     Safeguards:
@@ -142,13 +246,9 @@ def send_manager_csv_live(db: Session, manager_id: UUID, year: int, month: int,
     - Requires TLS or SMTP auth credentials to help prevent misconfiguration.
     Idempotency uses distinct endpoint signature to avoid collisions with dev variant.
     """
-    from core.settings import settings
-    if settings.SMTP_HOST in {"localhost", "127.0.0.1"}:
-        raise HTTPException(status_code=400, detail="SMTP_HOST points to localhost; configure real SMTP before using live endpoint.")
-    if not settings.SMTP_TLS and not (settings.SMTP_USERNAME and settings.SMTP_PASSWORD):
-        raise HTTPException(status_code=400, detail="Production sending requires TLS or SMTP auth credentials.")
+    require_live_smtp_settings()
 
-    endpoint_sig = f"send_manager_csv_live:{manager_id}:{year}-{month:02d}"
+    endpoint_sig = f"send_manager_csv_live{scope_suffix(scope)}:{manager_id}:{year}-{month:02d}"
     if idempotency_key:
         key_obj = repo_get_idempotency_key_by_key(db, idempotency_key)
         if key_obj:
@@ -159,37 +259,51 @@ def send_manager_csv_live(db: Session, manager_id: UUID, year: int, month: int,
         else:
             repo_create_idempotency_key(db, key=idempotency_key, endpoint=endpoint_sig, status='started')
 
-    report = generate_manager_csv(db, manager_id, year, month)
-    manager = _get_manager(db, manager_id)
-    send_email(manager.email, f"Monthly CSV {year}-{month:02d}", "Attached CSV report", [report.path])
+    ctx = ReportContext(db, manager_id, year, month, scope)
+    report, content = _generate_manager_csv(ctx)
+    dispatch = _send_manager_csv_once(ctx, report, content, send_many, progress)
 
-    archive_dir = os.path.join(BASE_REPORT_DIR, 'archives', f"{year}-{month:02d}")
-    ensure_dir(archive_dir)
-    archive_path = os.path.join(archive_dir, os.path.basename(report.path))
-    try:
-        shutil.copy2(report.path, archive_path)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to archive CSV: {e}")
-    report = repo_update_report_file(db, str(report.id), archived=True, path=archive_path)
+    archive_path = os.path.join(BASE_REPORT_DIR, 'archives', f"{year}-{month:02d}", os.path.basename(report.path))
+    report = _archive_report(db, report, archive_path)
 
     if idempotency_key:
         key_obj = repo_get_idempotency_key_by_key(db, idempotency_key)
         if key_obj:
             repo_mark_idempotency_key_succeeded(db, key_obj, result_path=archive_path)
-    return {"status":"sent_live","fileId": str(report.id), "archived": True, "archivePath": archive_path, "idempotent": bool(idempotency_key)}
+    return {"status":"sent_live","sent": dispatch.delivered, "alreadySent": 1 - len(dispatch.results), "dispatch": dispatch.stats(), "fileId": str(report.id), "archived": True, "archivePath": archive_path, "idempotent": bool(idempotency_key)}
 
 
-def generate_employee_pdfs(db: Session, manager_id: UUID, year: int, month: int, overwrite: bool=False) -> dict:
-    manager = _get_manager(db, manager_id)
-    subs = _get_subordinates(db, manager_id)
-    month_info = _get_month_info(db, year, month)
-    if not subs:
-        return {"generated":0, "fileIds": []}
-    summary_rows = _get_summary(db, manager_id, year, month)
+def _generate_employee_pdfs(ctx: ReportContext, overwrite: bool=False, progress=None) -> Tuple[dict, List[Tuple[ReportPerson, SlipFile, bytes | None]]]:
+    """Generate (or reuse) one slip per subordinate.
 
-    file_ids = []
+    Returns the API result plus (employee, slip file, bytes) for every slip; bytes are None
+    for reused slips and are read from storage on demand. While the manager's month data is
+    unchanged every stored slip is reused; otherwise only slips whose render input
+    (fingerprint) differs are rendered again. ``overwrite`` re-renders everything.
+    ``progress`` (a jobs_service.JobProgress) counts slips when the call runs as a
+    background job. Subtree runs rely on fingerprints alone since the tracked versions
+    are per direct team. Existing slips are looked up in one query and rendered ones are
+    written with one bulk upsert, not one round trip per employee.
+    """
+    db, year, month = ctx.db, ctx.year, ctx.month
+    unchanged = not overwrite and ctx.is_current('pdfs')
+    subs = ctx.employees
+    working_days = ctx.working_days
+    if not subs:
+        return {"generated":0, "fileIds": []}, []
+    if progress is not None:
+        progress.set_total(len(subs))
+    # Each slip names the employee's own manager: the root or someone else in the subtree
+    managers = {ctx.manager.id: ctx.manager, **{e.id: e for e in subs}}
+    pdf_paths = {e.id: employee_pdf_path(e.id, year, month) for e in subs}
+    stored = {} if overwrite else repo_list_report_files_by_paths(db, list(pdf_paths.values()))
+
+    slips: List[Tuple[ReportPerson, SlipFile, bytes | None]] = []
     # Map summary by employee_id for quick lookup
-    summary_map = {r['employee_id']: r for r in summary_rows}
+    summary_map = {r['employee_id']: r for r in ctx.summary}
+    # Gather payloads first so rendering can be fanned out across processes
+    pending: List[Tuple[ReportPerson, str, str]] = []
+    payloads = []
     for e in subs:
         data = summary_map.get(str(e.id), None)
         if not data:
@@ -202,45 +316,49 @@ def generate_employee_pdfs(db: Session, manager_id: UUID, year: int, month: int,
             adjustment_total = data['adjustment_total']
             vacation_days = data['vacation_days']
             base_salary = data['base_salary']
-        gross_salary = base_salary + bonus_total + adjustment_total
-        dir_path = os.path.join(BASE_REPORT_DIR, 'pdf', f"{year}-{month:02d}")
-        ensure_dir(dir_path)
-        pdf_path = os.path.join(dir_path, f"{e.id}.pdf")
-        if not overwrite and os.path.exists(pdf_path):
-            # Already exists; inline its content if we create a record now
-            with open(pdf_path, 'rb') as f:
-                pdf_bytes = f.read()
-            report = repo_create_report_file(db, path=pdf_path, type='pdf', owner_id=e.id, archived=False, content=pdf_bytes)
-            file_ids.append(str(report.id))
+        pdf_path = pdf_paths[e.id]
+        existing = stored.get(pdf_path)
+        if unchanged and blob_available(existing):
+            slips.append((e, SlipFile.of(existing), None))
             continue
-        build_salary_pdf(pdf_path, {
-            'year': year,
-            'month': month,
-            'employee_id': str(e.id),
-            'name': f"{e.first_name} {e.last_name}",
-            'cnp': e.cnp,
-            'hire_date': e.hire_date,
-            'manager_name': f"{manager.first_name} {manager.last_name}",
-            'base_salary': f"{base_salary:.2f}",
-            'bonus_total': f"{bonus_total:.2f}",
-            'adjustment_total': f"{adjustment_total:.2f}",
-            'gross_salary': f"{gross_salary:.2f}",
-            'working_days': month_info.working_days,
-            'vacation_days': vacation_days,
-        })
-        with open(pdf_path, 'rb') as f:
-            pdf_bytes = f.read()
-        report = repo_create_report_file(db, path=pdf_path, type='pdf', owner_id=e.id, archived=False, content=pdf_bytes)
-        file_ids.append(str(report.id))
-    return {"generated": len(file_ids), "fileIds": file_ids}
-
-
-def generate_employee_pdfs_idempotent(db: Session, manager_id: UUID, year: int, month: int, overwrite: bool=False, idempotency_key: str | None = None) -> dict:
+        boss = managers.get(e.manager_id, ctx.manager)
+        payload = slip_payload(
+            year, month, e.id, f"{e.first_name} {e.last_name}", e.cnp, e.hire_date,
+            f"{boss.first_name} {boss.last_name}", base_salary, bonus_total, adjustment_total,
+            working_days, vacation_days,
+        )
+        fingerprint = slip_fingerprint(payload)
+        if existing is not None and existing.fingerprint == fingerprint and blob_available(existing):
+            slips.append((e, SlipFile.of(existing), None))
+            continue
+        pending.append((e, pdf_path, fingerprint))
+        payloads.append(payload)
+    if progress is not None:
+        progress.advance(done=len(slips))
+    reused = len(slips)
+    batch = render_salary_pdfs(payloads)
+    stored = store_report_files(db, [(pdf_path, 'pdf', e.id, slip.content, fingerprint) for (e, pdf_path, fingerprint), slip in zip(pending, batch.slips)])
+    for (e, pdf_path, _), slip in zip(pending, batch.slips):
+        slips.append((e, stored[pdf_path], slip.content))
+    if progress is not None:
+        progress.advance(done=len(pending))
+    if ctx.tracked:
+        repo_record_manager_month_generated(db, year, month, 'pdfs', {ctx.manager_id: ctx.version})
+    file_ids = [str(slip_file.id) for _, slip_file, _ in slips]
+    return {"generated": len(file_ids), "rendered": len(pending), "reused": reused, "fileIds": file_ids, "render": batch.stats()}, slips
+
+
+def generate_employee_pdfs(db: Session, manager_id: UUID, year: int, month: int, overwrite: bool=False, progress=None, scope: str = 'direct') -> dict:
+    result, _ = _generate_employee_pdfs(ReportContext(db, manager_id, year, month, scope), overwrite=overwrite, progress=progress)
+    return result
+
+
+def generate_employee_pdfs_idempotent(db: Session, manager_id: UUID, year: int, month: int, overwrite: bool=False, idempotency_key: str | None = None, progress=None, scope: str = 'direct') -> dict:
     """Idempotent wrapper for generate_employee_pdfs.
 
     We do not archive at generation time; cached responses omit fileIds re-scan for simplicity.
     """
-    endpoint_sig = f"generate_employee_pdfs:{manager_id}:{year}-{month:02d}:overwrite{int(overwrite)}"
+    endpoint_sig = f"generate_employee_pdfs{scope_suffix(scope)}:{manager_id}:{year}-{month:02d}:overwrite{int(overwrite)}"
     if idempotency_key:
         key_obj = repo_get_idempotency_key_by_key(db, idempotency_key)
         if key_obj:
@@ -251,7 +369,7 @@ def generate_employee_pdfs_idempotent(db: Session, manager_id: UUID, year: int,
                 raise HTTPException(status_code=409, detail="Operation already in progress")
         else:
             repo_create_idempotency_key(db, key=idempotency_key, endpoint=endpoint_sig, status='started')
-    result = generate_employee_pdfs(db, manager_id, year, month, overwrite=overwrite)
+    result = generate_employee_pdfs(db, manager_id, year, month, overwrite=overwrite, progress=progress, scope=scope)
     if idempotency_key:
         key_obj = repo_get_idempotency_key_by_key(db, idempotency_key)
         if key_obj:
@@ -261,10 +379,89 @@ def generate_employee_pdfs_idempotent(db: Session, manager_id: UUID, year: int,
     return result
 
 
-def send_employee_pdfs(db: Session, manager_id: UUID, year: int, month: int, regenerate_missing: bool=False, idempotency_key: str | None = None) -> dict:
+def _collect_slip_emails(slips, year: int, month: int):
+    """Build one slip email per employee with available bytes, plus the ZIP entries, slip files and recipient ids."""
+    emails: List[OutgoingEmail] = []
+    attachments = []
+    sent_reports = []
+    recipient_ids = []
+    for e, report, content in slips:
+        if content is None:
+            content = _read_report_bytes(report)
+        if content is not None:
+            filename = os.path.basename(report.path)
+            emails.append(OutgoingEmail(e.email, f"Salary Slip {year}-{month:02d}", "Attached PDF salary slip", [(filename, content)]))
+            attachments.append((filename, content))
+            sent_reports.append(report)
+            recipient_ids.append(e.id)
+    return emails, attachments, sent_reports, recipient_ids
+
+
+def _sent_recipients(progress) -> set:
+    """Recipients a previous attempt of the job already mailed (see ``_checkpoint_sent``)."""
+    return set(progress.checkpoint.get('sent', [])) if progress is not None else set()
+
+
+def _checkpoint_sent(progress, recipient_ids) -> None:
+    """Record delivered recipients on the job right after sending, before the archive/ZIP steps.
+
+    A retry triggered by a later step then skips them instead of mailing them twice.
+    """
+    if progress is None:
+        return
+    sent = _sent_recipients(progress) | {str(r) for r in recipient_ids}
+    progress.save_checkpoint({**progress.checkpoint, 'sent': sorted(sent)})
+
+
+def _send_slips_once(emails: List[OutgoingEmail], recipient_ids: List[UUID], send_fn, progress=None):
+    """Send each slip email unless a previous attempt already delivered it.
+
+    Returns this attempt's dispatch report and, per email, whether its recipient now has the slip.
+    """
+    already = _sent_recipients(progress)
+    pending = [i for i, rid in enumerate(recipient_ids) if str(rid) not in already]
+    if progress is not None:
+        progress.set_total(len(emails))
+        progress.advance(done=len(emails) - len(pending))
+    dispatch = send_fn([emails[i] for i in pending], on_result=progress.record_send if progress is not None else None)
+    delivered = [str(rid) in already for rid in recipient_ids]
+    for i, result in zip(pending, dispatch.results):
+        delivered[i] = result.ok
+    if dispatch.delivered:
+        _checkpoint_sent(progress, [recipient_ids[i] for i, r in zip(pending, dispatch.results) if r.ok])
+    return dispatch, delivered
+
+
+def _send_manager_csv_once(ctx: ReportContext, report: models.ReportFile, content: bytes, send_fn, progress=None):
+    """Mail the CSV to the manager unless a previous attempt already did; returns the dispatch report.
+
+    A failed send raises (502) before anything is checkpointed or archived, so the job
+    records the failure and a retry sends again.
+    """
+    if str(ctx.manager_id) in _sent_recipients(progress):
+        return DispatchReport()
+    email = OutgoingEmail(ctx.manager.email, f"Monthly CSV {ctx.year}-{ctx.month:02d}", "Attached CSV report", [(os.path.basename(report.path), content)])
+    dispatch = send_fn([email])
+    if not dispatch.delivered:
+        errors = "; ".join(f"{r['to']}: {r['error']}" for r in dispatch.failures())
+        raise HTTPException(status_code=502, detail=f"Sending the CSV to the manager failed ({errors})")
+    _checkpoint_sent(progress, [ctx.manager_id])
+    return dispatch
+
+
+def _archive_slips(db: Session, slip_files: List[SlipFile], archive_dir: str) -> int:
+    """Archive delivered slips with one bulk move; a failure leaves them unarchived (mail already went out)."""
+    try:
+        return repo_move_report_files(db, {f.path: os.path.join(archive_dir, os.path.basename(f.path)) for f in slip_files}, archived=True)
+    except Exception:
+        db.rollback()
+        return 0
+
+
+def send_employee_pdfs(db: Session, manager_id: UUID, year: int, month: int, regenerate_missing: bool=False, idempotency_key: str | None = None, progress=None, scope: str = 'direct') -> dict:
     if idempotency_key:
         key_obj = repo_get_idempotency_key_by_key(db, idempotency_key)
-        endpoint_sig = f"send_employee_pdfs:{manager_id}:{year}-{month:02d}"
+        endpoint_sig = f"send_employee_pdfs{scope_suffix(scope)}:{manager_id}:{year}-{month:02d}"
         if key_obj:
             if key_obj.endpoint == endpoint_sig and key_obj.status == 'succeeded':
                 return {"status": "cached", "idempotent": True, "archiveZipPath": key_obj.result_path}
@@ -273,46 +470,25 @@ def send_employee_pdfs(db: Session, manager_id: UUID, year: int, month: int, reg
         else:
             repo_create_idempotency_key(db, key=idempotency_key, endpoint=endpoint_sig, status='started')
 
-    gen = generate_employee_pdfs(db, manager_id, year, month, overwrite=regenerate_missing)
-    manager = _get_manager(db, manager_id)
-    subs = _get_subordinates(db, manager_id)
-    sent = 0
-    pdf_paths = []
-    for e in subs:
-        pdf_path = os.path.join(BASE_REPORT_DIR, 'pdf', f"{year}-{month:02d}", f"{e.id}.pdf")
-        if os.path.exists(pdf_path):
-            # Dev/local send uses MailHog override
-            send_email_dev(e.email, f"Salary Slip {year}-{month:02d}", "Attached PDF salary slip", [pdf_path])
-            pdf_paths.append(pdf_path)
-            sent += 1
+    gen, slips = _generate_employee_pdfs(ReportContext(db, manager_id, year, month, scope), overwrite=regenerate_missing)
+    emails, attachments, sent_reports, recipient_ids = _collect_slip_emails(slips, year, month)
+    # Dev/local send uses MailHog override; one pooled connection serves the whole batch
+    dispatch, delivered = _send_slips_once(emails, recipient_ids, send_many_dev, progress)
+    # Only slips that actually reached the recipient are archived and bundled
+    attachments = [a for a, ok in zip(attachments, delivered) if ok]
+    sent_reports = [r for r, ok in zip(sent_reports, delivered) if ok]
     archive_root = os.path.join(BASE_REPORT_DIR, 'archives', f"{year}-{month:02d}")
-    archive_pdfs_dir = os.path.join(archive_root, 'pdfs')
-    ensure_dir(archive_pdfs_dir)
-    archived_count = 0
-    # repo_get_report_file_by_path, repo_update_report_file imported at top
-    for p in pdf_paths:
-        archive_path = os.path.join(archive_pdfs_dir, os.path.basename(p))
-        try:
-            shutil.copy2(p, archive_path)
-            archived_count += 1
-            report_rec = repo_get_report_file_by_path(db, p)
-            if report_rec:
-                repo_update_report_file(db, str(report_rec.id), archived=True, path=archive_path)
-        except Exception:
-            pass
-    zip_path = os.path.join(archive_root, f"{manager_id}_pdfs.zip")
-    zip_paths(pdf_paths, zip_path)
-    with open(zip_path, 'rb') as f:
-        zip_bytes = f.read()
-    archive_report = repo_create_report_file(db, path=zip_path, type='zip', owner_id=manager_id, archived=True, content=zip_bytes)
+    archived_count = _archive_slips(db, sent_reports, os.path.join(archive_root, 'pdfs'))
+    zip_path = os.path.join(archive_root, f"{manager_id}{scope_suffix(scope)}_pdfs.zip")
+    archive_report = _store_report_zip(db, zip_path, manager_id, attachments, archived=True)
     if idempotency_key:
         key_obj = repo_get_idempotency_key_by_key(db, idempotency_key)
         if key_obj:
             repo_mark_idempotency_key_succeeded(db, key_obj, result_path=zip_path)
-    return {"sent": sent, "archivedPdfs": archived_count, "archiveZipId": str(archive_report.id), "archiveZipPath": zip_path, "idempotent": bool(idempotency_key)}
+    return {"sent": dispatch.delivered, "alreadySent": len(emails) - len(dispatch.results), "failed": dispatch.failed, "failures": dispatch.failures(), "dispatch": dispatch.stats(), "archivedPdfs": archived_count, "archiveZipId": str(archive_report.id), "archiveZipPath": zip_path, "idempotent": bool(idempotency_key)}
 
 
-def send_employee_pdfs_live(db: Session, manager_id: UUID, year: int, month: int, regenerate_missing: bool=False, idempotency_key: str | None = None) -> dict:
+def send_employee_pdfs_live(db: Session, manager_id: UUID, year: int, month: int, regenerate_missing: bool=False, idempotency_key: str | None = None, progress=None, scope: str = 'direct') -> dict:
 
     """Send employee PDFs using production SMTP settings instead of local MailHog.
 
@@ -323,14 +499,10 @@ def send_employee_pdfs_live(db: Session, manager_id: UUID, year: int, month: int
 
     Idempotency behaviour mirrors the original implementation (different endpoint signature).
     """
-    from core.settings import settings
-    if settings.SMTP_HOST in {"localhost", "127.0.0.1"}:
-        raise HTTPException(status_code=400, detail="SMTP_HOST points to localhost; configure real SMTP before using live endpoint.")
-    if not settings.SMTP_TLS and not (settings.SMTP_USERNAME and settings.SMTP_PASSWORD):
-        raise HTTPException(status_code=400, detail="Production sending requires TLS or SMTP auth credentials.")
+    require_live_smtp_settings()
 
     # Idempotency check (distinct endpoint signature to avoid collision with dev/local endpoint)
-    endpoint_sig = f"send_employee_pdfs_live:{manager_id}:{year}-{month:02d}"
+    endpoint_sig = f"send_employee_pdfs_live{scope_suffix(scope)}:{manager_id}:{year}-{month:02d}"
     if idempotency_key:
         key_obj = repo_get_idempotency_key_by_key(db, idempotency_key)
         if key_obj:
@@ -342,40 +514,19 @@ def send_employee_pdfs_live(db: Session, manager_id: UUID, year: int, month: int
             repo_create_idempotency_key(db, key=idempotency_key, endpoint=endpoint_sig, status='started')
 
     # Re-use existing logic: we regenerate missing PDFs optionally
-    gen = generate_employee_pdfs(db, manager_id, year, month, overwrite=regenerate_missing)
-    manager = _get_manager(db, manager_id)
-    subs = _get_subordinates(db, manager_id)
-    sent = 0
-    pdf_paths = []
-    for e in subs:
-        pdf_path = os.path.join(BASE_REPORT_DIR, 'pdf', f"{year}-{month:02d}", f"{e.id}.pdf")
-        if os.path.exists(pdf_path):
-            # Same send_email, but at this point settings should be pointing to real SMTP
-            send_email(e.email, f"Salary Slip {year}-{month:02d}", "Attached PDF salary slip", [pdf_path])
-            pdf_paths.append(pdf_path)
-            sent += 1
+    gen, slips = _generate_employee_pdfs(ReportContext(db, manager_id, year, month, scope), overwrite=regenerate_missing)
+    emails, attachments, sent_reports, recipient_ids = _collect_slip_emails(slips, year, month)
+    # Same batch path, but at this point settings should be pointing to real SMTP
+    dispatch, delivered = _send_slips_once(emails, recipient_ids, send_many, progress)
+    # Only slips that actually reached the recipient are archived and bundled
+    attachments = [a for a, ok in zip(attachments, delivered) if ok]
+    sent_reports = [r for r, ok in zip(sent_reports, delivered) if ok]
     archive_root = os.path.join(BASE_REPORT_DIR, 'archives', f"{year}-{month:02d}")
-    archive_pdfs_dir = os.path.join(archive_root, 'pdfs')
-    ensure_dir(archive_pdfs_dir)
-    archived_count = 0
-    # repo_get_report_file_by_path, repo_update_report_file imported at top
-    for p in pdf_paths:
-        archive_path = os.path.join(archive_pdfs_dir, os.path.basename(p))
-        try:
-            shutil.copy2(p, archive_path)
-            archived_count += 1
-            report_rec = repo_get_report_file_by_path(db, p)
-            if report_rec:
-                repo_update_report_file(db, str(report_rec.id), archived=True, path=archive_path)
-        except Exception:
-            pass
-    zip_path = os.path.join(archive_root, f"{manager_id}_pdfs_live.zip")
-    zip_paths(pdf_paths, zip_path)
-    with open(zip_path, 'rb') as f:
-        zip_bytes = f.read()
-    archive_report = repo_create_report_file(db, path=zip_path, type='zip', owner_id=manager_id, archived=True, content=zip_bytes)
+    archived_count = _archive_slips(db, sent_reports, os.path.join(archive_root, 'pdfs'))
+    zip_path = os.path.join(archive_root, f"{manager_id}{scope_suffix(scope)}_pdfs_live.zip")
+    archive_report = _store_report_zip(db, zip_path, manager_id, attachments, archived=True)
     if idempotency_key:
         key_obj = repo_get_idempotency_key_by_key(db, idempotency_key)
         if key_obj:
             repo_mark_idempotency_key_succeeded(db, key_obj, result_path=zip_path)
-    return {"sent": sent, "archivedPdfs": archived_count, "archiveZipId": str(archive_report.id), "archiveZipPath": zip_path, "idempotent": bool(idempotency_key), "status": "sent_live"}
+    return {"sent": dispatch.delivered, "alreadySent": len(emails) - len(dispatch.results), "failed": dispatch.failed, "failures": dispatch.failures(), "dispatch": dispatch.stats(), "archivedPdfs": archived_count, "archiveZipId": str(archive_report.id), "archiveZipPath": zip_path, "idempotent": bool(idempotency_key), "status": "sent_live"}
@@ -0,0 +1,130 @@
+"""Report outputs shared by the per-manager report runs and the organisation-wide month close.
+
+Logical paths, CSV / slip content, bulk storage of the bytes and the change-tracker checks
+that decide whether stored output can be reused.
+"""
+import os
+from typing import Iterable, NamedTuple, Tuple
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from db import models
+from db.repositories.report_files_repo import repo_bulk_upsert_report_files
+from utils.blob_store import get_blob_store
+from utils.files import csv_bytes
+
+BASE_REPORT_DIR = "reports"
+
+MANAGER_CSV_HEADERS = ["employee_id","first_name","last_name","cnp","gross_salary_month","base_salary","bonus_total","adjustment_total","working_days","vacation_days"]
+
+
+def scope_suffix(scope: str) -> str:
+    """Distinguishes subtree reports (paths, idempotency signatures); direct keeps the historical names."""
+    return '' if scope == 'direct' else f"_{scope}"
+
+
+def manager_csv_path(manager_id, year: int, month: int, scope: str = 'direct') -> str:
+    return os.path.join(BASE_REPORT_DIR, 'csv', f"{year}-{month:02d}", f"{manager_id}{scope_suffix(scope)}.csv")
+
+
+def employee_pdf_path(employee_id, year: int, month: int) -> str:
+    return os.path.join(BASE_REPORT_DIR, 'pdf', f"{year}-{month:02d}", f"{employee_id}.pdf")
+
+
+def manager_csv_content(summary_rows, working_days: int, include_bonuses: bool = True, with_manager: bool = False) -> bytes:
+    """One line per employee; subtree reports add each employee's own ``manager_id``."""
+    rows = []
+    for row in summary_rows:
+        bonus_total = row['bonus_total'] if include_bonuses else 0.0
+        adjustment_total = row['adjustment_total']
+        gross_salary = row['base_salary'] + bonus_total + adjustment_total
+        rows.append([
+            row['employee_id'], row['first_name'], row['last_name'], row['cnp'],
+            f"{gross_salary:.2f}", f"{row['base_salary']:.2f}", f"{bonus_total:.2f}", f"{adjustment_total:.2f}", working_days, row['vacation_days']
+        ] + ([row['manager_id']] if with_manager else []))
+    return csv_bytes(MANAGER_CSV_HEADERS + (["manager_id"] if with_manager else []), rows)
+
+
+def slip_payload(year: int, month: int, employee_id, name: str, cnp: str, hire_date, manager_name: str, base_salary: float, bonus_total: float, adjustment_total: float, working_days: int, vacation_days: int) -> dict:
+    gross_salary = base_salary + bonus_total + adjustment_total
+    return {
+        'year': year,
+        'month': month,
+        'employee_id': str(employee_id),
+        'name': name,
+        'cnp': cnp,
+        'hire_date': hire_date,
+        'manager_name': manager_name,
+        'base_salary': f"{base_salary:.2f}",
+        'bonus_total': f"{bonus_total:.2f}",
+        'adjustment_total': f"{adjustment_total:.2f}",
+        'gross_salary': f"{gross_salary:.2f}",
+        'working_days': working_days,
+        'vacation_days': vacation_days,
+    }
+
+
+class SlipFile(NamedTuple):
+    """Plain copy of a slip's report row: enough to read its bytes and archive it."""
+    id: UUID
+    path: str
+    content_sha256: str | None
+    content: bytes | None = None
+
+    @classmethod
+    def of(cls, report: models.ReportFile) -> "SlipFile":
+        return cls(report.id, report.path, report.content_sha256)
+
+
+def store_report_files(db: Session, files: Iterable[Tuple[str, str, UUID, bytes, str | None]]) -> dict:
+    """Store ``(path, type, owner_id, content, fingerprint)`` entries.
+
+    Bytes go to the blob store first; the rows are then upserted in one transaction.
+    Returns path -> SlipFile.
+    """
+    store = get_blob_store()
+    records = []
+    for path, file_type, owner_id, content, fingerprint in files:
+        ref = store.put(content)
+        records.append({'path': path, 'type': file_type, 'owner_id': owner_id, 'content_sha256': ref.digest, 'size_bytes': ref.size, 'fingerprint': fingerprint})
+    if not records:
+        return {}
+    ids = repo_bulk_upsert_report_files(db, records)
+    return {r['path']: SlipFile(ids[r['path']], r['path'], r['content_sha256']) for r in records}
+
+
+def blob_available(report: models.ReportFile | None) -> bool:
+    return report is not None and bool(report.content_sha256) and get_blob_store().exists(report.content_sha256)
+
+
+def data_version(state: models.ManagerMonthState | None) -> int:
+    """Change-tracker version to stamp on output generated now (0 = never changed).
+
+    Read it before loading report data and keep the int: commits expire ``state``.
+    """
+    return state.data_version if state is not None else 0
+
+
+def report_is_current(state: models.ManagerMonthState | None, artifact: str) -> bool:
+    """True when ``artifact`` ('csv'/'pdfs') was generated from the manager's current month data."""
+    if state is None:
+        return False
+    version = getattr(state, f'{artifact}_version')
+    return version is not None and version >= state.data_version
+
+
+__all__ = [
+    "BASE_REPORT_DIR",
+    "MANAGER_CSV_HEADERS",
+    "SlipFile",
+    "blob_available",
+    "data_version",
+    "employee_pdf_path",
+    "manager_csv_content",
+    "manager_csv_path",
+    "report_is_current",
+    "scope_suffix",
+    "slip_payload",
+    "store_report_files",
+]
@@ -1,22 +1,127 @@
+import os
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Iterator
+from fastapi import HTTPException
 from sqlalchemy.orm import Session
 from db.repositories.report_files_repo import (
     repo_list_report_files,
+    repo_list_report_files_async,
     repo_get_report_file_by_id,
+    repo_get_report_file_by_id_async,
     repo_create_report_file,
     repo_update_report_file,
     repo_delete_report_file,
+    repo_get_inline_content_size,
+    repo_mark_inline_content_moved,
+    repo_read_inline_content_range,
 )
 from api.schemas import ReportFileCreate, ReportFileUpdate
+from utils.blob_store import CHUNK_SIZE, get_blob_store
+from utils.pagination import decode_cursor
 
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
 
-def get_report_files(db: Session):
-    return repo_list_report_files(db)
+MEDIA_MAP = {'csv': 'text/csv', 'pdf': 'application/pdf', 'zip': 'application/zip'}
+
+
+@dataclass
+class ReportDownload:
+    """Everything the download endpoint needs to answer full, ranged and conditional requests."""
+    filename: str
+    media_type: str
+    size: int
+    etag: str
+    read_range: Callable[[int, int], Iterator[bytes]]  # inclusive byte range -> chunks
+    local_path: str | None = None
+
+
+def get_report_files(db: Session, limit: int = 100, cursor: str | None = None, owner_id=None, file_type: str | None = None, archived: bool | None = None, period: str | None = None):
+    after = decode_cursor(cursor) if cursor else None
+    return repo_list_report_files(db, limit=limit, after=after, owner_id=owner_id, type=file_type, archived=archived, period=period)
+
+
+async def get_report_files_async(db: "AsyncSession", limit: int = 100, cursor: str | None = None, owner_id=None, file_type: str | None = None, archived: bool | None = None, period: str | None = None):
+    after = decode_cursor(cursor) if cursor else None
+    return await repo_list_report_files_async(db, limit=limit, after=after, owner_id=owner_id, type=file_type, archived=archived, period=period)
 
 
 def get_report_file_by_id(db: Session, report_id: str):
     return repo_get_report_file_by_id(db, report_id)
 
 
+async def get_report_file_by_id_async(db: "AsyncSession", report_id: str):
+    return await repo_get_report_file_by_id_async(db, report_id)
+
+
+def _move_inline_content(db: Session, report_id, size: int) -> None:
+    """Copy a legacy row's inline bytes into the blob store (chunked, hashed while writing).
+
+    Done once, on the first download: afterwards the row has ``content_sha256`` like every
+    other report, so later requests (and 304 revalidations) reuse the stored digest.
+    """
+    with get_blob_store().writer() as sink:
+        offset = 0
+        while offset < size:
+            chunk = repo_read_inline_content_range(db, report_id, offset, min(CHUNK_SIZE, size - offset))
+            if not chunk:
+                break
+            sink.write(chunk)
+            offset += len(chunk)
+    repo_mark_inline_content_moved(db, report_id, sink.ref.digest, sink.ref.size)
+
+
+def _iter_file(path: str, start: int, end: int) -> Iterator[bytes]:
+    with open(path, 'rb') as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = f.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def open_report_download(db: Session, report_id: str) -> ReportDownload:
+    """Resolve where a report's bytes live without loading them.
+
+    Order: blob store (strong ETag = SHA-256 digest), legacy inline content (moved into
+    the blob store first), legacy file on disk (weak ETag from mtime/size).
+    """
+    report = repo_get_report_file_by_id(db, report_id)
+    filename = os.path.basename(report.path)
+    media = report.content_type or MEDIA_MAP.get(report.type, 'application/octet-stream')
+    if not report.content_sha256:
+        inline_size = repo_get_inline_content_size(db, report.id)
+        if inline_size is not None:
+            _move_inline_content(db, report.id, inline_size)
+            report = repo_get_report_file_by_id(db, report_id)
+    if report.content_sha256:
+        store = get_blob_store()
+        digest = report.content_sha256
+        if not store.exists(digest):
+            raise HTTPException(status_code=404, detail='File not found')
+        local_path = store.local_path(digest)
+        size = report.size_bytes
+        if size is None:
+            size = os.path.getsize(local_path) if local_path else len(store.get(digest))
+        return ReportDownload(
+            filename=filename, media_type=media, size=size, etag=f'"{digest}"',
+            read_range=lambda start, end: store.iter_chunks(digest, start, end),
+            local_path=local_path,
+        )
+    if not os.path.exists(report.path):
+        raise HTTPException(status_code=404, detail='File not found')
+    stat = os.stat(report.path)
+    path = report.path
+    return ReportDownload(
+        filename=filename, media_type=media, size=stat.st_size, etag=f'W/"{int(stat.st_mtime)}-{stat.st_size}"',
+        read_range=lambda start, end: _iter_file(path, start, end),
+        local_path=path,
+    )
+
+
 def create_report_file(db: Session, report_in: ReportFileCreate):
     data = report_in.model_dump()
     return repo_create_report_file(db, **data)
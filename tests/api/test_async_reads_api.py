@@ -0,0 +1,61 @@
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app_factory import create_app
+from auth.deps import require_manager, require_manager_async
+from core.settings import settings
+from db import session as db_session
+from tests.conftest import DummyManager
+
+
+@pytest.fixture
+def async_client(monkeypatch):
+    monkeypatch.setattr(settings, 'DB_ASYNC_READS', True)
+    app = create_app()
+    app.dependency_overrides[require_manager] = lambda: DummyManager()
+    app.dependency_overrides[require_manager_async] = lambda: DummyManager()
+
+    async def _dummy_get_async_db():
+        yield object()
+
+    app.dependency_overrides[db_session.get_async_db] = _dummy_get_async_db
+    return TestClient(app)
+
+
+def test_async_employee_listing_takes_over_the_path(async_client):
+    rows = [{'id': uuid.uuid4(), 'created_at': datetime(2025, 8, 1, tzinfo=timezone.utc), 'email': 'a@example.com'}]
+    with patch('api.routers.employees.svc_list_employees_async', new=AsyncMock(return_value=rows)) as mock_async, \
+            patch('api.routers.employees.svc_list_employees') as mock_sync:
+        resp = async_client.get('/api/employees', params={'limit': 1, 'fields': 'email'})
+    assert resp.status_code == 200
+    assert resp.json() == [{'id': str(rows[0]['id']), 'createdAt': '2025-08-01T00:00:00Z', 'email': 'a@example.com'}]
+    assert 'X-Next-Cursor' in resp.headers
+    assert mock_async.await_args.kwargs['fields'] == 'email'
+    mock_sync.assert_not_called()
+
+
+def test_async_month_and_report_reads(async_client):
+    month = {'id': uuid.uuid4(), 'year': 2025, 'month': 8, 'working_days': 21}
+    with patch('api.routers.months.svc_get_month_by_id_async', new=AsyncMock(return_value=month)):
+        resp = async_client.get(f"/api/months/{month['id']}")
+    assert resp.json()['workingDays'] == 21
+    report_id = uuid.uuid4()
+    with patch('api.routers.reports.svc_get_report_file_by_id_async', new=AsyncMock(side_effect=lambda db, rid: {
+        'id': rid, 'path': 'reports/x.pdf', 'type': 'pdf', 'owner_id': uuid.uuid4(), 'created_at': datetime.now(timezone.utc),
+        'archived': False, 'content_type': None, 'size_bytes': 1,
+    })):
+        resp = async_client.get(f'/api/reports/{report_id}.pdf')
+    assert resp.json()['id'] == str(report_id)
+
+
+def test_write_endpoints_stay_on_the_sync_stack(async_client):
+    with patch('api.routers.employees.svc_delete_employee', return_value={'deleted': True, 'id': 'x'}) as mock_delete:
+        resp = async_client.delete('/api/employees/x')
+    assert resp.status_code == 200
+    mock_delete.assert_called_once()
+    operations = [op['operationId'] for path in async_client.get('/openapi.json').json()['paths'].values() for op in path.values()]
+    assert not [op for op in operations if op.endswith('_async')]
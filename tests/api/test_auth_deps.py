@@ -0,0 +1,100 @@
+import asyncio
+import uuid
+
+import pytest
+from fastapi import HTTPException
+
+from auth.deps import get_current_employee, get_current_employee_async, require_manager, require_manager_async
+from db.repositories import auth_repo
+from db.repositories.auth_repo import Principal, repo_forget_principals
+from utils.security import create_access_token
+
+
+@pytest.fixture
+def employees(monkeypatch):
+    """Fake employees table behind the principal cache: id -> (is_manager, is_active, token_version)."""
+    rows, loads = {}, []
+
+    def load(db, employee_id, token_version):
+        loads.append(employee_id)
+        row = rows.get(employee_id)
+        if row is None or not row[1] or row[2] != token_version:
+            return None
+        return Principal(uuid.UUID(employee_id), 'e@example.com', row[0], row[2])
+
+    monkeypatch.setattr(auth_repo, '_load_principal', load)
+    return rows, loads
+
+
+def _token(sub, **claims):
+    return create_access_token(sub, claims)
+
+
+def test_principal_is_cached_per_subject_and_version(employees):
+    rows, loads = employees
+    sub = str(uuid.uuid4())
+    rows[sub] = (True, True, 3)
+    token = _token(sub, ver=3)
+    first = get_current_employee(token, db=None)
+    assert get_current_employee(token, db=None) == first
+    assert loads == [sub]
+    assert require_manager(first) is first
+
+
+def test_stale_token_version_is_rejected(employees):
+    rows, _ = employees
+    sub = str(uuid.uuid4())
+    rows[sub] = (True, True, 1)
+    with pytest.raises(HTTPException) as exc:
+        get_current_employee(_token(sub, ver=0), db=None)
+    assert exc.value.status_code == 401
+
+
+def test_tokens_without_version_claim_count_as_version_zero(employees):
+    rows, _ = employees
+    sub = str(uuid.uuid4())
+    rows[sub] = (False, True, 0)
+    principal = get_current_employee(_token(sub), db=None)
+    with pytest.raises(HTTPException) as exc:
+        require_manager(principal)
+    assert exc.value.status_code == 403
+
+
+def test_forgotten_principal_is_reloaded(employees):
+    rows, loads = employees
+    sub = str(uuid.uuid4())
+    rows[sub] = (True, True, 0)
+    token = _token(sub, ver=0)
+    get_current_employee(token, db=None)
+    rows[sub] = (True, False, 0)
+    repo_forget_principals({sub: 0})
+    with pytest.raises(HTTPException):
+        get_current_employee(token, db=None)
+    assert loads == [sub, sub]
+
+
+def test_async_dependency_shares_the_cache_and_loads_only_on_a_miss(employees, monkeypatch):
+    rows, loads = employees
+    async_loads = []
+
+    async def load_async(db, employee_id, token_version):
+        async_loads.append(employee_id)
+        return auth_repo._load_principal(db, employee_id, token_version)
+
+    monkeypatch.setattr(auth_repo, '_load_principal_async', load_async)
+    cached, missing = str(uuid.uuid4()), str(uuid.uuid4())
+    rows[cached] = rows[missing] = (True, True, 0)
+    get_current_employee(_token(cached), db=None)
+
+    async def authenticate(sub):
+        return await require_manager_async(await get_current_employee_async(_token(sub), db=None))
+
+    assert asyncio.run(authenticate(cached)).id == uuid.UUID(cached)
+    assert asyncio.run(authenticate(missing)).id == uuid.UUID(missing)
+    assert asyncio.run(authenticate(missing)).id == uuid.UUID(missing)
+    assert async_loads == [missing]
+    rows[missing] = (False, True, 0)
+    repo_forget_principals({missing: 0})
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(authenticate(missing))
+    assert exc.value.status_code == 403
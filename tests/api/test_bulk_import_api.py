@@ -0,0 +1,41 @@
+from unittest.mock import patch
+
+RESULT = {'received': 2, 'inserted': 1, 'updated': 0, 'unchanged': 0, 'rejected': 1, 'rejects': [{'line': 3, 'error': 'Employee not found'}]}
+
+
+def test_bulk_salary_components_streams_body_to_service(client):
+    seen = {}
+
+    def fake_import(db, body, fmt):
+        seen['body'], seen['fmt'] = body.read(), fmt
+        return RESULT
+
+    with patch('api.routers.salary_components.svc_bulk_import_salary_components', side_effect=fake_import):
+        resp = client.post('/api/salary_components/bulk', content=b'employeeId,year\n', headers={'Content-Type': 'text/csv'})
+    assert resp.status_code == 200
+    assert resp.json()['rejects'] == [{'line': 3, 'error': 'Employee not found'}]
+    assert seen == {'body': b'employeeId,year\n', 'fmt': 'csv'}
+
+
+def test_bulk_vacations_accepts_ndjson(client):
+    with patch('api.routers.vacations.svc_bulk_import_vacations', return_value=RESULT) as mock_import:
+        resp = client.post('/api/vacations/bulk', content=b'{}\n', headers={'Content-Type': 'application/x-ndjson'})
+    assert resp.status_code == 200
+    assert resp.json()['inserted'] == 1
+    assert mock_import.call_args.args[2] == 'ndjson'
+
+
+def test_bulk_import_rejects_unknown_content_type(client):
+    with patch('api.routers.vacations.svc_bulk_import_vacations') as mock_import:
+        resp = client.post('/api/vacations/bulk', json=[{}])
+    assert resp.status_code == 415
+    mock_import.assert_not_called()
+
+
+def test_bulk_employees_returns_metrics(client):
+    result = {'received': 1, 'inserted': 1, 'updated': 0, 'rejected': 0, 'rejects': [], 'metrics': {'hashMs': 1.0, 'rowsPerSecond': 10.0}}
+    with patch('api.routers.employees.svc_import_employees', return_value=result) as mock_import:
+        resp = client.post('/api/employees/bulk', content=b'{}\n', headers={'Content-Type': 'application/x-ndjson'})
+    assert resp.status_code == 200
+    assert resp.json()['metrics']['rowsPerSecond'] == 10.0
+    assert mock_import.call_args.args[2] == 'ndjson'
@@ -2,7 +2,7 @@ import uuid
 from datetime import date, datetime
 from unittest.mock import patch
 
-from api.schemas import EmployeeResponse, EmployeeCreate, EmployeeUpdate
+from api.schemas import EmployeeResponse, EmployeeSubtreeResponse, EmployeeCreate, EmployeeUpdate
 
 # Helper to build fake employee dict matching EmployeeResponse
 def fake_employee(idx: int, manager_id=None):
@@ -30,6 +30,17 @@ def test_list_employees(client):
     assert len(data) == 3
     assert data[0]['email'].startswith('user0')
 
+def test_list_employees_forwards_filters_and_projection(client):
+    rows = [{'id': uuid.uuid4(), 'created_at': datetime(2025, 1, i + 1), 'first_name': f'F{i}'} for i in range(2)]
+    manager_id = uuid.uuid4()
+    with patch('api.routers.employees.svc_list_employees', return_value=rows) as mock_list:
+        resp = client.get('/api/employees', params={'limit': 2, 'managerId': str(manager_id), 'isActive': 'true', 'hiredFrom': '2024-01-01', 'fields': 'firstName'})
+    assert resp.status_code == 200
+    assert resp.json()[0] == {'id': str(rows[0]['id']), 'createdAt': '2025-01-01T00:00:00', 'firstName': 'F0'}
+    kwargs = mock_list.call_args.kwargs
+    assert (kwargs['manager_id'], kwargs['is_active'], kwargs['hired_from'], kwargs['fields']) == (manager_id, True, date(2024, 1, 1), 'firstName')
+    assert 'X-Next-Cursor' in resp.headers
+
 def test_get_employee_by_id(client):
     emp = EmployeeResponse(**fake_employee(10))
     with patch('api.routers.employees.svc_get_employee_by_id', return_value=emp):
@@ -37,6 +48,15 @@ def test_get_employee_by_id(client):
     assert resp.status_code == 200
     assert resp.json()['id'] == str(emp.id)
 
+def test_get_employee_subtree(client):
+    root = uuid.uuid4()
+    tree = [EmployeeSubtreeResponse(**fake_employee(1, root), depth=1), EmployeeSubtreeResponse(**fake_employee(2), depth=2)]
+    with patch('api.routers.employees.svc_get_employee_subtree', return_value=tree) as mock_subtree:
+        resp = client.get(f'/api/employees/{root}/subtree', params={'maxDepth': 2})
+    assert resp.status_code == 200
+    assert [row['depth'] for row in resp.json()] == [1, 2]
+    assert mock_subtree.call_args.args[1:] == (str(root), 2)
+
 def test_create_employee(client):
     create_in = EmployeeCreate(
         email='new@example.com',
@@ -73,3 +93,13 @@ def test_delete_employee(client):
     assert resp.status_code == 200
     assert resp.json()['deleted'] is True
     mock_delete.assert_called()
+
+
+def test_revoke_employee_tokens(client):
+    emp_id = uuid.uuid4()
+    result = {'revoked': True, 'id': str(emp_id), 'tokenVersion': 1}
+    with patch('api.routers.employees.svc_revoke_employee_tokens', return_value=result) as mock_revoke:
+        resp = client.post(f'/api/employees/{emp_id}/revoke_tokens')
+    assert resp.status_code == 200
+    assert resp.json()['tokenVersion'] == 1
+    assert mock_revoke.call_args.args[1] == str(emp_id)
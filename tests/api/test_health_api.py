@@ -2,3 +2,11 @@ def test_health_check(client):
     resp = client.get('/api/health')
     assert resp.status_code == 200
     assert resp.json() == {'status': 'ok'}
+
+
+def test_cache_metrics_lists_reference_caches(client):
+    resp = client.get('/api/health/caches')
+    assert resp.status_code == 200
+    body = resp.json()
+    assert {'month_info', 'employee_identity'} <= set(body)
+    assert {'hits', 'misses', 'evictions', 'size'} <= set(body['month_info'])
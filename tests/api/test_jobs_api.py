@@ -0,0 +1,61 @@
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from db import models
+
+
+def fake_job(**overrides):
+    data = dict(
+        id=uuid.uuid4(), kind='send_employee_pdfs', status='running', params={'managerId': str(uuid.uuid4()), 'year': 2025, 'month': 8},
+        progress_total=10, progress_done=4, progress_failed=1, result=None, error=None, attempts=1, max_attempts=3,
+        locked_by='host:1', created_at=datetime(2025, 8, 1, tzinfo=timezone.utc), started_at=None, finished_at=None,
+    )
+    data.update(overrides)
+    return models.Job(**data)
+
+
+def test_generation_endpoint_returns_202_with_job(client):
+    job = SimpleNamespace(id=uuid.uuid4(), kind='send_employee_pdfs', status='queued')
+    manager_id = uuid.uuid4()
+    with patch('api.routers.report_generation.svc_enqueue_job', return_value=job) as mock_enqueue:
+        resp = client.post('/api/reports_generation/sendPdfToEmployees', params={'managerId': str(manager_id), 'year': 2025, 'month': 8}, headers={'Idempotency-Key': 'abc'})
+    assert resp.status_code == 202
+    body = resp.json()
+    assert body['jobId'] == str(job.id)
+    assert body['statusUrl'] == f'/api/jobs/{job.id}'
+    assert resp.headers['location'] == body['statusUrl']
+    args, kwargs = mock_enqueue.call_args
+    assert args[1] == 'send_employee_pdfs'
+    assert args[2] == {'managerId': manager_id, 'year': 2025, 'month': 8, 'regenerateMissing': False}
+    assert kwargs['idempotency_key'] == 'abc'
+
+
+def test_generation_endpoint_passes_subtree_scope(client):
+    job = SimpleNamespace(id=uuid.uuid4(), kind='generate_manager_csv', status='queued')
+    with patch('api.routers.report_generation.svc_enqueue_job', return_value=job) as mock_enqueue:
+        resp = client.post('/api/reports_generation/createAggregatedEmployeeData', params={'managerId': str(uuid.uuid4()), 'year': 2025, 'month': 8, 'scope': 'subtree'})
+        bad = client.post('/api/reports_generation/createAggregatedEmployeeData', params={'managerId': str(uuid.uuid4()), 'year': 2025, 'month': 8, 'scope': 'company'})
+    assert resp.status_code == 202
+    assert mock_enqueue.call_args.args[2]['scope'] == 'subtree'
+    assert bad.status_code == 422
+
+
+def test_get_job_exposes_progress(client):
+    job = fake_job()
+    with patch('api.routers.jobs.svc_get_job', return_value=job):
+        resp = client.get(f'/api/jobs/{job.id}')
+    assert resp.status_code == 200
+    body = resp.json()
+    assert (body['progressTotal'], body['progressDone'], body['progressFailed']) == (10, 4, 1)
+    assert body['status'] == 'running'
+
+
+def test_list_jobs_filters_by_status(client):
+    jobs = [fake_job(status='succeeded', result={'sent': 3})]
+    with patch('api.routers.jobs.svc_list_jobs', return_value=jobs) as mock_list:
+        resp = client.get('/api/jobs', params={'status': 'succeeded'})
+    assert resp.status_code == 200
+    assert resp.json()[0]['result'] == {'sent': 3}
+    assert mock_list.call_args.kwargs['status'] == 'succeeded'
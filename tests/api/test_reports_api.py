@@ -0,0 +1,90 @@
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from api.schemas import ReportFileResponse
+from utils.pagination import decode_cursor
+
+
+def fake_report(idx: int):
+    return ReportFileResponse(
+        id=uuid.uuid4(),
+        path=f'reports/pdf/2025-08/{idx}.pdf',
+        type='pdf',
+        owner_id=uuid.uuid4(),
+        created_at=datetime(2025, 8, 1, tzinfo=timezone.utc),
+        archived=False,
+        content_type='application/pdf',
+        size_bytes=100,
+        period='2025-08',
+    )
+
+
+def test_list_reports_passes_filters_and_sets_next_cursor(client):
+    reports = [fake_report(i) for i in range(2)]
+    owner = uuid.uuid4()
+    with patch('api.routers.reports.svc_list_report_files', return_value=reports) as mock_list:
+        resp = client.get('/api/reports', params={'limit': 2, 'ownerId': str(owner), 'type': 'pdf', 'archived': 'false', 'period': '2025-08'})
+    assert resp.status_code == 200
+    assert len(resp.json()) == 2
+    kwargs = mock_list.call_args.kwargs
+    assert kwargs['owner_id'] == owner
+    assert kwargs['file_type'] == 'pdf'
+    assert kwargs['archived'] is False
+    assert kwargs['period'] == '2025-08'
+    assert decode_cursor(resp.headers['X-Next-Cursor'])[1] == reports[-1].id
+
+
+def test_list_reports_last_page_has_no_cursor(client):
+    with patch('api.routers.reports.svc_list_report_files', return_value=[fake_report(1)]):
+        resp = client.get('/api/reports', params={'limit': 5})
+    assert resp.status_code == 200
+    assert 'X-Next-Cursor' not in resp.headers
+
+
+def test_list_reports_rejects_bad_period(client):
+    resp = client.get('/api/reports', params={'period': '2025-8'})
+    assert resp.status_code == 422
+
+
+def fake_download(content: bytes = b'0123456789'):
+    from services.reports_service import ReportDownload
+    return ReportDownload(
+        filename='slip.pdf',
+        media_type='application/pdf',
+        size=len(content),
+        etag='"abc123"',
+        read_range=lambda start, end: iter([content[start:end + 1]]),
+    )
+
+
+def test_download_streams_full_body_with_etag(client):
+    with patch('api.routers.reports.svc_open_report_download', return_value=fake_download()):
+        resp = client.get(f'/api/reports/{uuid.uuid4()}.pdf/download')
+    assert resp.status_code == 200
+    assert resp.content == b'0123456789'
+    assert resp.headers['etag'] == '"abc123"'
+    assert resp.headers['accept-ranges'] == 'bytes'
+    assert resp.headers['content-length'] == '10'
+
+
+def test_download_serves_byte_range(client):
+    with patch('api.routers.reports.svc_open_report_download', return_value=fake_download()):
+        resp = client.get(f'/api/reports/{uuid.uuid4()}/download', headers={'Range': 'bytes=2-5'})
+    assert resp.status_code == 206
+    assert resp.content == b'2345'
+    assert resp.headers['content-range'] == 'bytes 2-5/10'
+
+
+def test_download_not_modified_when_etag_matches(client):
+    with patch('api.routers.reports.svc_open_report_download', return_value=fake_download()):
+        resp = client.get(f'/api/reports/{uuid.uuid4()}/download', headers={'If-None-Match': '"abc123"'})
+    assert resp.status_code == 304
+    assert resp.content == b''
+
+
+def test_download_rejects_unsatisfiable_range(client):
+    with patch('api.routers.reports.svc_open_report_download', return_value=fake_download()):
+        resp = client.get(f'/api/reports/{uuid.uuid4()}/download', headers={'Range': 'bytes=50-'})
+    assert resp.status_code == 416
+    assert resp.headers['content-range'] == 'bytes */10'
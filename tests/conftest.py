@@ -5,6 +5,7 @@ from fastapi.testclient import TestClient
 from app_factory import create_app
 from auth.deps import require_manager
 from db import session as db_session
+from utils.ttl_cache import clear_caches
 
 
 class DummyManager:
@@ -56,6 +57,14 @@ def app():
     return create_app()
 
 
+@pytest.fixture(autouse=True)
+def reset_caches():
+    # Reference caches are process-wide; entries must not leak between tests
+    clear_caches()
+    yield
+    clear_caches()
+
+
 @pytest.fixture(autouse=True)
 def override_dependencies(app):
     # Bypass auth/manager requirement
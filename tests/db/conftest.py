@@ -0,0 +1,65 @@
+"""SQLite-backed sessions for repository tests that run in the default (no PostgreSQL) setup.
+
+PostgreSQL-only behaviour (COPY, FOR UPDATE SKIP LOCKED, query plans) stays in the modules
+gated on ``TEST_DATABASE_URL``; everything portable runs here against the same models.
+"""
+import uuid
+from datetime import date
+
+import pytest
+import sqlalchemy.sql.sqltypes as sqltypes
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from db.base import Base
+from db import models
+
+PERIOD = (2025, 8)
+
+
+@pytest.fixture
+def sqlite_engine(monkeypatch):
+    # PostgreSQL accepts UUID strings where repositories pass request ids through; SQLite's
+    # UUID bind processor does not, so coerce them the same way
+    original = sqltypes.Uuid.bind_processor
+
+    def bind_processor(self, dialect):
+        process = original(self, dialect)
+        if process is None:
+            return None
+        return lambda value: process(uuid.UUID(value) if isinstance(value, str) else value)
+
+    monkeypatch.setattr(sqltypes.Uuid, "bind_processor", bind_processor)
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def sqlite_db(sqlite_engine):
+    db = sessionmaker(bind=sqlite_engine, autoflush=False)()
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def team(sqlite_db):
+    """A manager with three direct reports and month info for ``PERIOD``; returns (manager, employees)."""
+    manager = models.Employee(email="boss@example.com", first_name="Mia", last_name="Boss", cnp="9000000000000",
+                              hire_date=date(2020, 1, 1), base_salary=9000, is_manager=True)
+    sqlite_db.add(manager)
+    sqlite_db.flush()
+    manager.org_path = f"/{manager.id}/"
+    employees = []
+    for i in range(3):
+        employee = models.Employee(email=f"e{i}@example.com", first_name=f"F{i}", last_name=f"L{i}", cnp=f"{i:013d}",
+                                   hire_date=date(2021, 1, 1), base_salary=5000 + i, manager_id=manager.id)
+        sqlite_db.add(employee)
+        sqlite_db.flush()
+        employee.org_path = f"{manager.org_path}{employee.id}/"
+        employees.append(employee)
+    sqlite_db.add(models.MonthInfo(year=PERIOD[0], month=PERIOD[1], working_days=21))
+    sqlite_db.commit()
+    return manager, employees
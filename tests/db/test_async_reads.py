@@ -0,0 +1,114 @@
+"""Async read repositories (DB_ASYNC_READS) against PostgreSQL through asyncpg.
+
+Requires TEST_DATABASE_URL (see test_query_plans.py); the same database is reached with the
+asyncpg driver, in a throwaway schema.
+"""
+import asyncio
+import os
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, make_url, text
+from sqlalchemy.orm import sessionmaker
+
+from db import models
+from db.base import Base
+from db.repositories.auth_repo import repo_get_principal_async
+from db.repositories.employees_repo import repo_get_employee_by_id_async, repo_list_employees_async
+from db.repositories.report_files_repo import repo_get_report_file_by_id_async, repo_list_report_files_async
+from utils.ttl_cache import clear_caches
+
+DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+pytestmark = pytest.mark.skipif(
+    not (DATABASE_URL or "").startswith("postgresql"), reason="TEST_DATABASE_URL (PostgreSQL) not set"
+)
+
+
+@pytest.fixture(scope="module")
+def schema():
+    pytest.importorskip("asyncpg")
+    name = f"async_{uuid.uuid4().hex[:12]}"
+    admin = create_engine(DATABASE_URL, isolation_level="AUTOCOMMIT")
+    with admin.connect() as conn:
+        conn.execute(text(f'CREATE SCHEMA "{name}"'))
+    eng = create_engine(DATABASE_URL, connect_args={"options": f"-csearch_path={name}"})
+    try:
+        Base.metadata.create_all(eng)
+        _seed(eng)
+        yield name
+    finally:
+        eng.dispose()
+        with admin.connect() as conn:
+            conn.execute(text(f'DROP SCHEMA "{name}" CASCADE'))
+        admin.dispose()
+
+
+def _seed(eng):
+    created = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    with sessionmaker(bind=eng)() as db:
+        manager = models.Employee(email="boss@example.com", first_name="Mia", last_name="Boss", cnp="9000000000000",
+                                  hire_date=date(2020, 1, 1), base_salary=9000, is_manager=True, created_at=created)
+        db.add(manager)
+        db.flush()
+        for i in range(3):
+            db.add(models.Employee(email=f"e{i}@example.com", first_name=f"F{i}", last_name=f"L{i}", cnp=f"{i:013d}",
+                                   hire_date=date(2021, 1, 1), base_salary=5000, manager_id=manager.id,
+                                   created_at=created + timedelta(days=i + 1)))
+        for i in range(2):
+            db.add(models.ReportFile(path=f"reports/csv/2025-0{i + 1}/{manager.id}.csv", type="csv", owner_id=manager.id,
+                                     created_at=created + timedelta(days=i), content=b"x" * 1024, period=f"2025-0{i + 1}"))
+        db.commit()
+
+
+def _run(schema, read):
+    """Run ``read(session)`` on an AsyncSession bound to an asyncpg engine on ``schema``."""
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    url = make_url(DATABASE_URL).set(drivername="postgresql+asyncpg")
+
+    async def main():
+        eng = create_async_engine(url, connect_args={"server_settings": {"search_path": schema}})
+        try:
+            async with async_sessionmaker(eng, expire_on_commit=False)() as db:
+                return await read(db)
+        finally:
+            await eng.dispose()
+
+    return asyncio.run(main())
+
+
+def test_list_employees_async_pages_and_projects(schema):
+    rows = _run(schema, lambda db: repo_list_employees_async(db, limit=2))
+    assert [r.email for r in rows] == ["e2@example.com", "e1@example.com"]
+
+    after = (rows[-1].created_at, rows[-1].id)
+    rest = _run(schema, lambda db: repo_list_employees_async(db, limit=10, after=after, columns=["id", "email"]))
+    assert [r["email"] for r in rest] == ["e0@example.com", "boss@example.com"]
+    assert set(rest[0]) == {"id", "email"}
+
+    one = _run(schema, lambda db: repo_get_employee_by_id_async(db, str(rows[0].id)))
+    assert one.email == "e2@example.com"
+
+
+def test_report_file_async_reads_metadata_only(schema):
+    reports = _run(schema, lambda db: repo_list_report_files_async(db, limit=10, type="csv"))
+    assert [r.period for r in reports] == ["2025-02", "2025-01"]
+
+    report = _run(schema, lambda db: repo_get_report_file_by_id_async(db, str(reports[0].id)))
+    assert report.path == reports[0].path
+    assert "content" not in report.__dict__
+
+    with pytest.raises(HTTPException) as exc:
+        _run(schema, lambda db: repo_get_report_file_by_id_async(db, str(uuid.uuid4())))
+    assert exc.value.status_code == 404
+
+
+def test_principal_async_loads_on_a_cache_miss(schema):
+    clear_caches()
+    manager = _run(schema, lambda db: repo_list_employees_async(db, columns=["id", "email"]))[-1]
+    principal = _run(schema, lambda db: repo_get_principal_async(db, manager["id"], 0))
+    assert principal.email == "boss@example.com" and principal.is_manager
+    assert _run(schema, lambda db: repo_get_principal_async(db, manager["id"], 1)) is None
@@ -0,0 +1,82 @@
+"""COPY-based bulk import against a real PostgreSQL database (see test_query_plans.py)."""
+import os
+import uuid
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from db.base import Base
+from db import models
+from db.repositories.bulk_import_repo import repo_bulk_upsert_salary_components, repo_bulk_upsert_vacations
+
+DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+pytestmark = pytest.mark.skipif(
+    not (DATABASE_URL or "").startswith("postgresql"),
+    reason="TEST_DATABASE_URL (PostgreSQL) not set",
+)
+
+
+@pytest.fixture
+def db():
+    schema = f"bulk_{uuid.uuid4().hex[:12]}"
+    admin = create_engine(DATABASE_URL, isolation_level="AUTOCOMMIT")
+    with admin.connect() as conn:
+        conn.execute(text(f'CREATE SCHEMA "{schema}"'))
+    eng = create_engine(DATABASE_URL, connect_args={"options": f"-csearch_path={schema}"})
+    session = sessionmaker(bind=eng)()
+    try:
+        Base.metadata.create_all(eng)
+        yield session
+    finally:
+        session.close()
+        eng.dispose()
+        with admin.connect() as conn:
+            conn.execute(text(f'DROP SCHEMA "{schema}" CASCADE'))
+        admin.dispose()
+
+
+def _employee(db, manager_id=None, **data):
+    emp = models.Employee(
+        email=f"{uuid.uuid4().hex}@example.com", first_name="A", last_name="B", cnp=uuid.uuid4().hex[:13],
+        hire_date=date(2020, 1, 1), base_salary=1000, is_manager=manager_id is None, manager_id=manager_id, **data,
+    )
+    db.add(emp)
+    db.commit()
+    return emp.id
+
+
+def test_salary_components_merge_and_maintain_summary(db):
+    manager = _employee(db)
+    emp = _employee(db, manager)
+    db.add(models.SalaryComponent(employee_id=emp, year=2025, month=8, type=models.SalaryComponentType.bonus, amount=50))
+    db.commit()
+    result = repo_bulk_upsert_salary_components(db, [
+        (2, emp, 2025, 8, 'bonus', Decimal('75.00'), None),
+        (3, emp, 2025, 8, 'adjustment', Decimal('10.00'), 'first'),
+        (4, uuid.uuid4(), 2025, 8, 'bonus', Decimal('1.00'), None),
+        (5, emp, 2025, 8, 'adjustment', Decimal('-5.00'), 'second'),
+    ])
+    assert (result['staged'], result['inserted'], result['updated'], result['unchanged']) == (4, 1, 1, 0)
+    assert result['rejects'] == [(3, 'Superseded by line 5'), (4, 'Employee not found')]
+    summary = db.get(models.EmployeeMonthSummary, (2025, 8, emp))
+    assert (summary.bonus_total, summary.adjustment_total) == (Decimal('75.00'), Decimal('-5.00'))
+    assert db.get(models.ManagerMonthState, (manager, 2025, 8)).data_version == 1
+
+    again = repo_bulk_upsert_salary_components(db, [(2, emp, 2025, 8, 'bonus', Decimal('75.00'), None)])
+    assert (again['inserted'], again['updated'], again['unchanged']) == (0, 0, 1)
+    db.expire_all()
+    assert db.get(models.ManagerMonthState, (manager, 2025, 8)).data_version == 1
+
+
+def test_vacations_failed_load_leaves_nothing_behind(db):
+    emp = _employee(db, _employee(db))
+    with pytest.raises(Exception):
+        repo_bulk_upsert_vacations(db, [(1, emp, 2025, 8, 2), (2, emp, 2025, 8, 'x')])
+    assert db.query(models.Vacation).count() == 0
+    result = repo_bulk_upsert_vacations(db, [(1, emp, 2025, 8, 2)])
+    assert result['inserted'] == 1
+    assert db.get(models.EmployeeMonthSummary, (2025, 8, emp)).vacation_days == 2
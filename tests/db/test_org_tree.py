@@ -0,0 +1,75 @@
+"""Recursive subtree queries and org_path maintenance against PostgreSQL (see test_query_plans.py)."""
+import os
+import uuid
+from datetime import date
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from db.base import Base
+from db import models
+from db.repositories.employees_repo import repo_create_employee, repo_update_employee
+from db.repositories.reporting_queries import repo_list_subordinates, repo_list_subtree
+
+DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+pytestmark = pytest.mark.skipif(
+    not (DATABASE_URL or "").startswith("postgresql"),
+    reason="TEST_DATABASE_URL (PostgreSQL) not set",
+)
+
+
+@pytest.fixture
+def db():
+    schema = f"org_{uuid.uuid4().hex[:12]}"
+    admin = create_engine(DATABASE_URL, isolation_level="AUTOCOMMIT")
+    with admin.connect() as conn:
+        conn.execute(text(f'CREATE SCHEMA "{schema}"'))
+    eng = create_engine(DATABASE_URL, connect_args={"options": f"-csearch_path={schema}"})
+    session = sessionmaker(bind=eng)()
+    try:
+        Base.metadata.create_all(eng)
+        yield session
+    finally:
+        session.close()
+        eng.dispose()
+        with admin.connect() as conn:
+            conn.execute(text(f'DROP SCHEMA "{schema}" CASCADE'))
+        admin.dispose()
+
+
+def _employee(db, manager=None):
+    return repo_create_employee(
+        db, email=f"{uuid.uuid4().hex}@example.com", first_name="A", last_name="B", cnp=uuid.uuid4().hex[:13],
+        hire_date=date(2020, 1, 1), base_salary=1000, manager_id=manager.id if manager else None,
+    )
+
+
+def test_subtree_is_depth_first_with_depths(db):
+    top = _employee(db)
+    left, right = _employee(db, top), _employee(db, top)
+    leaf = _employee(db, left)
+    assert leaf.org_path == f"/{top.id}/{left.id}/{leaf.id}/"
+
+    rows = [(e.id, depth) for e, depth in repo_list_subtree(db, str(top.id))]
+    assert sorted(rows) == sorted([(left.id, 1), (right.id, 1), (leaf.id, 2)])
+    assert rows.index((leaf.id, 2)) == rows.index((left.id, 1)) + 1
+    assert {e.id for e, _ in repo_list_subtree(db, str(top.id), max_depth=1)} == {left.id, right.id}
+    assert {e.id for e in repo_list_subordinates(db, str(top.id), 'subtree')} == {left.id, right.id, leaf.id}
+
+
+def test_moving_a_manager_rewrites_descendant_paths(db):
+    top = _employee(db)
+    left, right = _employee(db, top), _employee(db, top)
+    leaf = _employee(db, left)
+
+    repo_update_employee(db, str(left.id), manager_id=right.id)
+    db.expire_all()
+    assert db.get(models.Employee, leaf.id).org_path == f"/{top.id}/{right.id}/{left.id}/{leaf.id}/"
+    assert {e.id for e, _ in repo_list_subtree(db, str(right.id))} == {left.id, leaf.id}
+
+    with pytest.raises(HTTPException) as exc:
+        repo_update_employee(db, str(right.id), manager_id=leaf.id)
+    assert exc.value.status_code == 400
@@ -0,0 +1,132 @@
+"""employee_month_summary maintenance on SQLite (default test run)."""
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import delete, func, select
+
+from db import models
+from db.repositories.employees_repo import repo_update_employee
+from db.repositories.manager_month_state_repo import repo_get_manager_month_state
+from db.repositories.months_repo import repo_create_month, repo_delete_month, repo_update_month
+from db.repositories.payroll_summary_repo import repo_ensure_employee_month_summary
+from db.repositories.salary_components_repo import (
+    repo_create_salary_component,
+    repo_delete_salary_component,
+    repo_update_salary_component,
+)
+from db.repositories.vacations_repo import repo_create_vacation, repo_delete_vacation, repo_update_vacation
+from services import report_generation_service as reports
+from utils.blob_store import InMemoryS3Client, S3BlobStore, set_blob_store
+
+PERIOD = (2025, 8)
+
+
+def _summary_rows(db) -> int:
+    return db.scalar(select(func.count()).select_from(models.EmployeeMonthSummary))
+
+
+def test_ensure_skips_stamped_and_missing_months(sqlite_db, team):
+    _, employees = team
+    repo_create_salary_component(sqlite_db, employee_id=employees[0].id, year=PERIOD[0], month=PERIOD[1], type=models.SalaryComponentType.bonus, amount=100)
+    sqlite_db.execute(delete(models.EmployeeMonthSummary))
+    sqlite_db.commit()
+    # New months are stamped complete, so a read never rebuilds (or commits) them
+    repo_ensure_employee_month_summary(sqlite_db, *PERIOD)
+    assert _summary_rows(sqlite_db) == 0
+    # No months row: nothing to stamp, nothing rebuilt
+    repo_ensure_employee_month_summary(sqlite_db, 2031, 1)
+    assert _summary_rows(sqlite_db) == 0
+
+
+def test_ensure_rebuilds_a_reset_month_once(sqlite_db, team):
+    _, employees = team
+    repo_create_salary_component(sqlite_db, employee_id=employees[0].id, year=PERIOD[0], month=PERIOD[1], type=models.SalaryComponentType.bonus, amount=100)
+    sqlite_db.execute(delete(models.EmployeeMonthSummary))
+    month = sqlite_db.query(models.MonthInfo).one()
+    month.summary_refreshed_at = None
+    sqlite_db.commit()
+    repo_ensure_employee_month_summary(sqlite_db, *PERIOD)
+    assert _summary_rows(sqlite_db) == 1
+    sqlite_db.expire_all()
+    assert sqlite_db.query(models.MonthInfo).one().summary_refreshed_at is not None
+
+
+def _totals(db, employee_id) -> tuple:
+    row = db.get(models.EmployeeMonthSummary, (PERIOD[0], PERIOD[1], employee_id))
+    return (float(row.bonus_total), float(row.adjustment_total), row.vacation_days) if row is not None else None
+
+
+def _data_version(db, manager_id) -> int:
+    db.expire_all()
+    state = repo_get_manager_month_state(db, manager_id, *PERIOD)
+    return state.data_version if state is not None else 0
+
+
+def test_salary_component_writes_apply_deltas_and_bump_the_manager(sqlite_db, team):
+    manager, (employee, *_) = team
+    bonus = repo_create_salary_component(sqlite_db, employee_id=employee.id, year=PERIOD[0], month=PERIOD[1], type=models.SalaryComponentType.bonus, amount=100)
+    repo_create_salary_component(sqlite_db, employee_id=employee.id, year=PERIOD[0], month=PERIOD[1], type=models.SalaryComponentType.adjustment, amount=-20)
+    assert _totals(sqlite_db, employee.id) == (100.0, -20.0, 0)
+    assert _data_version(sqlite_db, manager.id) == 2
+
+    repo_update_salary_component(sqlite_db, str(bonus.id), amount=250)
+    assert _totals(sqlite_db, employee.id) == (250.0, -20.0, 0)
+    assert _data_version(sqlite_db, manager.id) == 3
+
+    repo_delete_salary_component(sqlite_db, str(bonus.id))
+    assert _totals(sqlite_db, employee.id) == (0.0, -20.0, 0)
+    assert _data_version(sqlite_db, manager.id) == 4
+
+
+def test_base_component_changes_neither_totals_nor_versions(sqlite_db, team):
+    manager, (employee, *_) = team
+    repo_create_salary_component(sqlite_db, employee_id=employee.id, year=PERIOD[0], month=PERIOD[1], type=models.SalaryComponentType.base, amount=5000)
+    assert _totals(sqlite_db, employee.id) is None
+    assert _data_version(sqlite_db, manager.id) == 0
+
+
+def test_vacation_writes_apply_deltas_and_bump_the_manager(sqlite_db, team):
+    manager, (employee, *_) = team
+    vacation = repo_create_vacation(sqlite_db, employee_id=employee.id, year=PERIOD[0], month=PERIOD[1], days_taken=3)
+    assert _totals(sqlite_db, employee.id) == (0.0, 0.0, 3)
+    assert _data_version(sqlite_db, manager.id) == 1
+
+    repo_update_vacation(sqlite_db, str(vacation.id), days_taken=5)
+    assert _totals(sqlite_db, employee.id) == (0.0, 0.0, 5)
+    assert _data_version(sqlite_db, manager.id) == 2
+
+    repo_delete_vacation(sqlite_db, str(vacation.id))
+    assert _totals(sqlite_db, employee.id) == (0.0, 0.0, 0)
+    assert _data_version(sqlite_db, manager.id) == 3
+
+
+def test_employee_and_month_writes_bump_tracked_managers(sqlite_db, team):
+    manager, (employee, *_) = team
+    # Profile and month edits bump managers that already have a tracked month
+    repo_create_vacation(sqlite_db, employee_id=employee.id, year=PERIOD[0], month=PERIOD[1], days_taken=1)
+    repo_update_employee(sqlite_db, str(employee.id), base_salary=6000)
+    assert _data_version(sqlite_db, manager.id) == 2
+    month = sqlite_db.query(models.MonthInfo).one()
+    repo_update_month(sqlite_db, str(month.id), working_days=20)
+    assert _data_version(sqlite_db, manager.id) == 3
+
+
+def test_month_delete_and_recreate_invalidate_stored_reports(sqlite_db, team):
+    manager, _ = team
+    set_blob_store(S3BlobStore(InMemoryS3Client(), "test"))
+    try:
+        first = reports.generate_manager_csv(sqlite_db, manager.id, *PERIOD).content_sha256
+        month = sqlite_db.query(models.MonthInfo).one()
+        repo_delete_month(sqlite_db, str(month.id))
+        assert _data_version(sqlite_db, manager.id) == 1
+        # The stored CSV outlives its month, but is not served for it
+        with pytest.raises(HTTPException) as exc:
+            reports.generate_manager_csv(sqlite_db, manager.id, *PERIOD)
+        assert exc.value.status_code == 400
+
+        repo_create_month(sqlite_db, year=PERIOD[0], month=PERIOD[1], working_days=18)
+        assert _data_version(sqlite_db, manager.id) == 2
+        second = reports.generate_manager_csv(sqlite_db, manager.id, *PERIOD)
+        assert second.content_sha256 != first
+        assert b",18," in reports.get_blob_store().get(second.content_sha256)
+    finally:
+        set_blob_store(None)
@@ -0,0 +1,165 @@
+"""Reference data and principal caches are invalidated by repository writes.
+
+Runs on SQLite, and also on PostgreSQL when ``TEST_DATABASE_URL`` is set (see test_query_plans.py).
+"""
+import os
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from db import models
+from db.base import Base
+from db.repositories import employees_repo, months_repo
+from db.repositories.auth_repo import repo_get_principal, repo_revoke_employee_tokens
+from db.repositories.employees_repo import (
+    repo_bulk_upsert_employees,
+    repo_create_employee,
+    repo_get_employee_identity,
+    repo_update_employee,
+)
+from db.repositories.months_repo import repo_create_month, repo_delete_month, repo_get_month_info_by_year_month, repo_update_month
+from utils.ttl_cache import cache_stats
+
+DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+@pytest.fixture(params=["sqlite", "postgresql"])
+def db(request):
+    if request.param == "sqlite":
+        yield request.getfixturevalue("sqlite_db")
+        return
+    if not (DATABASE_URL or "").startswith("postgresql"):
+        pytest.skip("TEST_DATABASE_URL (PostgreSQL) not set")
+    schema = f"cache_{uuid.uuid4().hex[:12]}"
+    admin = create_engine(DATABASE_URL, isolation_level="AUTOCOMMIT")
+    with admin.connect() as conn:
+        conn.execute(text(f'CREATE SCHEMA "{schema}"'))
+    eng = create_engine(DATABASE_URL, connect_args={"options": f"-csearch_path={schema}"})
+    session = sessionmaker(bind=eng)()
+    try:
+        Base.metadata.create_all(eng)
+        yield session
+    finally:
+        session.close()
+        eng.dispose()
+        with admin.connect() as conn:
+            conn.execute(text(f'DROP SCHEMA "{schema}" CASCADE'))
+        admin.dispose()
+
+
+def test_month_info_is_cached_until_updated(db):
+    month = repo_create_month(db, year=2031, month=3, working_days=21)
+    misses = cache_stats()['month_info']['misses']
+    assert repo_get_month_info_by_year_month(db, 2031, 3).working_days == 21
+    assert repo_get_month_info_by_year_month(db, 2031, 3).working_days == 21
+    assert cache_stats()['month_info']['misses'] == misses + 1
+
+    repo_update_month(db, str(month.id), working_days=19)
+    assert repo_get_month_info_by_year_month(db, 2031, 3).working_days == 19
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    """Count the cache loaders' database reads: (year, month) for months, str(id) for identities."""
+    calls = []
+    load_month, load_identity = months_repo._load_month_ref, employees_repo._load_identity
+
+    def month_ref(db, year, month):
+        calls.append((year, month))
+        return load_month(db, year, month)
+
+    def identity(db, employee_id):
+        calls.append(str(employee_id))
+        return load_identity(db, employee_id)
+
+    monkeypatch.setattr(months_repo, "_load_month_ref", month_ref)
+    monkeypatch.setattr(employees_repo, "_load_identity", identity)
+    return calls
+
+
+def test_month_update_and_delete_invalidate(db, loads):
+    month = repo_create_month(db, year=2031, month=4, working_days=21)
+    repo_get_month_info_by_year_month(db, 2031, 4)
+    repo_get_month_info_by_year_month(db, 2031, 4)
+    assert loads == [(2031, 4)]
+
+    repo_update_month(db, str(month.id), month=5)
+    assert repo_get_month_info_by_year_month(db, 2031, 5).working_days == 21
+    with pytest.raises(HTTPException):
+        repo_get_month_info_by_year_month(db, 2031, 4)
+
+    repo_delete_month(db, str(month.id))
+    with pytest.raises(HTTPException):
+        repo_get_month_info_by_year_month(db, 2031, 5)
+    assert loads == [(2031, 4), (2031, 5), (2031, 4), (2031, 5)]
+
+
+def test_bulk_upsert_invalidates_updated_identities(db, loads):
+    employee = repo_create_employee(
+        db, email=f"{uuid.uuid4().hex}@example.com", first_name="Ana", last_name="B", cnp=uuid.uuid4().hex[:13],
+        hire_date=date(2020, 1, 1), base_salary=1000,
+    )
+    assert repo_get_employee_identity(db, employee.id).base_salary == 1000
+    assert repo_get_employee_identity(db, employee.id).base_salary == 1000
+    repo_bulk_upsert_employees(db, [], [{"id": employee.id, "base_salary": 1500}])
+    assert repo_get_employee_identity(db, employee.id).base_salary == 1500
+    assert loads == [str(employee.id), str(employee.id)]
+
+
+def test_employee_identity_is_invalidated_by_update(db):
+    employee = repo_create_employee(
+        db, email=f"{uuid.uuid4().hex}@example.com", first_name="Ana", last_name="B", cnp=uuid.uuid4().hex[:13],
+        hire_date=date(2020, 1, 1), base_salary=1000,
+    )
+    assert repo_get_employee_identity(db, employee.id).first_name == "Ana"
+    repo_update_employee(db, str(employee.id), first_name="Ioana")
+    assert repo_get_employee_identity(db, str(employee.id)).first_name == "Ioana"
+    assert repo_get_employee_identity(db, uuid.uuid4()) is None
+
+
+def test_deactivation_and_revoke_bump_the_token_version(db):
+    employee = repo_create_employee(
+        db, email=f"{uuid.uuid4().hex}@example.com", first_name="Ana", last_name="B", cnp=uuid.uuid4().hex[:13],
+        hire_date=date(2020, 1, 1), base_salary=1000, is_manager=True,
+    )
+    assert repo_get_principal(db, employee.id, 0).is_manager
+    assert repo_revoke_employee_tokens(db, str(employee.id))["tokenVersion"] == 1
+    assert repo_get_principal(db, employee.id, 0) is None
+    assert repo_get_principal(db, employee.id, 1) is not None
+
+    repo_update_employee(db, str(employee.id), first_name="Ioana")
+    assert repo_get_principal(db, employee.id, 1) is not None
+    repo_update_employee(db, str(employee.id), is_active=False)
+    assert repo_get_principal(db, employee.id, 1) is None
+    assert repo_get_principal(db, employee.id, 2) is None
+
+
+def test_bulk_upsert_revokes_only_real_password_changes(db):
+    employee = repo_create_employee(
+        db, email=f"{uuid.uuid4().hex}@example.com", first_name="Ana", last_name="B", cnp=uuid.uuid4().hex[:13],
+        hire_date=date(2020, 1, 1), base_salary=1000, password_hash="hash-1",
+    )
+    db.add(models.RefreshToken(employee_id=employee.id, token_hash=uuid.uuid4().hex, expires_at=datetime.now(timezone.utc) + timedelta(days=1)))
+    db.commit()
+
+    def version():
+        db.expire_all()
+        return db.get(models.Employee, employee.id).token_version
+
+    # Re-importing the stored hash, or a line without one, keeps every token valid
+    repo_bulk_upsert_employees(db, [], [{"id": employee.id, "password_hash": "hash-1", "first_name": "Ana"}])
+    repo_bulk_upsert_employees(db, [], [{"id": employee.id, "first_name": "Ana"}])
+    assert version() == 0 and repo_get_principal(db, employee.id, 0) is not None
+
+    repo_bulk_upsert_employees(db, [], [{"id": employee.id, "password_hash": "hash-2"}])
+    assert version() == 1
+    assert repo_get_principal(db, employee.id, 0) is None
+    assert db.query(models.RefreshToken).filter_by(employee_id=employee.id, revoked=False).count() == 0
+
+    repo_update_employee(db, str(employee.id), password_hash="hash-2")
+    assert version() == 1
+    repo_bulk_upsert_employees(db, [], [{"id": employee.id, "is_active": False}])
+    assert version() == 2
@@ -0,0 +1,131 @@
+"""Statements per report run: pinned on SQLite, and must not grow with team size (also on PostgreSQL).
+
+The PostgreSQL variants run when ``TEST_DATABASE_URL`` is set (see test_query_plans.py).
+"""
+import os
+import uuid
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+
+import services.report_generation_service as reports
+from db.base import Base
+from db import models
+from db.repositories.report_files_repo import repo_bulk_upsert_report_files
+from services.email_service import DispatchReport, SendResult
+from utils.blob_store import InMemoryS3Client, S3BlobStore, set_blob_store
+from utils.pdf_render import RenderBatch, RenderedSlip
+
+DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+PERIOD = (2025, 8)
+
+# Statements per step on SQLite: a change here means a report run now issues more (or fewer) queries
+SQLITE_STATEMENTS = {"generate": 7, "regenerate": 6, "send": 11, "send_csv": 12}
+
+
+@pytest.fixture(params=["sqlite", "postgresql"])
+def engine(request):
+    if request.param == "sqlite":
+        eng = request.getfixturevalue("sqlite_engine")
+        with eng.begin() as conn:
+            conn.execute(models.MonthInfo.__table__.insert().values(id=uuid.uuid4(), year=PERIOD[0], month=PERIOD[1], working_days=21))
+        yield eng
+        return
+    if not (DATABASE_URL or "").startswith("postgresql"):
+        pytest.skip("TEST_DATABASE_URL (PostgreSQL) not set")
+    schema = f"stmts_{uuid.uuid4().hex[:12]}"
+    admin = create_engine(DATABASE_URL, isolation_level="AUTOCOMMIT")
+    with admin.connect() as conn:
+        conn.execute(text(f'CREATE SCHEMA "{schema}"'))
+    eng = create_engine(DATABASE_URL, connect_args={"options": f"-csearch_path={schema}"})
+    try:
+        Base.metadata.create_all(eng)
+        with eng.begin() as conn:
+            conn.execute(models.MonthInfo.__table__.insert().values(id=uuid.uuid4(), year=PERIOD[0], month=PERIOD[1], working_days=21))
+        yield eng
+    finally:
+        eng.dispose()
+        with admin.connect() as conn:
+            conn.execute(text(f'DROP SCHEMA "{schema}" CASCADE'))
+        admin.dispose()
+
+
+@pytest.fixture(autouse=True)
+def fakes(monkeypatch):
+    set_blob_store(S3BlobStore(InMemoryS3Client(), "test"))
+    monkeypatch.setattr(reports, "render_salary_pdfs", lambda payloads: RenderBatch(
+        slips=[RenderedSlip(i, f"%PDF {p['employee_id']} {p['gross_salary']}".encode(), 0.0) for i, p in enumerate(payloads)]))
+    monkeypatch.setattr(reports, "send_many_dev", lambda emails, on_result=None: DispatchReport(
+        results=[SendResult(m.to, True, 0.0) for m in emails]))
+    yield
+    set_blob_store(None)
+
+
+def _team(db, size):
+    tag = uuid.uuid4().hex[:8]
+    manager = models.Employee(email=f"boss-{tag}@example.com", first_name="B", last_name="S", cnp=f"b-{tag}", hire_date=date(2020, 1, 1), base_salary=9000, is_manager=True)
+    db.add(manager)
+    db.flush()
+    for i in range(size):
+        db.add(models.Employee(email=f"e{i}-{tag}@example.com", first_name="E", last_name=str(i), cnp=f"e{i}-{tag}", hire_date=date(2021, 1, 1), base_salary=5000, manager_id=manager.id))
+    db.commit()
+    return manager.id
+
+
+def _statements_per_step(engine, size):
+    db = sessionmaker(bind=engine)()
+    manager_id = _team(db, size)
+    # The month summary is materialized, and month info cached, by whichever run reads the month first
+    warm = reports.ReportContext(db, manager_id, *PERIOD)
+    warm.summary, warm.working_days
+    counts, statements = {}, []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    steps = {
+        "generate": lambda: reports.generate_employee_pdfs(db, manager_id, *PERIOD),
+        "regenerate": lambda: reports.generate_employee_pdfs(db, manager_id, *PERIOD),
+        "send": lambda: reports.send_employee_pdfs(db, manager_id, *PERIOD),
+        "send_csv": lambda: reports.send_manager_csv(db, manager_id, *PERIOD),
+    }
+    try:
+        for name, step in steps.items():
+            statements.clear()
+            step()
+            counts[name] = len(statements)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+        db.close()
+    return counts
+
+
+def test_report_runs_are_constant_in_team_size(engine):
+    small, large = _statements_per_step(engine, 3), _statements_per_step(engine, 30)
+    assert small == large
+    if engine.dialect.name == "sqlite":
+        assert small == SQLITE_STATEMENTS
+
+
+def test_bulk_upsert_keeps_ids_and_replaces_bytes(engine):
+    db = sessionmaker(bind=engine)()
+    owner = uuid.uuid4()
+
+    def record(i, digest):
+        return {"path": f"reports/pdf/2025-08/{i}.pdf", "type": "pdf", "owner_id": owner, "content_sha256": digest * 64, "size_bytes": i}
+
+    try:
+        first = repo_bulk_upsert_report_files(db, [record(1, "a"), record(2, "a")])
+        second = repo_bulk_upsert_report_files(db, [record(2, "b"), record(3, "b"), record(3, "c")])
+        assert second["reports/pdf/2025-08/2.pdf"] == first["reports/pdf/2025-08/2.pdf"]
+        rows = {r.path: r for r in db.query(models.ReportFile).all()}
+        assert len(rows) == 3
+        assert rows["reports/pdf/2025-08/2.pdf"].content_sha256 == "b" * 64
+        assert rows["reports/pdf/2025-08/3.pdf"].content_sha256 == "c" * 64
+        assert {r.period for r in rows.values()} == {"2025-08"}
+    finally:
+        db.close()
@@ -0,0 +1,58 @@
+import io
+import json
+import uuid
+from decimal import Decimal
+from unittest.mock import Mock
+
+import services.bulk_import_service as svc
+
+EMP = uuid.uuid4()
+
+
+def fake_load(db, rows, db_rejects=()):
+    """Stand-in for the COPY repository: consumes the row stream like COPY would."""
+    staged = list(rows)
+    fake_load.staged = staged
+    rejects = list(db_rejects)
+    return {'staged': len(staged), 'inserted': len(staged) - len(rejects), 'updated': 0, 'unchanged': 0, 'rejects': rejects}
+
+
+def test_salary_component_csv_validates_each_line(monkeypatch):
+    monkeypatch.setattr(svc, 'repo_bulk_upsert_salary_components', fake_load)
+    data = (
+        "employeeId,year,month,type,amount,note\n"
+        f"{EMP},2025,8,bonus,100.456,Q3\n"
+        f"{EMP},2025,13,bonus,1,\n"
+        f"{EMP},2025,8,perk,1,\n"
+        f"not-a-uuid,2025,8,bonus,1,\n"
+        f"{EMP},2025,8,adjustment,-25,\n"
+    ).encode()
+    result = svc.import_salary_components(Mock(), io.BytesIO(data), 'csv')
+    assert fake_load.staged == [
+        (2, EMP, 2025, 8, 'bonus', Decimal('100.46'), 'Q3'),
+        (6, EMP, 2025, 8, 'adjustment', Decimal('-25.00'), None),
+    ]
+    assert result['received'] == 5
+    assert result['inserted'] == 2
+    assert [r['line'] for r in result['rejects']] == [3, 4, 5]
+    assert result['rejects'][0]['error'].startswith('month')
+    assert result['rejects'][1]['error'].startswith('type')
+    assert result['rejects'][2]['error'].startswith('employeeId')
+
+
+def test_vacation_ndjson_merges_repository_rejects(monkeypatch):
+    monkeypatch.setattr(svc, 'repo_bulk_upsert_vacations', lambda db, rows: fake_load(db, rows, [(1, 'Employee not found')]))
+    lines = [
+        {'employeeId': str(EMP), 'year': 2025, 'month': 8, 'daysTaken': 2},
+        {'employee_id': str(EMP), 'year': 2025, 'month': 9, 'days_taken': 40},
+        {'employeeId': str(EMP), 'year': 2025, 'month': 9, 'daysTaken': 1},
+    ]
+    data = "\n".join(json.dumps(line) for line in lines).encode()
+    result = svc.import_vacations(Mock(), io.BytesIO(data), 'ndjson')
+    assert fake_load.staged == [(1, EMP, 2025, 8, 2), (3, EMP, 2025, 9, 1)]
+    assert result['received'] == 3
+    assert result['rejected'] == 2
+    assert result['rejects'] == [
+        {'line': 1, 'error': 'Employee not found'},
+        {'line': 2, 'error': 'daysTaken: must be between 0 and 31'},
+    ]
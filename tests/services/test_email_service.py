@@ -0,0 +1,147 @@
+import smtplib
+
+import pytest
+
+import threading
+import time
+
+from services.email_service import OutgoingEmail, RateLimiter, SMTPConfig, SMTPConnectionPool
+
+
+class FakeSMTP:
+    instances = []
+
+    def __init__(self, host, port, timeout=None):
+        self.host, self.port = host, port
+        self.calls = []
+        self.fail_next = None
+        FakeSMTP.instances.append(self)
+
+    def starttls(self):
+        self.calls.append('starttls')
+
+    def login(self, user, password):
+        self.calls.append('login')
+
+    def send_message(self, msg):
+        if self.fail_next:
+            exc, self.fail_next = self.fail_next, None
+            raise exc
+        self.calls.append(('send', msg['To']))
+
+    def quit(self):
+        self.calls.append('quit')
+
+    def close(self):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def reset_instances():
+    FakeSMTP.instances = []
+
+
+def make_pool(**kwargs):
+    config = SMTPConfig('smtp.example.com', 587, 'payroll@example.com', tls=True, username='u', password='p')
+    return SMTPConnectionPool(config, factory=FakeSMTP, **kwargs)
+
+
+def emails(n):
+    return [OutgoingEmail(f'e{i}@example.com', 'Slip', 'Body', [('slip.pdf', b'%PDF')]) for i in range(n)]
+
+
+def test_send_many_reuses_one_authenticated_connection():
+    pool = make_pool(size=2)
+    assert [r.ok for r in pool.send_many(emails(5), concurrency=1).results] == [True] * 5
+    assert pool.connects == 1
+    conn = FakeSMTP.instances[0]
+    assert conn.calls[:2] == ['starttls', 'login']
+    assert [c for c in conn.calls if c[0] == 'send'] == [('send', f'e{i}@example.com') for i in range(5)]
+
+
+def test_connection_recycled_after_max_messages():
+    pool = make_pool(max_messages=2)
+    pool.send_many(emails(5), concurrency=1)
+    assert pool.connects == 3
+    assert FakeSMTP.instances[0].calls[-1] == 'quit'
+
+
+def test_reconnects_once_on_421():
+    pool = make_pool()
+    pool.send_many(emails(1))
+    FakeSMTP.instances[0].fail_next = smtplib.SMTPResponseException(421, b'Service closing')
+    report = pool.send_many(emails(1))
+    assert report.results[0].ok and report.results[0].attempts == 2
+    assert pool.connects == 2
+
+
+def test_failed_retry_reports_both_attempts():
+    class Closing(FakeSMTP):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.fail_next = smtplib.SMTPServerDisconnected('Connection unexpectedly closed')
+
+    config = SMTPConfig('smtp.example.com', 587, 'payroll@example.com')
+    report = SMTPConnectionPool(config, factory=Closing).send_many(emails(1))
+    assert not report.results[0].ok and report.results[0].attempts == 2
+    assert report.results[0].error.startswith('SMTPServerDisconnected')
+
+
+def test_permanent_failure_is_reported_not_retried():
+    pool = make_pool()
+    pool.send_many(emails(1))
+    FakeSMTP.instances[0].fail_next = smtplib.SMTPRecipientsRefused({'e0@example.com': (550, b'No such user')})
+    report = pool.send_many(emails(2), concurrency=1)
+    assert [r.ok for r in report.results] == [False, True]
+    assert report.results[0].error.startswith('SMTPRecipientsRefused')
+    assert (report.delivered, report.failed) == (1, 1)
+    assert pool.connects == 2  # failed connection discarded, replaced for the next message
+
+
+def test_close_quits_idle_connections():
+    pool = make_pool()
+    pool.send_many(emails(1))
+    pool.close()
+    assert FakeSMTP.instances[0].calls[-1] == 'quit'
+
+
+class SlowSMTP(FakeSMTP):
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def send_message(self, msg):
+        with SlowSMTP.lock:
+            SlowSMTP.active += 1
+            SlowSMTP.peak = max(SlowSMTP.peak, SlowSMTP.active)
+        time.sleep(0.02)
+        with SlowSMTP.lock:
+            SlowSMTP.active -= 1
+        super().send_message(msg)
+
+
+def test_send_many_runs_concurrently_bounded_by_pool_size():
+    config = SMTPConfig('smtp.example.com', 587, 'payroll@example.com')
+    pool = SMTPConnectionPool(config, size=3, factory=SlowSMTP)
+    report = pool.send_many(emails(12), concurrency=8)
+    assert report.concurrency == 3
+    assert SlowSMTP.peak == 3
+    assert [r.to for r in report.results] == [f'e{i}@example.com' for i in range(12)]
+    stats = report.stats()
+    assert stats['delivered'] == 12 and stats['failed'] == 0
+    assert stats['maxLatencyMs'] >= 20
+
+
+def test_rate_limiter_spaces_acquisitions():
+    now = [0.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    limiter = RateLimiter(rate=10, clock=lambda: now[0], sleep=sleep)
+    for _ in range(3):
+        limiter.acquire()
+    assert now[0] == pytest.approx(0.2)
+    assert len(sleeps) == 2
@@ -0,0 +1,116 @@
+import io
+import json
+import uuid
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+
+import services.employee_import_service as svc
+
+BOSS_ID = uuid.uuid4()
+REPORT_ID = uuid.uuid4()
+
+
+def employee(email, cnp, **extra):
+    return {'email': email, 'firstName': 'F', 'lastName': 'L', 'cnp': cnp, 'hireDate': '2024-01-01', 'baseSalary': 1000, **extra}
+
+
+@pytest.fixture
+def repo(monkeypatch):
+    calls = {}
+    existing = [
+        SimpleNamespace(id=BOSS_ID, email='boss@x.com', cnp='c-boss', manager_id=None, org_path=f'/{BOSS_ID}/'),
+        SimpleNamespace(id=REPORT_ID, email='report@x.com', cnp='c-report', manager_id=BOSS_ID, org_path=f'/{BOSS_ID}/{REPORT_ID}/'),
+    ]
+    monkeypatch.setattr(svc, 'repo_get_employee_keys', lambda db, emails, cnps, ids: existing)
+    monkeypatch.setattr(svc, 'repo_bulk_upsert_employees', lambda db, inserts, updates: calls.update(inserts=inserts, updates=updates))
+    monkeypatch.setattr(svc, 'hash_passwords', lambda plains: [f'hashed:{p}' for p in plains])
+    return calls
+
+
+def run(lines):
+    data = "\n".join(json.dumps(line) for line in lines).encode()
+    return svc.import_employees(Mock(), io.BytesIO(data), 'ndjson')
+
+
+def test_managers_are_written_before_their_reports(repo):
+    result = run([
+        employee('leaf@x.com', 'c1', managerEmail='mid@x.com', password='pw'),
+        employee('mid@x.com', 'c2', managerEmail='top@x.com'),
+        employee('top@x.com', 'c3', managerId=str(BOSS_ID), isManager=True),
+    ])
+    assert (result['inserted'], result['updated'], result['rejected']) == (3, 0, 0)
+    inserts = repo['inserts']
+    assert [row['email'] for row in inserts] == ['top@x.com', 'mid@x.com', 'leaf@x.com']
+    assert inserts[0]['manager_id'] == BOSS_ID
+    assert inserts[1]['manager_id'] == inserts[0]['id']
+    assert inserts[2]['manager_id'] == inserts[1]['id']
+    assert inserts[2]['password_hash'] == 'hashed:pw'
+    assert (inserts[1]['is_active'], inserts[1]['is_manager']) == (True, False)
+    assert result['metrics']['hashed'] == 1
+
+
+def test_upsert_matches_existing_and_rejects_bad_references(repo):
+    result = run([
+        employee('renamed@x.com', 'c-boss', firstName='Boss'),
+        employee('a@x.com', 'c1', managerEmail='b@x.com'),
+        employee('b@x.com', 'c2', managerEmail='a@x.com'),
+        employee('c@x.com', 'c3', managerEmail='ghost@x.com'),
+        employee('d@x.com', 'c4', managerEmail='c@x.com'),
+        employee('e@x.com', 'c1'),
+        employee('f@x.com', 'c5', hireDate='soon'),
+    ])
+    [update] = repo['updates']
+    assert (update['id'], update['email'], update['first_name']) == (BOSS_ID, 'renamed@x.com', 'Boss')
+    assert 'manager_id' not in update and 'password_hash' not in update
+    assert repo['inserts'] == []
+    assert result['rejects'] == [
+        {'line': 2, 'error': 'Management cycle'},
+        {'line': 3, 'error': 'Management cycle'},
+        {'line': 4, 'error': 'Manager ghost@x.com not found'},
+        {'line': 5, 'error': 'Manager on line 4 was rejected'},
+        {'line': 6, 'error': 'cnp already used on line 2'},
+        {'line': 7, 'error': result['rejects'][-1]['error']},
+    ]
+    assert result['rejects'][-1]['error'].startswith('hireDate')
+
+
+def test_moving_a_manager_under_their_own_report_is_a_cycle(repo):
+    result = run([employee('boss@x.com', 'c-boss', managerId=str(REPORT_ID))])
+    assert result['rejects'] == [{'line': 1, 'error': 'Management cycle'}]
+    assert 'updates' not in repo
+
+
+def test_csv_update_leaves_blank_cells_untouched(repo):
+    data = (
+        "email,firstName,lastName,cnp,hireDate,baseSalary,passwordHash,isActive,isManager,managerId,managerEmail\n"
+        "report@x.com,Rita,L,c-report,2024-01-01,1200,,,,,\n"
+        "new@x.com,,L,c9,2024-01-01,1000,,,,,\n"
+    ).encode()
+    result = svc.import_employees(Mock(), io.BytesIO(data), 'csv')
+    [update] = repo['updates']
+    # No password, flag or manager change: empty cells are not writes of NULL
+    assert update == {'id': REPORT_ID, 'email': 'report@x.com', 'first_name': 'Rita', 'last_name': 'L', 'cnp': 'c-report',
+                      'hire_date': update['hire_date'], 'base_salary': 1200.0}
+    # A blank required cell rejects its own line (no insert with a NULL first name)
+    assert [reject['line'] for reject in result['rejects']] == [3] and repo['inserts'] == []
+
+
+def test_moving_a_manager_under_their_own_listed_report_rejects_only_that_line(repo):
+    result = run([
+        employee('boss@x.com', 'c-boss', managerEmail='report@x.com'),
+        employee('report@x.com', 'c-report', firstName='Rita'),
+    ])
+    assert result['rejects'] == [{'line': 1, 'error': 'Management cycle'}]
+    assert [row['id'] for row in repo['updates']] == [REPORT_ID]
+
+
+def test_swapping_a_manager_with_a_report_moved_away_is_not_a_cycle(repo):
+    result = run([
+        employee('boss@x.com', 'c-boss', managerEmail='report@x.com'),
+        employee('report@x.com', 'c-report', managerEmail='top@x.com'),
+        employee('top@x.com', 'c-top'),
+    ])
+    assert result['rejected'] == 0
+    assert [row.get('email') for row in repo['inserts'] + repo['updates']] == ['top@x.com', 'report@x.com', 'boss@x.com']
@@ -1,8 +1,13 @@
-from datetime import date
-from unittest.mock import Mock
+import asyncio
+import uuid
+from datetime import date, datetime, timezone
+from unittest.mock import AsyncMock, Mock, patch
+import pytest
+from fastapi import HTTPException
 from api.schemas import EmployeeCreate, EmployeeUpdate
 import services.employees_service as svc
 from db import models
+from utils.pagination import encode_cursor
 
 class DummyRepoFns:
     def __init__(self):
@@ -47,3 +52,35 @@ def test_delete_employee(monkeypatch):
     monkeypatch.setattr('services.employees_service.repo_delete_employee', repo.delete)
     result = svc.delete_employee(Mock(), 'emp-1')
     assert result['deleted'] is True
+
+def test_get_employee_subtree_adds_depth(monkeypatch):
+    boss = models.Employee(id=uuid.uuid4())
+    report = models.Employee(id=uuid.uuid4(), email='r@y.z', is_active=True, is_manager=False, created_at=datetime.now(), first_name='R', last_name='S', cnp='12345678901', hire_date=date.today(), base_salary=1000.0, manager_id=boss.id)
+    monkeypatch.setattr('services.employees_service.repo_get_employee_by_id', lambda db, eid: boss)
+    monkeypatch.setattr('services.employees_service.repo_list_subtree', lambda db, eid, max_depth: [(report, 1)])
+    result = svc.get_employee_subtree(Mock(), str(boss.id))
+    assert [(row.id, row.manager_id, row.depth) for row in result] == [(report.id, boss.id, 1)]
+
+def test_get_employees_projects_requested_fields(monkeypatch):
+    captured = {}
+    monkeypatch.setattr('services.employees_service.repo_list_employees', lambda db, **kw: captured.update(kw) or [])
+    svc.get_employees(Mock(), limit=10, fields='firstName, hire_date,id')
+    assert captured['columns'] == ['id', 'created_at', 'first_name', 'hire_date']
+    assert captured['limit'] == 10 and captured['after'] is None
+    svc.get_employees(Mock())
+    assert captured['columns'] is None
+
+def test_get_employees_rejects_unknown_fields():
+    with pytest.raises(HTTPException) as exc:
+        svc.get_employees(Mock(), fields='firstName,passwordHash')
+    assert exc.value.status_code == 400
+
+
+def test_get_employees_async_uses_the_same_filters():
+    ts, rid = datetime(2025, 8, 1, tzinfo=timezone.utc), uuid.uuid4()
+    with patch('services.employees_service.repo_list_employees_async', new=AsyncMock(return_value=[])) as mock_repo:
+        asyncio.run(svc.get_employees_async(object(), limit=5, cursor=encode_cursor(ts, rid), is_active=True, fields='email'))
+    kwargs = mock_repo.await_args.kwargs
+    assert kwargs['after'] == (ts, rid)
+    assert kwargs['is_active'] is True
+    assert kwargs['columns'] == ['id', 'created_at', 'email']
@@ -0,0 +1,158 @@
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+import services.jobs_service as svc
+from db.repositories import jobs_repo
+from services import report_generation_service as reports
+from services.email_service import DispatchReport, OutgoingEmail, SendResult
+
+
+class NullSession:
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def progress_updates(monkeypatch):
+    updates = []
+    monkeypatch.setattr(svc, 'repo_update_job_progress', lambda db, job_id, **kw: updates.append(kw))
+    return updates
+
+
+def make_job(kind='fake'):
+    return SimpleNamespace(id='job-1', kind=kind, params={'n': 3}, attempts=1, max_attempts=3, checkpoint=None)
+
+
+def test_run_job_records_result_and_progress(monkeypatch, progress_updates):
+    def handler(db, params, progress):
+        progress.set_total(params['n'])
+        progress.advance(done=2)
+        progress.advance(failed=1)
+        return {'sent': 2}
+
+    monkeypatch.setitem(svc.JOB_HANDLERS, 'fake', handler)
+    completed = {}
+    monkeypatch.setattr(svc, 'repo_complete_job', lambda db, job, result: completed.update(result=result) or job)
+    svc.run_job(NullSession(), make_job(), svc.JobProgress('job-1', interval=60, session_factory=NullSession))
+    assert completed['result'] == {'sent': 2}
+    assert progress_updates[-1] == {'total': 3, 'done': 2, 'failed': 1}
+
+
+def test_run_job_single_item_defaults_progress(monkeypatch, progress_updates):
+    monkeypatch.setitem(svc.JOB_HANDLERS, 'fake', lambda db, params, progress: {'ok': True})
+    monkeypatch.setattr(svc, 'repo_complete_job', lambda db, job, result: job)
+    svc.run_job(NullSession(), make_job(), svc.JobProgress('job-1', interval=60, session_factory=NullSession))
+    assert progress_updates[-1] == {'total': 1, 'done': 1, 'failed': 0}
+
+
+@pytest.mark.parametrize('exc,retry', [(RuntimeError('smtp down'), True), (HTTPException(status_code=400, detail='Month info not defined'), False)])
+def test_run_job_failure_retries_only_transient_errors(monkeypatch, progress_updates, exc, retry):
+    def handler(db, params, progress):
+        raise exc
+
+    monkeypatch.setitem(svc.JOB_HANDLERS, 'fake', handler)
+    failed = {}
+    monkeypatch.setattr(svc, 'repo_fail_job', lambda db, job, error, retry, retry_delay_seconds: failed.update(error=error, retry=retry) or job)
+    svc.run_job(NullSession(), make_job(), svc.JobProgress('job-1', interval=60, session_factory=NullSession))
+    assert failed['retry'] is retry
+    assert type(exc).__name__ in failed['error']
+
+
+def test_enqueue_derives_dedupe_key_from_idempotency_key(monkeypatch):
+    captured = {}
+    monkeypatch.setattr(svc, 'repo_enqueue_job', lambda db, kind, params, **kw: captured.update(kind=kind, params=params, **kw))
+    svc.enqueue_job(NullSession(), 'send_manager_csv', {'managerId': 'm', 'year': 2025, 'month': 8}, idempotency_key='abc')
+    assert captured['dedupe_key'] == 'send_manager_csv:abc'
+    assert captured['params'] == {'managerId': 'm', 'year': 2025, 'month': 8}
+
+
+class OneJobSession:
+    """Session stub whose dedupe lookup finds ``job``."""
+
+    def __init__(self, job):
+        self.job = job
+
+    def query(self, model):
+        return self
+
+    def filter(self, *criteria):
+        return self
+
+    def first(self):
+        return self.job
+
+
+def test_enqueue_same_key_returns_existing_job_only_for_same_params():
+    job = SimpleNamespace(id='job-1', params={'managerId': 'm', 'year': 2025, 'month': 8})
+    assert jobs_repo.repo_enqueue_job(OneJobSession(job), 'send_manager_csv', dict(job.params), dedupe_key='send_manager_csv:abc') is job
+    with pytest.raises(HTTPException) as exc:
+        jobs_repo.repo_enqueue_job(OneJobSession(job), 'send_manager_csv', {**job.params, 'month': 9}, dedupe_key='send_manager_csv:abc')
+    assert exc.value.status_code == 422
+
+
+def test_retried_slip_send_skips_recipients_already_mailed(monkeypatch, progress_updates):
+    saved = []
+    monkeypatch.setattr(svc, 'repo_save_job_checkpoint', lambda db, job_id, checkpoint: saved.append(checkpoint))
+    emails = [OutgoingEmail(f'e{i}@example.com', 'Slip', 'Body', []) for i in range(3)]
+    ids = ['id-0', 'id-1', 'id-2']
+    sent = []
+
+    def send(batch, on_result=None):
+        sent.append([e.to for e in batch])
+        results = [SendResult(e.to, e.to != 'e1@example.com', 1.0) for e in batch]
+        for r in results:
+            on_result(r)
+        return DispatchReport(results)
+
+    first = svc.JobProgress('job-1', interval=60, session_factory=NullSession)
+    dispatch, delivered = reports._send_slips_once(emails, ids, send, first)
+    assert delivered == [True, False, True] and saved[-1] == {'sent': ['id-0', 'id-2']}
+
+    # The attempt then failed after sending (e.g. the ZIP step); the retry resumes from the checkpoint
+    retry = svc.JobProgress('job-1', interval=60, session_factory=NullSession, checkpoint=saved[-1])
+    dispatch, delivered = reports._send_slips_once(emails, ids, send, retry)
+    assert sent[-1] == ['e1@example.com']
+    assert delivered == [True, False, True] and (retry.total, retry.done, retry.failed) == (3, 2, 1)
+
+
+def test_failed_manager_csv_send_raises_without_checkpointing(monkeypatch, progress_updates):
+    saved = []
+    monkeypatch.setattr(svc, 'repo_save_job_checkpoint', lambda db, job_id, checkpoint: saved.append(checkpoint))
+    ctx = SimpleNamespace(manager_id='m-1', manager=SimpleNamespace(email='boss@example.com'), year=2025, month=8)
+    report = SimpleNamespace(path='reports/csv/2025-08/m-1.csv')
+    outcomes = [False, True]
+    sent = []
+
+    def send(batch, on_result=None):
+        sent.append([e.to for e in batch])
+        ok = outcomes.pop(0)
+        return DispatchReport([SendResult(e.to, ok, 1.0, error=None if ok else 'SMTP down') for e in batch])
+
+    progress = svc.JobProgress('job-1', interval=60, session_factory=NullSession)
+    with pytest.raises(HTTPException) as exc:
+        reports._send_manager_csv_once(ctx, report, b'csv', send, progress)
+    assert exc.value.status_code == 502 and 'SMTP down' in exc.value.detail
+    assert saved == []
+
+    # The job retries: the manager is mailed again and only now checkpointed
+    dispatch = reports._send_manager_csv_once(ctx, report, b'csv', send, progress)
+    assert dispatch.delivered == 1 and saved[-1] == {'sent': ['m-1']}
+    retry = svc.JobProgress('job-1', interval=60, session_factory=NullSession, checkpoint=saved[-1])
+    assert reports._send_manager_csv_once(ctx, report, b'csv', send, retry).results == []
+    assert sent == [['boss@example.com'], ['boss@example.com']]
+
+
+def test_enqueue_rejects_unknown_kind():
+    with pytest.raises(HTTPException) as exc:
+        svc.enqueue_job(NullSession(), 'nope', {})
+    assert exc.value.status_code == 400
+
+
+def test_list_jobs_validates_status():
+    with pytest.raises(HTTPException):
+        svc.list_jobs(NullSession(), status='weird')
@@ -0,0 +1,108 @@
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+
+import services.month_close_service as svc
+from utils.pdf_render import RenderBatch, RenderedSlip
+
+
+def row(manager, idx):
+    return {
+        'employee_id': f'{manager}-e{idx}', 'first_name': 'F', 'last_name': 'L', 'cnp': '1', 'base_salary': 1000.0,
+        'bonus_total': 0.0, 'adjustment_total': 0.0, 'vacation_days': 0, 'manager_id': manager,
+        'manager_name': 'Boss', 'hire_date': date(2020, 1, 1), 'email': 'x@y.z',
+    }
+
+
+class FakeProgress:
+    def __init__(self, checkpoint=None):
+        self.checkpoint = checkpoint or {}
+        self.total = 0
+        self.done = 0
+        self.saved = []
+
+    def set_total(self, total):
+        self.total = total
+
+    def advance(self, done=0, failed=0):
+        self.done += done
+
+    def save_checkpoint(self, checkpoint):
+        self.checkpoint = checkpoint
+        self.saved.append(checkpoint)
+
+
+class Stored(list):
+    """(type, owner) of every stored file; ``writes`` has the file count of each bulk write."""
+
+    def __init__(self):
+        super().__init__()
+        self.writes = []
+
+
+@pytest.fixture
+def company(monkeypatch):
+    rows = [row('m1', i) for i in range(3)] + [row('m2', i) for i in range(2)] + [row('m3', i) for i in range(2)]
+    stored = Stored()
+    monkeypatch.setattr(svc, 'repo_list_manager_month_states', lambda db, y, m: {})
+    monkeypatch.setattr(svc, 'repo_record_manager_month_generated', lambda db, y, m, artifact, versions: None)
+    monkeypatch.setattr(svc, 'repo_get_month_info_by_year_month', lambda db, y, m: SimpleNamespace(working_days=21))
+    monkeypatch.setattr(svc, 'repo_aggregate_company_month_summary', lambda db, y, m: rows)
+    monkeypatch.setattr(svc, 'repo_list_manager_ids', lambda db: ['m1', 'm2', 'm3', 'm4'])
+    monkeypatch.setattr(svc, 'repo_list_report_files_by_paths', lambda db, paths: {})
+
+    def store_files(db, files):
+        stored.writes.append(len(files))
+        stored.extend((file_type, owner) for _, file_type, owner, _, _ in files)
+
+    monkeypatch.setattr(svc, 'store_report_files', store_files)
+    monkeypatch.setattr(svc, 'render_salary_pdfs', lambda payloads: RenderBatch(slips=[RenderedSlip(i, b'%PDF', 1.0) for i in range(len(payloads))]))
+    monkeypatch.setattr(svc.settings, 'MONTH_CLOSE_BATCH_SLIPS', 4)
+    return stored
+
+
+def test_manager_batches_respect_slip_budget_without_splitting_managers():
+    rows = {'a': [1] * 3, 'b': [1] * 2, 'c': [1] * 5, 'd': [1]}
+    assert svc._manager_batches(['a', 'b', 'c', 'd'], rows, 4) == [['a'], ['b'], ['c'], ['d']]
+    assert svc._manager_batches(['a', 'd', 'b'], rows, 4) == [['a', 'd'], ['b']]
+
+
+def test_close_month_checkpoints_each_batch(company):
+    progress = FakeProgress()
+    result = svc.close_month(None, 2025, 8, progress=progress)
+    assert result['csvFiles'] == 3 and result['generated'] == 7
+    # m4 manages nobody: no CSV, but it shows up in the totals
+    assert (result['managers'], result['managersWithoutReports']) == (3, 1)
+    assert [c['managers'] for c in progress.saved] == [['m1'], ['m1', 'm2', 'm3']]
+    assert (progress.total, progress.done) == (7, 7)
+    # One bulk write per batch: its CSVs plus its slips
+    assert company.writes == [4, 6]
+
+
+def test_close_month_resumes_from_checkpoint(company):
+    progress = FakeProgress({'managers': ['m1'], 'totals': {'csvFiles': 1, 'generated': 3, 'reused': 0}})
+    result = svc.close_month(None, 2025, 8, progress=progress)
+    assert result['resumedManagers'] == 1
+    assert {owner for _, owner in company} == {'m2', 'm3', 'm2-e0', 'm2-e1', 'm3-e0', 'm3-e1'}
+    assert result['generated'] == 7 and result['csvFiles'] == 3
+    assert progress.done == 7
+
+
+def test_close_month_skips_unchanged_managers_and_rerenders_changed_slips(company, monkeypatch):
+    states = {
+        'm1': SimpleNamespace(data_version=2, csv_version=2, pdfs_version=2),  # unchanged
+        'm2': SimpleNamespace(data_version=3, csv_version=2, pdfs_version=2),  # changed since last run
+    }
+    m2_e0 = svc.slip_payload(2025, 8, 'm2-e0', 'F L', '1', date(2020, 1, 1), 'Boss', 1000.0, 0.0, 0.0, 21, 0)
+    existing = {svc.manager_csv_path('m1', 2025, 8): SimpleNamespace(), svc.manager_csv_path('m2', 2025, 8): SimpleNamespace()}
+    existing.update({svc.employee_pdf_path(f'm1-e{i}', 2025, 8): SimpleNamespace(fingerprint=None) for i in range(3)})
+    existing[svc.employee_pdf_path('m2-e0', 2025, 8)] = SimpleNamespace(fingerprint=svc.slip_fingerprint(m2_e0))
+    existing[svc.employee_pdf_path('m2-e1', 2025, 8)] = SimpleNamespace(fingerprint='stale')
+    monkeypatch.setattr(svc, 'repo_list_manager_month_states', lambda db, y, m: states)
+    monkeypatch.setattr(svc, 'repo_list_report_files_by_paths', lambda db, paths: {p: existing[p] for p in paths if p in existing})
+    monkeypatch.setattr(svc, 'blob_available', lambda report: report is not None)
+    result = svc.close_month(None, 2025, 8, progress=FakeProgress())
+    assert (result['csvUnchanged'], result['csvFiles']) == (1, 2)
+    assert (result['reused'], result['generated']) == (4, 3)
+    assert {owner for _, owner in company} == {'m2', 'm3', 'm2-e1', 'm3-e0', 'm3-e1'}
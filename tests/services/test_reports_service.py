@@ -0,0 +1,45 @@
+import hashlib
+from types import SimpleNamespace
+
+import pytest
+
+import services.reports_service as svc
+from utils.blob_store import InMemoryS3Client, S3BlobStore, set_blob_store
+
+CONTENT = bytes(range(200)) * 1000
+
+
+@pytest.fixture
+def legacy_row(monkeypatch):
+    """A report row whose bytes still sit inline in the database."""
+    set_blob_store(S3BlobStore(InMemoryS3Client(), 'bucket'))
+    row = SimpleNamespace(id='r1', path='reports/pdf/2025-08/x.pdf', type='pdf', content_type=None, content_sha256=None, size_bytes=None, content=CONTENT)
+    reads = []
+
+    def read_range(db, report_id, offset, length):
+        reads.append(length)
+        return row.content[offset:offset + length]
+
+    def mark_moved(db, report_id, digest, size):
+        row.content_sha256, row.size_bytes, row.content = digest, size, None
+
+    monkeypatch.setattr(svc, 'repo_get_report_file_by_id', lambda db, report_id: row)
+    monkeypatch.setattr(svc, 'repo_get_inline_content_size', lambda db, report_id: None if row.content is None else len(row.content))
+    monkeypatch.setattr(svc, 'repo_read_inline_content_range', read_range)
+    monkeypatch.setattr(svc, 'repo_mark_inline_content_moved', mark_moved)
+    yield row, reads
+    set_blob_store(None)
+
+
+def test_inline_content_is_moved_to_the_blob_store_once(legacy_row):
+    row, reads = legacy_row
+    first = svc.open_report_download(None, 'r1')
+    assert first.etag == f'"{hashlib.sha256(CONTENT).hexdigest()}"'
+    assert first.size == len(CONTENT)
+    assert row.content is None and row.content_sha256 == hashlib.sha256(CONTENT).hexdigest()
+    copied = len(reads)
+
+    second = svc.open_report_download(None, 'r1')
+    assert second.etag == first.etag
+    assert len(reads) == copied
+    assert b''.join(second.read_range(10, 19)) == CONTENT[10:20]
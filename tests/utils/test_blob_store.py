@@ -0,0 +1,74 @@
+import hashlib
+
+import pytest
+
+from utils.blob_store import LocalBlobStore, S3BlobStore, InMemoryS3Client
+
+
+@pytest.fixture(params=['local', 's3'])
+def store(request, tmp_path):
+    if request.param == 'local':
+        return LocalBlobStore(str(tmp_path / 'blobs'))
+    return S3BlobStore(InMemoryS3Client(), 'bucket', 'blobs/')
+
+
+def test_put_is_content_addressed_and_deduplicated(store):
+    ref1 = store.put(b'salary slip')
+    ref2 = store.put(b'salary slip')
+    assert ref1 == ref2
+    assert ref1.digest == hashlib.sha256(b'salary slip').hexdigest()
+    assert ref1.size == len(b'salary slip')
+    assert store.exists(ref1.digest)
+    assert store.get(ref1.digest) == b'salary slip'
+
+
+def test_streaming_writer_and_ranged_chunks(store):
+    with store.writer() as w:
+        for i in range(10):
+            w.write(bytes([i]) * 10)
+    ref = w.ref
+    assert ref.size == 100
+    assert b''.join(store.iter_chunks(ref.digest, start=15, end=24, chunk_size=4)) == b'\x01' * 5 + b'\x02' * 5
+
+
+def test_aborted_writer_stores_nothing(store):
+    with pytest.raises(RuntimeError):
+        with store.writer() as w:
+            w.write(b'partial')
+            raise RuntimeError('boom')
+    assert not store.exists(hashlib.sha256(b'partial').hexdigest())
+
+
+def test_missing_blob_and_delete(store):
+    ref = store.put(b'x')
+    store.delete(ref.digest)
+    assert not store.exists(ref.digest)
+    with pytest.raises(FileNotFoundError):
+        store.get(ref.digest)
+
+
+def test_local_store_exposes_path(tmp_path):
+    store = LocalBlobStore(str(tmp_path))
+    ref = store.put(b'abc')
+    assert store.local_path(ref.digest).endswith(ref.digest)
+    assert store.local_path('0' * 64) is None
+
+
+def test_s3_ranges_fetch_only_the_requested_bytes():
+    class RecordingClient(InMemoryS3Client):
+        def __init__(self):
+            super().__init__()
+            self.served = []
+
+        def get_object(self, Bucket, Key, Range=None, **kwargs):
+            obj = super().get_object(Bucket, Key, Range=Range)
+            self.served.append((Range, obj['ContentLength']))
+            return obj
+
+    client = RecordingClient()
+    store = S3BlobStore(client, 'bucket')
+    ref = store.put(bytes(range(256)) * 1024)
+    assert b''.join(store.iter_chunks(ref.digest, start=1000, end=1009)) == bytes(range(232, 242))
+    assert b''.join(store.iter_chunks(ref.digest, start=ref.size - 3)) == bytes([253, 254, 255])
+    assert list(store.iter_chunks(ref.digest, start=0, end=-1)) == []
+    assert client.served == [('bytes=1000-1009', 10), (f'bytes={ref.size - 3}-', 3)]
@@ -0,0 +1,59 @@
+import asyncio
+import io
+
+import pytest
+from fastapi import HTTPException
+
+from utils.bulk_records import bulk_format, iter_records, spool_request_body
+
+
+def records(data: bytes, fmt: str):
+    return list(iter_records(io.BytesIO(data), fmt))
+
+
+def test_bulk_format_from_content_type():
+    assert bulk_format("text/csv; charset=utf-8") == "csv"
+    assert bulk_format("application/x-ndjson") == "ndjson"
+    with pytest.raises(HTTPException) as exc:
+        bulk_format("application/json")
+    assert exc.value.status_code == 415
+
+
+def test_csv_records_carry_physical_line_numbers():
+    data = b'\xef\xbb\xbfemployeeId,year,month,note\r\na,2025,8,\r\n\r\nb,2025,8,"two\nlines"\r\nc,2025\r\n'
+    assert records(data, "csv") == [
+        (2, {"employeeId": "a", "year": "2025", "month": "8", "note": None}, None),
+        (5, {"employeeId": "b", "year": "2025", "month": "8", "note": "two\nlines"}, None),
+        (6, None, "Expected 4 columns, got 2"),
+    ]
+
+
+def test_ndjson_rejects_bad_lines_and_keeps_going():
+    data = b'{"year": 2025}\n\n[1, 2]\n{oops\n{"month": 8}\n'
+    out = records(data, "ndjson")
+    assert [(line, record) for line, record, _ in out] == [(1, {"year": 2025}), (3, None), (4, None), (5, {"month": 8})]
+    assert out[1][2] == "Expected a JSON object"
+    assert out[2][2].startswith("Invalid JSON")
+
+
+def test_invalid_utf8_aborts_upload():
+    with pytest.raises(HTTPException) as exc:
+        records(b'{"note": "\xff"}\n', "ndjson")
+    assert exc.value.status_code == 400
+
+
+class FakeRequest:
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    async def stream(self):
+        for chunk in self.chunks:
+            yield chunk
+
+
+def test_spool_request_body_enforces_limit():
+    body = asyncio.run(spool_request_body(FakeRequest([b"abc", b"def"]), max_bytes=10))
+    assert body.read() == b"abcdef"
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(spool_request_body(FakeRequest([b"abc", b"def"]), max_bytes=5))
+    assert exc.value.status_code == 413
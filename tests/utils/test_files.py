@@ -0,0 +1,33 @@
+import io
+import zipfile
+
+from utils.blob_store import LocalBlobStore
+from utils.files import write_zip, zip_bytes
+
+
+def test_zip_stores_pdfs_and_deflates_text():
+    pdf = b'%PDF-1.4' + b'x' * 2000
+    data = zip_bytes([('slip.pdf', pdf), ('summary.csv', b'a,b\n' * 500)])
+    with zipfile.ZipFile(io.BytesIO(data)) as z:
+        assert z.getinfo('slip.pdf').compress_type == zipfile.ZIP_STORED
+        assert z.getinfo('summary.csv').compress_type == zipfile.ZIP_DEFLATED
+        assert z.read('slip.pdf') == pdf
+        assert z.testzip() is None
+
+
+def test_write_zip_streams_generators_into_blob_writer(tmp_path):
+    store = LocalBlobStore(str(tmp_path / 'blobs'))
+
+    def chunks():
+        for i in range(5):
+            yield bytes([65 + i]) * 1000
+
+    with store.writer() as sink:
+        write_zip(sink, [('a.pdf', chunks()), ('b.pdf', b'second')])
+    ref = sink.ref
+    with zipfile.ZipFile(io.BytesIO(store.get(ref.digest))) as z:
+        assert z.namelist() == ['a.pdf', 'b.pdf']
+        assert z.read('a.pdf') == b''.join(bytes([65 + i]) * 1000 for i in range(5))
+        assert z.read('b.pdf') == b'second'
+        assert z.testzip() is None
+    assert ref.size == len(store.get(ref.digest))
@@ -0,0 +1,34 @@
+import pytest
+from fastapi import HTTPException
+
+from utils.http_range import etag_matches, parse_range
+
+
+@pytest.mark.parametrize('header,expected', [
+    (None, None),
+    ('bytes=0-4', (0, 4)),
+    ('bytes=5-', (5, 9)),
+    ('bytes=-3', (7, 9)),
+    ('bytes=2-100', (2, 9)),
+    ('bytes=0-1,4-5', None),
+    ('items=0-4', None),
+    ('bytes=abc', None),
+    ('bytes=6-2', None),
+])
+def test_parse_range(header, expected):
+    assert parse_range(header, 10) == expected
+
+
+def test_parse_range_unsatisfiable():
+    with pytest.raises(HTTPException) as exc:
+        parse_range('bytes=10-', 10)
+    assert exc.value.status_code == 416
+    assert exc.value.headers['Content-Range'] == 'bytes */10'
+
+
+def test_etag_matches():
+    assert etag_matches('"a", "b"', '"b"')
+    assert etag_matches('W/"a"', '"a"')
+    assert etag_matches('*', '"a"')
+    assert not etag_matches(None, '"a"')
+    assert not etag_matches('"c"', '"a"')
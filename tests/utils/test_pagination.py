@@ -0,0 +1,26 @@
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from utils.pagination import encode_cursor, decode_cursor, next_cursor
+
+
+def test_cursor_round_trip():
+    ts = datetime(2025, 8, 1, 12, 30, tzinfo=timezone.utc)
+    rid = uuid.uuid4()
+    assert decode_cursor(encode_cursor(ts, rid)) == (ts, rid)
+
+
+def test_decode_invalid_cursor_raises_400():
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor('not-a-cursor')
+    assert exc.value.status_code == 400
+
+
+def test_next_cursor_only_when_page_is_full():
+    ts = datetime(2025, 8, 1, tzinfo=timezone.utc)
+    items = [{'created_at': ts, 'id': uuid.uuid4()} for _ in range(2)]
+    assert next_cursor(items, 3) is None
+    assert decode_cursor(next_cursor(items, 2)) == (ts, items[-1]['id'])
@@ -0,0 +1,59 @@
+import io
+
+from PyPDF2 import PdfReader
+
+from utils.pdf import render_salary_pdf, build_salary_pdf, slip_fingerprint
+
+
+def sample():
+    return {'year': 2025, 'month': 8, 'employee_id': 'emp-1', 'name': 'Ana Pop', 'cnp': '1234567890123', 'base_salary': '5000.00'}
+
+
+def test_render_salary_pdf_is_encrypted_with_cnp():
+    reader = PdfReader(io.BytesIO(render_salary_pdf(sample())))
+    assert reader.is_encrypted
+    assert reader.decrypt('wrong') == 0
+    assert reader.decrypt('1234567890123') != 0
+    text = reader.pages[0].extract_text()
+    assert 'Salary Slip - 2025-8' in text
+    assert 'Name: Ana Pop' in text
+
+
+def test_build_salary_pdf_writes_file(tmp_path):
+    path = tmp_path / 'pdf' / 'slip.pdf'
+    build_salary_pdf(str(path), sample())
+    assert path.read_bytes().startswith(b'%PDF')
+
+
+def test_template_stamp_matches_dynamic_layout():
+    from utils.pdf import get_slip_template, _new_slip_canvas, _render_salary_pdf_dynamic
+    data = {**sample(), 'name': 'Ana (Pop) é'}
+    c = _new_slip_canvas(io.BytesIO())
+    _render_salary_pdf_dynamic(c, data)
+    assert get_slip_template().stamp(data) == c._code[-1]
+
+
+def test_template_falls_back_for_unencodable_values():
+    from utils.pdf import get_slip_template
+    assert get_slip_template().stamp({**sample(), 'name': 'Ștefan'}) is None
+    reader = PdfReader(io.BytesIO(render_salary_pdf({**sample(), 'name': 'Ștefan'})))
+    reader.decrypt('1234567890123')
+    assert 'Cnp: 1234567890123' in reader.pages[0].extract_text()
+
+
+def test_template_cache_keyed_by_layout_version():
+    from utils.pdf import get_slip_template, clear_slip_template_cache, SLIP_LAYOUT_VERSION
+    clear_slip_template_cache()
+    current = get_slip_template()
+    assert get_slip_template() is current
+    other = get_slip_template(SLIP_LAYOUT_VERSION + 1)
+    assert other.version == SLIP_LAYOUT_VERSION + 1
+    assert get_slip_template() is not current
+
+
+def test_slip_fingerprint_tracks_payload_and_layout_version():
+    from datetime import date
+    data = {**sample(), 'hire_date': date(2020, 1, 1)}
+    assert slip_fingerprint(data) == slip_fingerprint(dict(reversed(list(data.items()))))
+    assert slip_fingerprint(data) != slip_fingerprint({**data, 'base_salary': '5000.01'})
+    assert slip_fingerprint(data) != slip_fingerprint(data, version=99)
@@ -0,0 +1,49 @@
+from utils.pdf_render import render_salary_pdfs, resolve_workers, shutdown_render_pool
+from utils.process_pool import get_process_pool
+
+
+def payload(idx: int):
+    return {
+        'year': 2025,
+        'month': 8,
+        'employee_id': f'emp-{idx}',
+        'name': f'First{idx} Last{idx}',
+        'cnp': f'{idx:013d}',
+        'base_salary': '5000.00',
+        'gross_salary': '5000.00',
+    }
+
+
+def test_render_inline_for_small_batch():
+    batch = render_salary_pdfs([payload(1), payload(2)], max_workers=4)
+    assert batch.workers == 1
+    assert [s.index for s in batch.slips] == [0, 1]
+    assert all(s.content.startswith(b'%PDF') for s in batch.slips)
+
+
+def test_render_parallel_preserves_order():
+    payloads = [payload(i) for i in range(6)]
+    try:
+        batch = render_salary_pdfs(payloads, max_workers=2)
+    finally:
+        shutdown_render_pool()
+    assert batch.workers == 2
+    assert len(batch.slips) == 6
+    assert [s.index for s in batch.slips] == list(range(6))
+    stats = batch.stats()
+    assert stats['slips'] == 6
+    assert stats['maxSlipMs'] >= stats['avgSlipMs'] > 0
+
+
+def test_resolve_workers_prefers_explicit_value():
+    assert resolve_workers(3) == 3
+    assert resolve_workers() >= 1
+
+
+def test_process_pool_is_not_replaced_for_a_larger_batch():
+    try:
+        pool = get_process_pool(1)
+        assert get_process_pool(resolve_workers() + 4) is pool
+        assert pool.submit(abs, -3).result() == 3
+    finally:
+        shutdown_render_pool()
@@ -1,4 +1,4 @@
-from utils.security import hash_password, verify_password, generate_refresh_token, create_access_token, decode_token
+from utils.security import hash_password, hash_passwords, verify_password, generate_refresh_token, create_access_token, decode_token
 import re
 
 def test_password_hash_and_verify():
@@ -20,3 +20,9 @@ def test_access_token_round_trip():
     assert decoded['sub'] == 'subject-1'
     assert decoded['role'] == 'manager'
     assert 'exp' in decoded
+
+
+def test_hash_passwords_preserves_order():
+    hashes = hash_passwords(['first', 'second'])
+    assert verify_password('first', hashes[0])
+    assert verify_password('second', hashes[1])
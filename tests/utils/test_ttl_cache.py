@@ -0,0 +1,77 @@
+from utils.ttl_cache import TTLCache, cache_stats, clear_caches
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_after_ttl():
+    clock = Clock()
+    cache = TTLCache('test_expiry', maxsize=4, ttl=10, clock=clock)
+    cache.set('a', 1)
+    clock.now = 9.9
+    assert cache.get('a') == 1
+    clock.now = 10.0
+    assert cache.get('a') is None
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.stats()['size'] == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache('test_lru', maxsize=2, ttl=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+    assert cache.get('b') is None
+    assert (cache.get('a'), cache.get('c')) == (1, 3)
+    assert cache.evictions == 1
+
+
+def test_get_or_load_does_not_cache_none_and_invalidates():
+    cache = TTLCache('test_load', maxsize=4, ttl=60)
+    calls = []
+
+    def load(value):
+        calls.append(value)
+        return value
+
+    assert cache.get_or_load('k', lambda: load(None)) is None
+    assert cache.get_or_load('k', lambda: load(5)) == 5
+    assert cache.get_or_load('k', lambda: load(6)) == 5
+    cache.invalidate('k', 'unknown')
+    assert cache.get_or_load('k', lambda: load(7)) == 7
+    assert calls == [None, 5, 7]
+
+
+def test_load_racing_an_invalidation_is_not_cached():
+    cache = TTLCache('test_race', maxsize=4, ttl=60)
+
+    def stale_load():
+        # A writer commits and invalidates while this reader still holds the old row
+        cache.invalidate('k')
+        return 'old'
+
+    assert cache.get_or_load('k', stale_load) == 'old'
+    assert cache.get_or_load('k', lambda: 'new') == 'new'
+    assert cache.get('k') == 'new'
+
+
+def test_disabled_cache_always_misses():
+    cache = TTLCache('test_disabled', maxsize=4, ttl=0)
+    cache.set('a', 1)
+    assert cache.get('a') is None
+
+
+def test_registry_reports_and_clears_every_cache():
+    cache = TTLCache('test_registry', maxsize=4, ttl=60)
+    cache.set('a', 1)
+    cache.get('a')
+    assert cache_stats()['test_registry']['hitRatio'] == 1.0
+    clear_caches()
+    assert cache.get('a') is None
+    assert cache_stats()['test_registry']['hits'] == 1
@@ -0,0 +1,315 @@
+"""Content-addressed blob storage for generated report bytes.
+
+Blobs are keyed by the hex SHA-256 of their content, so storing the same bytes twice
+(e.g. a slip and its archived copy) keeps a single object. ``ReportFile`` rows only
+reference the digest.
+
+Backends:
+1. LocalBlobStore – files under ``<root>/<ab>/<cd>/<digest>`` (default).
+2. S3BlobStore – any client exposing the boto3 ``put_object/get_object/head_object/delete_object``
+   calls. ``InMemoryS3Client`` is a local stand-in for tests and development.
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+import tempfile
+import threading
+from dataclasses import dataclass
+from typing import BinaryIO, Dict, Iterator
+
+from core.settings import settings
+
+CHUNK_SIZE = 64 * 1024
+
+
+@dataclass(frozen=True)
+class BlobRef:
+    digest: str
+    size: int
+
+
+class BlobWriter(io.RawIOBase):
+    """Writable sink that hashes while writing and commits the blob on close.
+
+    After ``close()`` the ``ref`` attribute holds the digest and size.
+    """
+
+    def __init__(self, store: "BlobStore"):
+        self._store = store
+        self._hash = hashlib.sha256()
+        self._size = 0
+        self._tmp = store._open_staging()
+        self.ref: BlobRef | None = None
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        data = bytes(b)
+        self._hash.update(data)
+        self._size += len(data)
+        self._tmp.write(data)
+        return len(data)
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        try:
+            self.ref = BlobRef(self._hash.hexdigest(), self._size)
+            self._store._commit_staging(self._tmp, self.ref)
+        finally:
+            super().close()
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+
+    def abort(self) -> None:
+        """Discard everything written so far."""
+        if not self.closed:
+            self._store._discard_staging(self._tmp)
+            super().close()
+
+
+class BlobStore:
+    """Interface shared by blob storage backends."""
+
+    def put(self, data: bytes) -> BlobRef:
+        with self.writer() as w:
+            w.write(data)
+        return w.ref
+
+    def writer(self) -> BlobWriter:
+        return BlobWriter(self)
+
+    def get(self, digest: str) -> bytes:
+        with self.open(digest) as f:
+            return f.read()
+
+    def iter_chunks(self, digest: str, start: int = 0, end: int | None = None, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """Yield the blob bytes in ``[start, end]`` (inclusive) in chunks."""
+        with self.open(digest) as f:
+            f.seek(start)
+            remaining = None if end is None else end - start + 1
+            while remaining is None or remaining > 0:
+                chunk = f.read(chunk_size if remaining is None else min(chunk_size, remaining))
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+
+    def local_path(self, digest: str) -> str | None:
+        """Filesystem path of the blob when the backend keeps one (enables sendfile)."""
+        return None
+
+    # Backend hooks
+    def open(self, digest: str) -> BinaryIO:  # pragma: no cover - interface
+        raise NotImplementedError
+
+    def exists(self, digest: str) -> bool:  # pragma: no cover - interface
+        raise NotImplementedError
+
+    def delete(self, digest: str) -> None:  # pragma: no cover - interface
+        raise NotImplementedError
+
+    def _open_staging(self) -> BinaryIO:
+        return tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024)
+
+    def _commit_staging(self, tmp: BinaryIO, ref: BlobRef) -> None:  # pragma: no cover - interface
+        raise NotImplementedError
+
+    def _discard_staging(self, tmp: BinaryIO) -> None:
+        tmp.close()
+
+
+class LocalBlobStore(BlobStore):
+    def __init__(self, root: str):
+        self.root = root
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest[2:4], digest)
+
+    def open(self, digest: str) -> BinaryIO:
+        try:
+            return open(self._path(digest), 'rb')
+        except FileNotFoundError as e:
+            raise FileNotFoundError(f"Blob not found: {digest}") from e
+
+    def exists(self, digest: str) -> bool:
+        return os.path.exists(self._path(digest))
+
+    def delete(self, digest: str) -> None:
+        try:
+            os.remove(self._path(digest))
+        except FileNotFoundError:
+            pass
+
+    def local_path(self, digest: str) -> str | None:
+        path = self._path(digest)
+        return path if os.path.exists(path) else None
+
+    def _open_staging(self) -> BinaryIO:
+        staging = os.path.join(self.root, 'tmp')
+        os.makedirs(staging, exist_ok=True)
+        return tempfile.NamedTemporaryFile(dir=staging, delete=False)
+
+    def _commit_staging(self, tmp: BinaryIO, ref: BlobRef) -> None:
+        tmp.close()
+        target = self._path(ref.digest)
+        if os.path.exists(target):
+            # Same content already stored; keep the existing object
+            os.remove(tmp.name)
+            return
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.replace(tmp.name, target)
+
+    def _discard_staging(self, tmp: BinaryIO) -> None:
+        tmp.close()
+        try:
+            os.remove(tmp.name)
+        except FileNotFoundError:
+            pass
+
+
+class S3BlobStore(BlobStore):
+    """Blob store over an S3-compatible client (boto3 client or a local stand-in)."""
+
+    def __init__(self, client, bucket: str, prefix: str = ""):
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix
+
+    def _key(self, digest: str) -> str:
+        return f"{self.prefix}{digest}"
+
+    def _is_missing(self, exc: Exception) -> bool:
+        if isinstance(exc, (KeyError, FileNotFoundError)):
+            return True
+        code = getattr(exc, 'response', {}).get('Error', {}).get('Code')
+        return code in {'404', 'NoSuchKey', 'NotFound'}
+
+    def _get_object(self, digest: str, **kwargs) -> dict:
+        try:
+            return self.client.get_object(Bucket=self.bucket, Key=self._key(digest), **kwargs)
+        except Exception as e:
+            if self._is_missing(e):
+                raise FileNotFoundError(f"Blob not found: {digest}") from e
+            raise
+
+    def open(self, digest: str) -> BinaryIO:
+        """Streaming (not seekable) body of the whole object; use iter_chunks for byte ranges."""
+        return self._get_object(digest)['Body']
+
+    def get(self, digest: str) -> bytes:
+        body = self.open(digest)
+        try:
+            return body.read()
+        finally:
+            body.close()
+
+    def iter_chunks(self, digest: str, start: int = 0, end: int | None = None, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """Ranged GetObject: only ``[start, end]`` is transferred, streamed off the response body."""
+        if end is not None and end < start:
+            return
+        kwargs = {} if start == 0 and end is None else {'Range': f"bytes={start}-{'' if end is None else end}"}
+        body = self._get_object(digest, **kwargs)['Body']
+        try:
+            for chunk in iter(lambda: body.read(chunk_size), b''):
+                yield chunk
+        finally:
+            body.close()
+
+    def exists(self, digest: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self._key(digest))
+            return True
+        except Exception as e:
+            if self._is_missing(e):
+                return False
+            raise
+
+    def delete(self, digest: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=self._key(digest))
+
+    def _commit_staging(self, tmp: BinaryIO, ref: BlobRef) -> None:
+        try:
+            if not self.exists(ref.digest):
+                tmp.seek(0)
+                self.client.put_object(Bucket=self.bucket, Key=self._key(ref.digest), Body=tmp, ContentLength=ref.size)
+        finally:
+            tmp.close()
+
+
+class InMemoryS3Client:
+    """Minimal S3 API stand-in backed by a dict (tests / local development)."""
+
+    def __init__(self):
+        self.objects: Dict[tuple[str, str], bytes] = {}
+
+    def put_object(self, Bucket: str, Key: str, Body, **kwargs):
+        self.objects[(Bucket, Key)] = Body if isinstance(Body, bytes) else Body.read()
+        return {}
+
+    def get_object(self, Bucket: str, Key: str, Range: str | None = None, **kwargs):
+        data = self.objects[(Bucket, Key)]
+        if Range:
+            start, _, end = Range.removeprefix('bytes=').partition('-')
+            data = data[int(start):int(end) + 1 if end else None]
+        return {'Body': io.BytesIO(data), 'ContentLength': len(data)}
+
+    def head_object(self, Bucket: str, Key: str, **kwargs):
+        return {'ContentLength': len(self.objects[(Bucket, Key)])}
+
+    def delete_object(self, Bucket: str, Key: str, **kwargs):
+        self.objects.pop((Bucket, Key), None)
+        return {}
+
+
+_store: BlobStore | None = None
+_store_lock = threading.Lock()
+
+
+def _build_store_from_settings() -> BlobStore:
+    backend = (settings.BLOB_STORE_BACKEND or 'local').lower()
+    if backend == 'local':
+        return LocalBlobStore(settings.BLOB_STORE_ROOT)
+    if backend == 's3':
+        if not settings.S3_BUCKET:
+            raise RuntimeError("S3_BUCKET must be set when BLOB_STORE_BACKEND=s3")
+        try:
+            import boto3
+        except ImportError as e:  # pragma: no cover - optional dependency
+            raise RuntimeError("BLOB_STORE_BACKEND=s3 requires boto3 to be installed") from e
+        client = boto3.client('s3', endpoint_url=settings.S3_ENDPOINT_URL)
+        return S3BlobStore(client, settings.S3_BUCKET, settings.S3_PREFIX)
+    if backend == 'memory':
+        return S3BlobStore(InMemoryS3Client(), 'local')
+    raise RuntimeError(f"Unknown BLOB_STORE_BACKEND: {backend}")
+
+
+def get_blob_store() -> BlobStore:
+    """Return the process-wide blob store configured in settings."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = _build_store_from_settings()
+    return _store
+
+
+def set_blob_store(store: BlobStore | None) -> None:
+    """Override the process-wide store (tests, scripts). None re-reads settings on next use."""
+    global _store
+    with _store_lock:
+        _store = store
+
+
+__all__ = [
+    "BlobRef", "BlobWriter", "BlobStore", "LocalBlobStore", "S3BlobStore", "InMemoryS3Client",
+    "get_blob_store", "set_blob_store",
+]
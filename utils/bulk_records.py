@@ -0,0 +1,110 @@
+"""Streaming readers for bulk CSV / NDJSON uploads.
+
+Uploads are sent as the raw request body (``Content-Type: text/csv`` or
+``application/x-ndjson``), spooled to a temporary file and then read one record at a
+time, so a large import never has to fit in memory as a single string.
+"""
+import csv
+import io
+import json
+import tempfile
+from typing import IO, Iterator
+
+from fastapi import HTTPException, Request
+from pydantic import ValidationError
+
+BULK_CONTENT_TYPES = {
+    "text/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+SPOOL_MEMORY_BYTES = 1024 * 1024  # Larger uploads roll over to disk
+
+
+def bulk_format(content_type: str | None) -> str:
+    """Map a Content-Type header to 'csv' or 'ndjson', or raise HTTP 415."""
+    media_type = (content_type or "").split(";", 1)[0].strip().lower()
+    fmt = BULK_CONTENT_TYPES.get(media_type)
+    if fmt is None:
+        raise HTTPException(status_code=415, detail=f"Bulk uploads must be one of: {', '.join(BULK_CONTENT_TYPES)}")
+    return fmt
+
+
+async def spool_request_body(request: Request, max_bytes: int) -> IO[bytes]:
+    """Copy the streamed request body into a temporary file (HTTP 413 past ``max_bytes``)."""
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MEMORY_BYTES)
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > max_bytes:
+            spool.close()
+            raise HTTPException(status_code=413, detail=f"Upload exceeds {max_bytes} bytes")
+        spool.write(chunk)
+    spool.seek(0)
+    return spool
+
+
+def describe_validation_error(error: ValidationError) -> str:
+    """One-line reject reason for a record that failed schema validation."""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc']) or 'record'}: {err['msg']}" for err in error.errors()
+    )
+
+
+def iter_records(fileobj: IO[bytes], fmt: str) -> Iterator[tuple[int, dict | None, str | None]]:
+    """Yield ``(line, record, error)`` for each record of a binary CSV or NDJSON stream.
+
+    CSV needs a header row; empty cells become None. Blank NDJSON lines are skipped.
+    A record that cannot be parsed is yielded with ``record=None`` and the reason, so the
+    caller can reject that line and keep going. Invalid UTF-8 aborts the upload (HTTP 400).
+    """
+    text = io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline="")
+    try:
+        if fmt == "csv":
+            yield from _iter_csv(text)
+        elif fmt == "ndjson":
+            yield from _iter_ndjson(text)
+        else:
+            raise ValueError(f"Unknown bulk format: {fmt}")
+    except UnicodeDecodeError as e:
+        raise HTTPException(status_code=400, detail="Upload is not valid UTF-8") from e
+    finally:
+        text.detach()
+
+
+def _iter_csv(text: IO[str]) -> Iterator[tuple[int, dict | None, str | None]]:
+    reader = csv.reader(text)
+    header = next(reader, None)
+    if not header:
+        return
+    header = [name.strip() for name in header]
+    while True:
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as e:
+            yield reader.line_num, None, f"Malformed CSV: {e}"
+            continue
+        if not any(cell.strip() for cell in row):
+            continue
+        if len(row) != len(header):
+            yield reader.line_num, None, f"Expected {len(header)} columns, got {len(row)}"
+            continue
+        yield reader.line_num, {name: (cell.strip() or None) for name, cell in zip(header, row)}, None
+
+
+def _iter_ndjson(text: IO[str]) -> Iterator[tuple[int, dict | None, str | None]]:
+    for line_no, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_no, None, f"Invalid JSON: {e.msg}"
+            continue
+        if not isinstance(record, dict):
+            yield line_no, None, "Expected a JSON object"
+            continue
+        yield line_no, record, None
@@ -1,5 +1,13 @@
-import os, csv, zipfile
-from typing import Iterable
+import os, csv, io, time, zipfile
+from typing import BinaryIO, Iterable, Union
+
+# Formats that are already compressed: DEFLATE burns CPU for (almost) no size gain
+STORED_EXTENSIONS = {'.pdf', '.zip', '.gz', '.png', '.jpg', '.jpeg'}
+
+ZipContent = Union[bytes, Iterable[bytes]]
+
+def zip_compression_for(arcname: str) -> int:
+    return zipfile.ZIP_STORED if os.path.splitext(arcname)[1].lower() in STORED_EXTENSIONS else zipfile.ZIP_DEFLATED
 
 def ensure_dir(path: str):
     os.makedirs(path, exist_ok=True)
@@ -14,10 +22,43 @@ def write_csv(path: str, headers: list[str], rows: Iterable[Iterable]):
             writer.writerow(row)
     return path
 
+def csv_bytes(headers: list[str], rows: Iterable[Iterable]) -> bytes:
+    """Render a CSV document in memory (same dialect as write_csv)."""
+    buffer = io.StringIO(newline='')
+    writer = csv.writer(buffer)
+    writer.writerow(headers)
+    for row in rows:
+        writer.writerow(row)
+    return buffer.getvalue().encode('utf-8')
+
+def write_zip(sink: BinaryIO, entries: Iterable[tuple[str, ZipContent]]) -> BinaryIO:
+    """Stream a ZIP archive into ``sink`` from (arcname, content) pairs.
+
+    ``content`` is either bytes or an iterable of byte chunks, so entries can be produced
+    lazily. The sink does not need to be seekable (sizes/CRCs go into data descriptors),
+    which lets the archive flow straight into a BlobWriter without ever being held in memory.
+    Already compressed formats (see STORED_EXTENSIONS) are stored, everything else deflated.
+    """
+    with zipfile.ZipFile(sink, 'w', zipfile.ZIP_DEFLATED) as z:
+        for arcname, content in entries:
+            info = zipfile.ZipInfo(arcname, date_time=time.localtime()[:6])
+            info.compress_type = zip_compression_for(arcname)
+            chunks = [content] if isinstance(content, (bytes, bytearray, memoryview)) else content
+            with z.open(info, 'w') as dest:
+                for chunk in chunks:
+                    dest.write(chunk)
+    return sink
+
+def zip_bytes(entries: Iterable[tuple[str, ZipContent]]) -> bytes:
+    """Build a ZIP archive in memory from (arcname, content) pairs."""
+    buffer = io.BytesIO()
+    write_zip(buffer, entries)
+    return buffer.getvalue()
+
 def zip_paths(paths: list[str], zip_path: str):
     ensure_dir(os.path.dirname(zip_path))
     with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as z:
         for p in paths:
             arcname = os.path.basename(p)
-            z.write(p, arcname)
+            z.write(p, arcname, compress_type=zip_compression_for(arcname))
     return zip_path
@@ -0,0 +1,50 @@
+"""HTTP conditional and range request helpers for file downloads."""
+from fastapi import HTTPException
+
+
+def parse_range(header: str | None, size: int) -> tuple[int, int] | None:
+    """Parse a single ``Range: bytes=`` header into an inclusive (start, end) pair.
+
+    Returns None when there is no usable range (serve the full body). Multi-range
+    requests are answered with the full body, which RFC 9110 allows. Unsatisfiable
+    ranges raise HTTP 416.
+    """
+    if not header:
+        return None
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = spec.strip().partition("-")
+    if not sep:
+        return None
+    try:
+        if first == "":
+            # Suffix range: last N bytes
+            length = int(last)
+            if length <= 0:
+                raise ValueError
+            start, end = max(size - length, 0), size - 1
+        else:
+            start = int(first)
+            end = int(last) if last else size - 1
+            end = min(end, size - 1)
+            if start > end and start < size:
+                return None  # Syntactically invalid (e.g. 10-5): ignore per RFC
+    except ValueError:
+        return None
+    if start >= size or start < 0:
+        raise HTTPException(status_code=416, detail="Requested range not satisfiable", headers={"Content-Range": f"bytes */{size}"})
+    return start, end
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against our ETag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    bare = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == bare for candidate in if_none_match.split(","))
+
+
+__all__ = ["parse_range", "etag_matches"]
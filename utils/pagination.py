@@ -0,0 +1,46 @@
+"""Keyset (cursor) pagination helpers.
+
+Cursors are opaque, URL-safe tokens encoding the ``(created_at, id)`` of the last
+row of a page. Listings are ordered newest first on that pair, so the next page is
+everything strictly "before" the cursor.
+"""
+import base64
+import uuid
+from datetime import datetime
+from typing import Any, Sequence
+
+from fastapi import HTTPException
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(created_at: datetime, row_id: Any) -> str:
+    raw = f"{created_at.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    """Decode a cursor produced by encode_cursor or raise HTTP 400."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_raw, id_raw = base64.urlsafe_b64decode(padded.encode()).decode().split("|", 1)
+        return datetime.fromisoformat(created_raw), uuid.UUID(id_raw)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from e
+
+
+def _field(item: Any, name: str):
+    if isinstance(item, dict):
+        return item[name]
+    return getattr(item, name)
+
+
+def next_cursor(items: Sequence[Any], limit: int) -> str | None:
+    """Cursor for the page following ``items`` (None when this is the last page)."""
+    if not items or len(items) < limit:
+        return None
+    last = items[-1]
+    return encode_cursor(_field(last, "created_at"), _field(last, "id"))
+
+
+__all__ = ["NEXT_CURSOR_HEADER", "encode_cursor", "decode_cursor", "next_cursor"]
@@ -1,33 +1,164 @@
 from reportlab.lib.pagesizes import A4
+from reportlab.lib.pdfencrypt import StandardEncryption
+from reportlab.lib.rl_accel import escapePDF
+from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfgen import canvas
 from reportlab.lib.units import mm
-from PyPDF2 import PdfReader, PdfWriter
-import os, io
+import os, io, threading, hashlib, json
+from dataclasses import dataclass
 from typing import Dict
 from utils.files import ensure_dir
 
-def build_salary_pdf(path: str, data: Dict):
-    ensure_dir(os.path.dirname(path))
-    buffer = io.BytesIO()
-    c = canvas.Canvas(buffer, pagesize=A4)
+# Bump whenever the slip layout (fields, labels, fonts, positions) changes so cached
+# templates are rebuilt and previously rendered slips can be told apart.
+SLIP_LAYOUT_VERSION = 1
+SLIP_FIELDS = ['employee_id','name','cnp','hire_date','manager_name','base_salary','bonus_total','adjustment_total','gross_salary','working_days','vacation_days']
+SLIP_FONT = 'Helvetica'
+SLIP_FONT_SIZE = 12
+
+_TEXT_LINE_END = ') Tj T*'
+
+
+@dataclass(frozen=True)
+class SlipTemplate:
+    """Precompiled content-stream skeleton for a salary slip.
+
+    Labels, font selection and text positioning are formatted once; stamping only
+    escapes the per-employee values and joins the cached segments.
+    """
+    version: int
+    head: str
+    title: str
+    blank: str
+    labels: Dict[str, str]
+
+    def stamp(self, data: Dict) -> str | None:
+        """Return the page content stream for ``data``.
+
+        Returns None when a value cannot be expressed in the template font encoding;
+        callers then fall back to the fully dynamic renderer.
+        """
+        title = _encode_value(f"{data['year']}-{data['month']}")
+        if title is None:
+            return None
+        parts = [self.head, f"{self.title}{title}{_TEXT_LINE_END}", self.blank]
+        for key in SLIP_FIELDS:
+            if key in data:
+                value = _encode_value(str(data[key]))
+                if value is None:
+                    return None
+                parts.append(f"{self.labels[key]}{value}{_TEXT_LINE_END}")
+        parts.append('ET')
+        return ' '.join(parts)
+
+
+def _encode_value(text: str) -> str | None:
+    font = pdfmetrics.getFont(SLIP_FONT)
+    chunks = pdfmetrics.unicode2T1(text, [font] + font.substitutionFonts)
+    if any(f is not font for f, _ in chunks):
+        return None
+    return ''.join(escapePDF(t) for _, t in chunks)
+
+
+def _new_slip_canvas(buffer: io.BytesIO, encryption=None) -> canvas.Canvas:
+    c = canvas.Canvas(buffer, pagesize=A4, encrypt=encryption)
+    # Registers the slip font first so its internal resource name is stable across documents
+    c.setFont(SLIP_FONT, SLIP_FONT_SIZE)
+    return c
+
+
+def _text_code(c: canvas.Canvas, line: str | None = None) -> str:
+    textobject = c.beginText(20*mm, 270*mm)
+    textobject.setFont(SLIP_FONT, SLIP_FONT_SIZE)
+    if line is not None:
+        textobject.textLine(line)
+    return textobject.getCode()
+
+
+def _build_slip_template(version: int) -> SlipTemplate:
+    c = _new_slip_canvas(io.BytesIO())
+    head = _text_code(c)[:-len(' ET')]
+
+    def line_prefix(label: str) -> str:
+        code = _text_code(c, label)[len(head) + 1:-len(' ET')]
+        if not code.endswith(_TEXT_LINE_END):  # pragma: no cover - guards ReportLab output changes
+            raise RuntimeError(f"Unexpected text operator layout: {code!r}")
+        return code[:-len(_TEXT_LINE_END)]
+
+    return SlipTemplate(
+        version=version,
+        head=head,
+        title=line_prefix("Salary Slip - "),
+        blank=_text_code(c, "")[len(head) + 1:-len(' ET')],
+        labels={key: line_prefix(f"{key.replace('_',' ').title()}: ") for key in SLIP_FIELDS},
+    )
+
+
+_template_cache: Dict[int, SlipTemplate] = {}
+_template_lock = threading.Lock()
+
+
+def get_slip_template(version: int = SLIP_LAYOUT_VERSION) -> SlipTemplate:
+    """Return the cached template for ``version``, dropping templates of other versions."""
+    template = _template_cache.get(version)
+    if template is None:
+        with _template_lock:
+            template = _template_cache.get(version)
+            if template is None:
+                template = _build_slip_template(version)
+                _template_cache.clear()
+                _template_cache[version] = template
+    return template
+
+
+def clear_slip_template_cache():
+    with _template_lock:
+        _template_cache.clear()
+
+
+def slip_fingerprint(data: Dict, version: int = SLIP_LAYOUT_VERSION) -> str:
+    """SHA-256 over the exact render input and the layout version.
+
+    Two slips with the same fingerprint render identically, so a stored slip whose
+    fingerprint matches the current payload does not need to be rendered again.
+    """
+    canonical = json.dumps(data, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(f"v{version}:{canonical}".encode('utf-8')).hexdigest()
+
+
+def _render_salary_pdf_dynamic(c: canvas.Canvas, data: Dict):
     textobject = c.beginText(20*mm, 270*mm)
-    textobject.setFont('Helvetica', 12)
+    textobject.setFont(SLIP_FONT, SLIP_FONT_SIZE)
     textobject.textLine(f"Salary Slip - {data['year']}-{data['month']}")
     textobject.textLine("")
-    for key in ['employee_id','name','cnp','hire_date','manager_name','base_salary','bonus_total','adjustment_total','gross_salary','working_days','vacation_days']:
+    for key in SLIP_FIELDS:
         if key in data:
             textobject.textLine(f"{key.replace('_',' ').title()}: {data[key]}")
     c.drawText(textobject)
+
+
+def render_salary_pdf(data: Dict) -> bytes:
+    """Render a password protected salary slip and return the PDF bytes.
+
+    Encryption is applied by ReportLab while the document is written, so the page
+    is produced in a single pass (no re-parse/copy through PyPDF2). The page content
+    is stamped into the cached slip template.
+    """
+    password = data.get('cnp') or 'password'
+    encryption = StandardEncryption(password, ownerPassword=password, strength=128)
+    buffer = io.BytesIO()
+    c = _new_slip_canvas(buffer, encryption)
+    stream = get_slip_template().stamp(data)
+    if stream is None:
+        _render_salary_pdf_dynamic(c, data)
+    else:
+        c.addLiteral(stream)
     c.showPage()
     c.save()
-    # password protect
-    unprotected_pdf = buffer.getvalue()
-    reader = PdfReader(io.BytesIO(unprotected_pdf))
-    writer = PdfWriter()
-    for page in reader.pages:
-        writer.add_page(page)
-    password = data.get('cnp') or 'password'
-    writer.encrypt(password)
+    return buffer.getvalue()
+
+def build_salary_pdf(path: str, data: Dict):
+    ensure_dir(os.path.dirname(path))
     with open(path, 'wb') as f:
-        writer.write(f)
+        f.write(render_salary_pdf(data))
     return path
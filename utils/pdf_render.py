@@ -0,0 +1,81 @@
+"""Parallel salary slip rendering engine.
+
+Slip rendering (ReportLab drawing + encryption) is CPU bound, so large batches are
+fanned out over the shared process pool (utils.process_pool). Small batches are
+rendered inline because starting worker processes costs more than it saves.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence
+
+from utils.pdf import render_salary_pdf
+from utils.process_pool import get_process_pool, resolve_workers, shutdown_process_pool
+
+logger = logging.getLogger(__name__)
+
+# Below this many slips the batch is rendered in the calling process.
+MIN_PARALLEL_BATCH = 4
+
+
+@dataclass
+class RenderedSlip:
+    index: int
+    content: bytes
+    elapsed_ms: float
+
+
+@dataclass
+class RenderBatch:
+    slips: List[RenderedSlip] = field(default_factory=list)
+    workers: int = 1
+    wall_ms: float = 0.0
+
+    def stats(self) -> dict:
+        """Timing summary suitable for API responses and logs."""
+        timings = [s.elapsed_ms for s in self.slips]
+        return {
+            "workers": self.workers,
+            "slips": len(timings),
+            "wallMs": round(self.wall_ms, 1),
+            "avgSlipMs": round(sum(timings) / len(timings), 1) if timings else 0.0,
+            "maxSlipMs": round(max(timings), 1) if timings else 0.0,
+        }
+
+
+def _render_timed(payload: Dict) -> tuple[bytes, float]:
+    start = time.perf_counter()
+    content = render_salary_pdf(payload)
+    return content, (time.perf_counter() - start) * 1000
+
+
+shutdown_render_pool = shutdown_process_pool
+
+
+def render_salary_pdfs(payloads: Sequence[Dict], max_workers: int | None = None) -> RenderBatch:
+    """Render one slip per payload, preserving input order in the returned batch."""
+    workers = min(resolve_workers(max_workers), max(1, len(payloads)))
+    start = time.perf_counter()
+    batch = RenderBatch(workers=workers)
+    if workers == 1 or len(payloads) < MIN_PARALLEL_BATCH:
+        batch.workers = 1
+        results = map(_render_timed, payloads)
+    else:
+        executor = get_process_pool(workers)
+        chunksize = max(1, len(payloads) // (workers * 4))
+        results = executor.map(_render_timed, payloads, chunksize=chunksize)
+    for index, (content, elapsed_ms) in enumerate(results):
+        logger.debug(f"Rendered slip index={index} elapsed_ms={elapsed_ms:.1f}")
+        batch.slips.append(RenderedSlip(index=index, content=content, elapsed_ms=elapsed_ms))
+    batch.wall_ms = (time.perf_counter() - start) * 1000
+    stats = batch.stats()
+    logger.info(
+        f"Rendered {stats['slips']} slips workers={stats['workers']} wall_ms={stats['wallMs']} "
+        f"avg_slip_ms={stats['avgSlipMs']} max_slip_ms={stats['maxSlipMs']}"
+    )
+    return batch
+
+
+__all__ = ["RenderedSlip", "RenderBatch", "resolve_workers", "render_salary_pdfs", "shutdown_render_pool"]
@@ -0,0 +1,46 @@
+"""Shared process pool for CPU-bound work (slip rendering, password hashing).
+
+Worker processes are started once per application process and reused across batches;
+a batch that needs fewer workers simply submits fewer chunks. The pool is never replaced
+while the process runs, since concurrent callers (rendering, hashing) may hold it.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from core.settings import settings
+
+_executor: ProcessPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def resolve_workers(max_workers: int | None = None) -> int:
+    """Return the effective worker count (explicit value, then settings, then CPU count)."""
+    workers = max_workers or settings.PDF_RENDER_WORKERS or os.cpu_count() or 1
+    return max(1, workers)
+
+
+def get_process_pool(workers: int) -> ProcessPoolExecutor:
+    """Return the shared pool, created on first use with ``resolve_workers()`` workers.
+
+    A larger ``workers`` on that first call sizes the pool up; later calls get the same pool
+    and queue any extra chunks on it.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=max(workers, resolve_workers()))
+        return _executor
+
+
+def shutdown_process_pool() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+        _executor = None
+
+
+__all__ = ["resolve_workers", "get_process_pool", "shutdown_process_pool"]
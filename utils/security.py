@@ -1,6 +1,6 @@
 """Security utilities: password hashing and JWT handling."""
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict
+from typing import Any, Dict, List, Sequence
 import uuid
 import hashlib
 
@@ -8,15 +8,27 @@ from passlib.context import CryptContext
 import jwt
 
 from core.settings import settings
+from utils.process_pool import get_process_pool, resolve_workers
 
 pwd_context = CryptContext(schemes=["bcrypt_sha256"], deprecated="auto")
 
+# bcrypt is deliberately slow; below this many hashes the pool start-up is not worth it
+MIN_PARALLEL_HASHES = 4
+
 # ----- Password Hashing -----
 
 def hash_password(plain: str) -> str:
     # bcrypt underlying limit is mitigated by bcrypt_sha256 which hashes first with sha256
     return pwd_context.hash(plain)
 
+def hash_passwords(plains: Sequence[str], max_workers: int | None = None) -> List[str]:
+    """Hash a batch of passwords in input order, fanning bcrypt out over the shared process pool."""
+    workers = min(resolve_workers(max_workers), len(plains))
+    if workers <= 1 or len(plains) < MIN_PARALLEL_HASHES:
+        return [hash_password(p) for p in plains]
+    chunksize = max(1, len(plains) // (workers * 4))
+    return list(get_process_pool(workers).map(hash_password, plains, chunksize=chunksize))
+
 def verify_password(plain: str, hashed: str) -> bool:
     return pwd_context.verify(plain, hashed)
 
@@ -0,0 +1,140 @@
+"""Small in-process LRU cache with per-entry TTL for reference data.
+
+Entries are plain snapshots (never ORM objects, which expire on commit and belong to one
+session). Writers invalidate keys explicitly after committing; the TTL bounds how stale
+another process's copy can get. Within a process, a value loaded while an invalidation
+ran is not stored (see ``get_or_load``), so a writer is never undone by a slow reader. Every cache registers itself by name so hit/miss counters
+can be reported together (``cache_stats``).
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+_registry: dict[str, "TTLCache"] = {}
+_registry_lock = threading.Lock()
+
+
+class TTLCache:
+    """Thread-safe mapping with LRU eviction beyond ``maxsize`` and expiry after ``ttl`` seconds.
+
+    ``maxsize`` or ``ttl`` of 0 disables caching (every lookup is a miss).
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float, clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped by invalidate/clear; get_or_load only stores loads that started after the last bump
+        self._generation = 0
+        self.hits = self.misses = self.evictions = 0
+        with _registry_lock:
+            _registry[name] = self
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0 and self.ttl > 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > self._clock():
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._store(key, value)
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        if not self.enabled:
+            return
+        self._data[key] = (self._clock() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def get_or_load(self, key: Hashable, load: Callable[[], Any]) -> Any:
+        """Cached value for ``key``, else ``load()``; a ``None`` result is not cached.
+
+        A load that overlapped an ``invalidate``/``clear`` may have read the old row, so its
+        result is returned but not cached.
+        """
+        missing = object()
+        with self._lock:
+            generation = self._generation
+        value = self.get(key, missing)
+        if value is missing:
+            value = load()
+            if value is not None:
+                with self._lock:
+                    if generation == self._generation:
+                        self._store(key, value)
+        return value
+
+    async def get_or_load_async(self, key: Hashable, load: Callable[[], Awaitable[Any]]) -> Any:
+        """``get_or_load`` for an async loader (the cache itself never awaits)."""
+        missing = object()
+        with self._lock:
+            generation = self._generation
+        value = self.get(key, missing)
+        if value is missing:
+            value = await load()
+            if value is not None:
+                with self._lock:
+                    if generation == self._generation:
+                        self._store(key, value)
+        return value
+
+    def invalidate(self, *keys: Hashable) -> None:
+        with self._lock:
+            self._generation += 1
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'ttlSeconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hitRatio': round(self.hits / lookups, 3) if lookups else None,
+            }
+
+
+def cache_stats() -> dict[str, dict]:
+    """Counters of every registered cache, keyed by cache name."""
+    with _registry_lock:
+        caches = list(_registry.values())
+    return {cache.name: cache.stats() for cache in caches}
+
+
+def clear_caches() -> None:
+    """Drop all entries of every registered cache (counters are kept)."""
+    with _registry_lock:
+        caches = list(_registry.values())
+    for cache in caches:
+        cache.clear()
+
+
+__all__ = ["TTLCache", "cache_stats", "clear_caches"]
@@ -0,0 +1,68 @@
+"""Background job worker.
+
+Run as many copies as needed (``python worker.py``); workers coordinate only through
+the ``jobs`` table, where ``FOR UPDATE SKIP LOCKED`` hands each job to exactly one of them.
+"""
+import argparse
+import logging
+import os
+import signal
+import socket
+import time
+
+from core.logging import configure_logging
+from core.settings import settings
+from db.session import SessionLocal
+from services.jobs_service import requeue_stale_jobs, run_next_job
+
+logger = logging.getLogger("slipsalaryapp.worker")
+
+# How often (in poll cycles) a worker sweeps for jobs abandoned by crashed workers
+STALE_SWEEP_EVERY = 30
+
+
+def run_worker(worker_id: str, kinds: list[str] | None = None, once: bool = False, poll_interval: float | None = None) -> None:
+    poll_interval = poll_interval if poll_interval is not None else settings.JOB_POLL_INTERVAL_SECONDS
+    stopping = False
+
+    def _stop(signum, frame):
+        nonlocal stopping
+        logger.info(f"Worker {worker_id} received signal {signum}; finishing current job")
+        stopping = True
+
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+    logger.info(f"Worker {worker_id} started kinds={kinds or 'all'}")
+    cycle = 0
+    while not stopping:
+        db = SessionLocal()
+        try:
+            if cycle % STALE_SWEEP_EVERY == 0:
+                requeue_stale_jobs(db)
+            ran = run_next_job(db, worker_id, kinds=kinds)
+        except Exception as e:
+            logger.exception(f"Worker {worker_id} loop error: {e}")
+            ran = False
+        finally:
+            db.close()
+        cycle += 1
+        if once and not ran:
+            break
+        if not ran:
+            time.sleep(poll_interval)
+    logger.info(f"Worker {worker_id} stopped")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run background report jobs")
+    parser.add_argument("--kinds", help="Comma separated job kinds to handle (default: all)")
+    parser.add_argument("--once", action="store_true", help="Drain the queue and exit")
+    parser.add_argument("--id", dest="worker_id", default=f"{socket.gethostname()}:{os.getpid()}")
+    args = parser.parse_args()
+    configure_logging()
+    kinds = [k.strip() for k in args.kinds.split(",") if k.strip()] if args.kinds else None
+    run_worker(args.worker_id, kinds=kinds, once=args.once)
+
+
+if __name__ == "__main__":
+    main()